@@ -0,0 +1,13 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class TunablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2 with its cost set per environment by PASSWORD_HASH_ITERATIONS.
+
+    It keeps the pbkdf2_sha256 algorithm name, so existing hashes verify
+    with it and are re-encoded at the new cost on the next login.
+    """
+
+    def __init__(self):
+        self.iterations = settings.PASSWORD_HASH_ITERATIONS
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.5 on 2026-10-18 12:21
+
+import mydanceclub.models
+from mydanceclub.migration_ops import NormalizeUUIDKeys
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0002_alter_user_phone"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="user",
+            name="id",
+            field=models.UUIDField(
+                default=mydanceclub.models.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        NormalizeUUIDKeys("accounts.User"),
+    ]
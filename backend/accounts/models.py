@@ -1,11 +1,32 @@
 from django.contrib.auth.models import AbstractUser, UserManager as DjangoUserManager
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 from classes.schemas.user_schema import InstructorPublicSchema, UserPublicSchema
-from mydanceclub.models import generate_uuid
+from mydanceclub.models import uuid7
+
+
+class UserQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        """QuerySet.update(), which sends no save signals, also revoking the
+        auth cache entries of the users when it changes a field they hold,
+        e.g. is_active in the admin's bulk actions"""
+        from mydanceclub.auth import AUTH_USER_FIELDS, bump_user_version
+
+        if not set(kwargs) & set(AUTH_USER_FIELDS):
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db):
+            user_ids = list(self.values_list("pk", flat=True))
+            rows = super().update(**kwargs)
+            for user_id in user_ids:
+                # Runs once the update commits
+                bump_user_version(str(user_id))
+        return rows
 
 
 class UserManager(DjangoUserManager):  # type: ignore
+    def get_queryset(self):
+        return UserQuerySet(self.model, using=self._db)
+
     def create_user(self, email=None, password=None, **kwargs):  # type: ignore
         if not email:
             raise ValueError("The Email field must be set")
@@ -27,7 +48,7 @@ class UserManager(DjangoUserManager):  # type: ignore
 
 class User(AbstractUser):
     username = None
-    id = models.CharField(primary_key=True, max_length=36, default=generate_uuid)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     email = models.EmailField(_("email address"), unique=True)
     """Custom user model for MyDanceClub platform."""
 
@@ -61,11 +82,21 @@ class User(AbstractUser):
     date_of_birth = models.DateField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Average overall rating of an instructor, 0 until reviewed; kept by
+    # RatingStatsService so the instructor listing sorts on an index
+    rating = models.FloatField(default=0, editable=False)
 
     class Meta:
         db_table = "users"
         verbose_name = "User"
         verbose_name_plural = "Users"
+        indexes = [
+            # Sort order of the instructor listing, read backwards
+            models.Index(
+                fields=["role", "rating", "created_at", "id"],
+                name="user_role_rating_idx",
+            ),
+        ]
 
     objects = UserManager()
     USERNAME_FIELD = "email"
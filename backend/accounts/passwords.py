@@ -0,0 +1,48 @@
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    check_password,
+    get_hasher,
+    identify_hasher,
+    make_password,
+)
+
+from accounts.models import User
+from shared.worker_pool import BoundedWorkerPool
+
+# Hashing runs here rather than on the server's event loop, which keeps
+# serving other requests meanwhile; a full pool makes signup and login fail
+# fast with PoolSaturated
+password_hash_pool = BoundedWorkerPool(
+    "password-hash",
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+)
+
+
+async def ahash_password(password: str) -> str:
+    return await password_hash_pool.run(make_password, password)
+
+
+async def aauthenticate_user(email: str, password: str) -> Optional[User]:
+    """Async equivalent of authenticate() with the hashing on the pool.
+
+    Like ModelBackend it hashes once for unknown emails, so response times
+    do not reveal which emails exist, rejects inactive users and re-encodes
+    hashes made with outdated hasher parameters.
+    """
+    user = await User.objects.filter(email=email).afirst()
+    if user is None:
+        await ahash_password(password)
+        return None
+    valid = await password_hash_pool.run(check_password, password, user.password)
+    if not valid or not user.is_active:
+        return None
+
+    preferred = get_hasher("default")
+    hasher = identify_hasher(user.password)
+    if hasher.algorithm != preferred.algorithm or preferred.must_update(user.password):
+        user.password = await ahash_password(password)
+        await user.asave(update_fields=["password"])
+    return user
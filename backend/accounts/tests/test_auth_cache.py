@@ -0,0 +1,39 @@
+import pytest
+
+from accounts.models import User
+from mydanceclub.auth import create_token, get_user_from_token
+
+
+@pytest.fixture
+def user(db) -> User:
+    return User.objects.create(email="cached@example.com", first_name="Cached")
+
+
+@pytest.fixture(autouse=True)
+def auth_cache(settings):
+    settings.AUTH_CACHE_ENABLED = True
+
+
+def test_bulk_deactivation_revokes_cached_user(
+    user, django_capture_on_commit_callbacks
+):
+    token = create_token(user)
+    assert get_user_from_token(token) is not None  # Now cached
+
+    with django_capture_on_commit_callbacks(execute=True):
+        User.objects.filter(pk=user.pk).update(is_active=False)
+
+    assert get_user_from_token(token) is None
+
+
+def test_update_of_other_fields_keeps_cached_user(
+    user, django_capture_on_commit_callbacks
+):
+    token = create_token(user)
+    get_user_from_token(token)
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        User.objects.filter(pk=user.pk).update(bio="Dancer")
+
+    assert not callbacks
+    assert get_user_from_token(token) is not None
@@ -1,7 +1,11 @@
+from django import forms
 from django.contrib import admin
 from django.utils.html import format_html
 from unfold.admin import ModelAdmin
 
+from shared.const import Facilities, SportsCard
+from shared.flags import has_all_flags, parse_mask, to_mask
+
 from .models import DanceClass, Location
 
 
@@ -45,10 +49,76 @@ class DanceClassAdmin(ModelAdmin):
     )
 
 
+class LocationAdminForm(forms.ModelForm):
+    """Edits the facility and sports card bitmasks as checkbox lists"""
+
+    facilities = forms.MultipleChoiceField(
+        choices=Facilities.choices,
+        required=False,
+        widget=forms.CheckboxSelectMultiple,
+    )
+    sports_card = forms.MultipleChoiceField(
+        choices=SportsCard.choices,
+        required=False,
+        widget=forms.CheckboxSelectMultiple,
+    )
+
+    class Meta:
+        model = Location
+        fields = "__all__"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.initial["facilities"] = self.instance.get_facilities()
+            self.initial["sports_card"] = self.instance.get_sports_card()
+
+    def clean_facilities(self):
+        return to_mask(Facilities, self.cleaned_data["facilities"])
+
+    def clean_sports_card(self):
+        return to_mask(SportsCard, self.cleaned_data["sports_card"])
+
+
+class FlagListFilter(admin.SimpleListFilter):
+    """Filters a bitmask field to the rows having one flag set"""
+
+    flag_choices: type[Facilities] | type[SportsCard]
+
+    def lookups(self, request, model_admin):
+        return list(self.flag_choices.choices)
+
+    def queryset(self, request, queryset):
+        value = self.value()
+        if not value:
+            return queryset
+        mask = parse_mask(self.flag_choices, value)
+        return queryset.filter(has_all_flags(self.parameter_name, mask))
+
+
+class FacilityListFilter(FlagListFilter):
+    title = "facilities"
+    parameter_name = "facilities"
+    flag_choices = Facilities
+
+
+class SportsCardListFilter(FlagListFilter):
+    title = "sports card"
+    parameter_name = "sports_card"
+    flag_choices = SportsCard
+
+
 @admin.register(Location)
 class LocationAdmin(ModelAdmin):
-    list_display = ("name", "address", "facilities", "sports_card", "show_map_link")
-    list_filter = ("facilities", "sports_card")
+    form = LocationAdminForm
+    list_display = (
+        "name",
+        "address",
+        "facility_list",
+        "sports_card_list",
+        "show_map_link",
+    )
+    list_filter = (FacilityListFilter, SportsCardListFilter)
     search_fields = ("name", "address")
     ordering = ("name",)
     fieldsets = (
@@ -57,6 +127,14 @@ class LocationAdmin(ModelAdmin):
         ("Features", {"fields": ("facilities", "sports_card")}),
     )
 
+    @admin.display(description="Facilities")
+    def facility_list(self, obj):
+        return ", ".join(facility.label for facility in obj.get_facilities())
+
+    @admin.display(description="Sports card")
+    def sports_card_list(self, obj):
+        return ", ".join(card.label for card in obj.get_sports_card())
+
     def show_map_link(self, obj):
         if obj.latitude and obj.longitude:
             url = f"https://www.google.com/maps?q={obj.latitude},{obj.longitude}"
@@ -0,0 +1,126 @@
+from datetime import date, timedelta
+from random import Random
+from typing import List
+
+from accounts.models import User
+from classes.models import DanceClass, Location
+from reviews.models import DanceClassReview, LocationReview
+from reviews.services.rating_stats import RatingStatsService, get_rating_stats_target
+from shared.const import ClassType, DanceStyle, SkillLevel
+
+# Benchmarks seed synthetic data around Warsaw, where the real seed data lives.
+CENTER_LATITUDE = 52.2297
+CENTER_LONGITUDE = 21.0122
+BATCH_SIZE = 2000
+
+
+def create_bench_instructors(count: int, prefix: str = "bench") -> List[User]:
+    instructors = [
+        User(
+            email=f"{prefix}.instructor{i}@example.com",
+            first_name="Bench",
+            last_name=f"Instructor {i}",
+            role="instructor",
+        )
+        for i in range(count)
+    ]
+    User.objects.bulk_create(instructors, batch_size=BATCH_SIZE)
+    return instructors
+
+
+def create_bench_locations(
+    count: int, rng: Random, spread_degrees: float = 1.5
+) -> List[Location]:
+    """Create locations scattered uniformly around the benchmark center"""
+    locations = []
+    for i in range(count):
+        location = Location(
+            name=f"Bench Studio {i}",
+            address=f"Bench Street {i}",
+            latitude=round(
+                CENTER_LATITUDE + rng.uniform(-spread_degrees, spread_degrees), 6
+            ),
+            longitude=round(
+                CENTER_LONGITUDE + rng.uniform(-spread_degrees, spread_degrees), 6
+            ),
+        )
+        location.geohash = location.compute_geohash()
+        locations.append(location)
+    Location.objects.bulk_create(locations, batch_size=BATCH_SIZE)
+    return locations
+
+
+def create_bench_classes(
+    locations: List[Location],
+    instructors: List[User],
+    per_location: int,
+    rng: Random,
+) -> List[DanceClass]:
+    today = date.today()
+    classes = [
+        DanceClass(
+            name=f"Bench class {i}",
+            description="Benchmark class",
+            instructor=rng.choice(instructors),
+            level=rng.choice(SkillLevel.values),
+            style=rng.choice(DanceStyle.values),
+            formation_type=rng.choice(ClassType.values),
+            duration=60,
+            price=rng.randint(1500, 5000) / 100,
+            start_date=today - timedelta(days=rng.randint(0, 60)),
+            end_date=today + timedelta(days=rng.randint(1, 120)),
+            location=location,
+        )
+        for location in locations
+        for i in range(per_location)
+    ]
+    DanceClass.objects.bulk_create(classes, batch_size=BATCH_SIZE)
+    return classes
+
+
+def create_bench_class_reviews(
+    classes: List[DanceClass], per_class: int, rng: Random
+) -> List[DanceClassReview]:
+    reviews = [
+        DanceClassReview(
+            dance_class=dance_class,
+            anonymous_name="Bench reviewer",
+            group_size=rng.uniform(-10, 10),
+            level=rng.uniform(-10, 10),
+            engagement=rng.uniform(-10, 10),
+            teaching_pace=rng.uniform(-10, 10),
+            overall_rating=rng.randint(1, 5),
+            comment="Benchmark review",
+        )
+        for dance_class in classes
+        for _ in range(per_class)
+    ]
+    DanceClassReview.objects.bulk_create(reviews, batch_size=BATCH_SIZE)
+    # bulk_create skips the signals maintaining the rating stats
+    RatingStatsService().rebuild(get_rating_stats_target(DanceClassReview))
+    return reviews
+
+
+def create_bench_location_reviews(
+    locations: List[Location], per_location: int, rng: Random
+) -> List[LocationReview]:
+    reviews = [
+        LocationReview(
+            location=location,
+            anonymous_name="Bench reviewer",
+            cleanness=rng.uniform(1, 10),
+            general_look=rng.uniform(1, 10),
+            acustic_quality=rng.uniform(1, 10),
+            additional_facilities=rng.uniform(1, 10),
+            temperature=rng.uniform(-10, 10),
+            lighting=rng.uniform(-10, 10),
+            overall_rating=rng.randint(1, 5),
+            comment="Benchmark review",
+        )
+        for location in locations
+        for _ in range(per_location)
+    ]
+    LocationReview.objects.bulk_create(reviews, batch_size=BATCH_SIZE)
+    # bulk_create skips the signals maintaining the rating stats
+    RatingStatsService().rebuild(get_rating_stats_target(LocationReview))
+    return reviews
@@ -0,0 +1,108 @@
+from random import Random
+
+from django.core.management.base import BaseCommand
+from django.db.models import F
+from rich.console import Console
+from rich.panel import Panel
+
+from classes.management.bench_data import (
+    create_bench_class_reviews,
+    create_bench_classes,
+    create_bench_instructors,
+    create_bench_locations,
+)
+from classes.models import DanceClass
+from classes.services.class_search_engine import (
+    CLASS_LIST_PAGINATORS,
+    ClassSearchEngineService,
+)
+from shared.benchmark import add_latency_row, latency_table, measure_ms, rolled_back
+
+console = Console()
+
+# Classes seeded per synthetic location
+CLASSES_PER_LOCATION = 10
+
+
+def ranked_classes():
+    """The class listing queryset, annotated like get_classes_with_filters"""
+    return DanceClass.objects.annotate(avg_rating=F("rating_stats__avg_rating"))
+
+
+class Command(BaseCommand):
+    help = "Benchmarks keyset against OFFSET pagination of the class listing"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--classes", type=int, default=100_000)
+        parser.add_argument("--page-size", type=int, default=20)
+        parser.add_argument(
+            "--page", type=int, default=1000, help="Deep page to compare with page 1"
+        )
+        parser.add_argument(
+            "--sort-by",
+            nargs="+",
+            default=["default", "price_asc"],
+            help="sort_by values of /classes to benchmark",
+        )
+        parser.add_argument("--runs", type=int, default=50)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        console.print(Panel.fit("📄 Class pagination benchmark", style="bold green"))
+        service = ClassSearchEngineService()
+        table = latency_table("Class listing page latency")
+        size = options["classes"]
+        page_size = options["page_size"]
+        offset = (options["page"] - 1) * page_size
+        rng = Random(options["seed"])
+
+        with rolled_back():
+            with console.status(f"Seeding {size:,} classes..."):
+                instructors = create_bench_instructors(50)
+                locations = create_bench_locations(size // CLASSES_PER_LOCATION, rng)
+                classes = create_bench_classes(
+                    locations, instructors, CLASSES_PER_LOCATION, rng
+                )
+                create_bench_class_reviews(classes[::2], 1, rng)
+
+            for sort_by in options["sort_by"]:
+                sort_key = None if sort_by == "default" else sort_by
+                paginator = CLASS_LIST_PAGINATORS[sort_key]
+                ordered = service.serializer.prepare(
+                    ranked_classes().order_by(*paginator.ordering)
+                )
+
+                def offset_page(start, ordered=ordered):
+                    # The classic alternative: OFFSET slice plus a full count
+                    ordered.count()
+                    return service.serializer.serialize_loaded(
+                        ordered[start : start + page_size]
+                    )
+
+                deep_cursor = paginator.encode(ordered[offset - 1])
+                pages = {
+                    "page 1": None,
+                    f"page {options['page']:,}": deep_cursor,
+                }
+                for page_label, cursor in pages.items():
+                    keyset = measure_ms(
+                        lambda sort_key=sort_key, cursor=cursor: (
+                            service.get_classes_with_filters(
+                                sort_by=sort_key, cursor=cursor, limit=page_size
+                            )
+                        ),
+                        options["runs"],
+                    )
+                    add_latency_row(
+                        table, f"{sort_by}: keyset {page_label}", size, keyset
+                    )
+                    start = 0 if cursor is None else offset
+                    baseline = measure_ms(
+                        lambda start=start, offset_page=offset_page: offset_page(start),
+                        options["runs"],
+                    )
+                    add_latency_row(
+                        table, f"{sort_by}: OFFSET {page_label}", size, baseline
+                    )
+
+        console.print(table)
@@ -0,0 +1,115 @@
+from random import Random
+from typing import Optional
+
+from django.core.management.base import BaseCommand
+from django.db.models import Avg, Count
+from rich.console import Console
+from rich.panel import Panel
+
+from classes.management.bench_data import (
+    create_bench_class_reviews,
+    create_bench_classes,
+    create_bench_instructors,
+    create_bench_location_reviews,
+    create_bench_locations,
+)
+from classes.models import Location
+from classes.services.location_search_engine import (
+    LOCATION_PAGINATOR,
+    LocationSearchEngineService,
+)
+from shared.benchmark import add_latency_row, latency_table, measure_ms, rolled_back
+
+console = Console()
+
+# Filters of /locations compared by the benchmark, by scenario name
+SCENARIOS = {
+    "active classes": {},
+    "style + level": {"dance_style": "salsa,tango", "level": "beginner"},
+    "min classes": {"min_classes": 30},
+    "min rating": {"min_location_rating": 3.0},
+}
+
+
+def joined_locations(
+    dance_style: Optional[str] = None,
+    level: Optional[str] = None,
+    min_classes: Optional[int] = None,
+    min_location_rating: Optional[float] = None,
+):
+    """The filtering _get_filtered_locations did before it used subqueries.
+
+    Every class and review filter joins into the location rows, so a
+    location with C classes and R reviews becomes C x R rows that DISTINCT
+    and the aggregates then have to collapse again.
+    """
+    locations = Location.objects.filter(classes__isnull=False).distinct()
+    if dance_style:
+        locations = locations.filter(classes__style__in=dance_style.split(","))
+    if level:
+        locations = locations.filter(classes__level__in=level.split(","))
+    locations = locations.annotate(
+        class_count=Count("classes", distinct=True),
+        avg_rating=Avg("reviews__overall_rating"),
+    )
+    if min_classes:
+        locations = locations.filter(class_count__gte=min_classes)
+    if min_location_rating:
+        locations = locations.filter(avg_rating__gte=min_location_rating)
+    return locations
+
+
+class Command(BaseCommand):
+    help = "Benchmarks the location search filters against the join-based version"
+
+    def add_arguments(self, parser):
+        # The join baseline's style + level fan-out is classes^3 x reviews rows
+        # per location, which keeps the default location count small
+        parser.add_argument("--locations", type=int, default=20)
+        parser.add_argument("--classes-per-location", type=int, default=50)
+        parser.add_argument("--reviews-per-location", type=int, default=200)
+        parser.add_argument("--class-reviews", type=int, default=2)
+        parser.add_argument("--page-size", type=int, default=50)
+        parser.add_argument("--runs", type=int, default=20)
+        parser.add_argument("--join-runs", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        console.print(Panel.fit("📍 Location search benchmark", style="bold green"))
+        service = LocationSearchEngineService()
+        table = latency_table("Location listing page latency")
+        size = options["locations"]
+        page_size = options["page_size"]
+        rng = Random(options["seed"])
+
+        with rolled_back():
+            with console.status(f"Seeding {size:,} locations..."):
+                instructors = create_bench_instructors(50)
+                locations = create_bench_locations(size, rng)
+                classes = create_bench_classes(
+                    locations, instructors, options["classes_per_location"], rng
+                )
+                create_bench_class_reviews(classes, options["class_reviews"], rng)
+                create_bench_location_reviews(
+                    locations, options["reviews_per_location"], rng
+                )
+
+            for scenario, filters in SCENARIOS.items():
+                subqueries = measure_ms(
+                    lambda filters=filters: service.get_locations(
+                        limit=page_size, **filters
+                    ),
+                    options["runs"],
+                )
+                add_latency_row(table, f"{scenario}: subqueries", size, subqueries)
+
+                def joined_page(filters=filters):
+                    page = LOCATION_PAGINATOR.paginate(
+                        joined_locations(**filters), limit=page_size
+                    )
+                    return [location.to_schema() for location in page.items]
+
+                joined = measure_ms(joined_page, options["join_runs"], warmup=1)
+                add_latency_row(table, f"{scenario}: joins", size, joined)
+
+        console.print(table)
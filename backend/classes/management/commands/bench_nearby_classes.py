@@ -0,0 +1,132 @@
+from datetime import date
+from random import Random
+
+from django.core.management.base import BaseCommand
+from django.db.models import F, FloatField
+from django.db.models.functions import ACos, Cast, Cos, Radians, Sin
+from rich.console import Console
+from rich.panel import Panel
+
+from classes.management.bench_data import (
+    CENTER_LATITUDE,
+    CENTER_LONGITUDE,
+    create_bench_classes,
+    create_bench_instructors,
+    create_bench_locations,
+)
+from classes.models import DanceClass
+from classes.services.class_search_engine import ClassSearchEngineService
+from shared.benchmark import add_latency_row, latency_table, measure_ms, rolled_back
+
+console = Console()
+
+
+def full_scan_nearest(latitude: float, longitude: float, limit: int) -> list:
+    """Baseline: great-circle distance computed for every class, then sorted"""
+    lat_rad = Radians(F("location__latitude"))
+    distance = Cast(
+        ACos(
+            Sin(lat_rad) * Sin(Radians(latitude))
+            + Cos(lat_rad)
+            * Cos(Radians(latitude))
+            * Cos(Radians(F("location__longitude")) - Radians(longitude))
+        )
+        * 6371.0,
+        output_field=FloatField(),
+    )
+    return list(
+        DanceClass.objects.filter(location__isnull=False)
+        .annotate(distance=distance)
+        .order_by("distance")
+        .values_list("id", flat=True)[:limit]
+    )
+
+
+class Command(BaseCommand):
+    help = "Benchmarks nearest-class search latency on synthetic locations"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[10_000, 100_000],
+            help="Numbers of locations to benchmark against",
+        )
+        parser.add_argument("--queries", type=int, default=200)
+        parser.add_argument("--limit", type=int, default=10)
+        parser.add_argument("--radius-km", type=float, default=5.0)
+        parser.add_argument(
+            "--skip-baseline",
+            action="store_true",
+            help="Do not time the full-scan baseline",
+        )
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        console.print(
+            Panel.fit("📍 Nearest-class search benchmark", style="bold green")
+        )
+        service = ClassSearchEngineService()
+        table = latency_table("Nearest-class search latency")
+        today = date.today()
+
+        for size in options["sizes"]:
+            rng = Random(options["seed"])
+            with rolled_back():
+                with console.status(f"Seeding {size:,} locations..."):
+                    instructors = create_bench_instructors(10)
+                    locations = create_bench_locations(size, rng)
+                    create_bench_classes(locations, instructors, 1, rng)
+
+                points = [
+                    (
+                        CENTER_LATITUDE + rng.uniform(-1.0, 1.0),
+                        CENTER_LONGITUDE + rng.uniform(-1.0, 1.0),
+                    )
+                    for _ in range(options["queries"])
+                ]
+
+                def run(search, points=points):
+                    iterator = iter(points * 2)
+                    return lambda: search(*next(iterator))
+
+                knn = measure_ms(
+                    run(
+                        lambda lat, lon: service.get_classes_near_location(
+                            lat, lon, today, today, limit=options["limit"]
+                        )
+                    ),
+                    options["queries"],
+                )
+                add_latency_row(table, "geohash k-nearest", size, knn)
+
+                radius = measure_ms(
+                    run(
+                        lambda lat, lon: service.get_classes_near_location(
+                            lat,
+                            lon,
+                            today,
+                            today,
+                            limit=options["limit"],
+                            radius_km=options["radius_km"],
+                        )
+                    ),
+                    options["queries"],
+                )
+                add_latency_row(
+                    table, f"geohash within {options['radius_km']:g} km", size, radius
+                )
+
+                if not options["skip_baseline"]:
+                    baseline = measure_ms(
+                        run(
+                            lambda lat, lon: full_scan_nearest(
+                                lat, lon, options["limit"]
+                            )
+                        ),
+                        min(options["queries"], 50),
+                    )
+                    add_latency_row(table, "full scan baseline", size, baseline)
+
+        console.print(table)
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from rich.console import Console
+from rich.table import Table
+
+from classes.services.trending import TrendingService
+
+console = Console()
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the trending class lists. Meant to run periodically (e.g. "
+        "every 15 minutes from cron), with --full once a day"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Rebuild from the review table instead of applying new reviews",
+        )
+
+    def handle(self, *args, **options):
+        result = TrendingService().refresh(full=options["full"])
+
+        table = Table(
+            title="Trending refresh",
+            show_header=True,
+            header_style="bold magenta",
+        )
+        table.add_column("Mode", style="cyan")
+        table.add_column("Reviews applied", justify="right")
+        table.add_column("Tracked classes", justify="right")
+        table.add_column("Lists", justify="right", style="green")
+        table.add_row(
+            "full" if result.full else "incremental",
+            str(result.new_reviews),
+            str(result.tracked_classes),
+            str(result.lists),
+        )
+        console.print(table)
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.5 on 2026-10-18 11:21
+
+from django.db import migrations, models
+
+from shared.geo import geohash_encode
+
+
+def populate_geohash(apps, schema_editor):
+    Location = apps.get_model("classes", "Location")
+    locations = Location.objects.filter(latitude__isnull=False, longitude__isnull=False)
+    for location in locations.iterator():
+        location.geohash = geohash_encode(
+            float(location.latitude), float(location.longitude)
+        )
+        location.save(update_fields=["geohash"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("classes", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="location",
+            name="geohash",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                help_text="Geohash of the coordinates, used to prefilter nearby searches",
+                max_length=9,
+                null=True,
+            ),
+        ),
+        migrations.RunPython(populate_geohash, migrations.RunPython.noop),
+    ]
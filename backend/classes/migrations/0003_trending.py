@@ -0,0 +1,70 @@
+# Generated by Django 5.1.5 on 2026-10-18 11:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("classes", "0002_location_geohash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ClassTrendingState",
+            fields=[
+                (
+                    "dance_class",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="trending_state",
+                        serialize=False,
+                        to="classes.danceclass",
+                    ),
+                ),
+                ("decayed_count", models.FloatField(default=0)),
+                ("decayed_rating_sum", models.FloatField(default=0)),
+                ("decayed_at", models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name="TrendingClass",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "list_key",
+                    models.CharField(
+                        help_text='"all", or the style and/or level filter, e.g. "style=salsa"',
+                        max_length=150,
+                    ),
+                ),
+                ("rank", models.PositiveIntegerField()),
+                ("score", models.FloatField()),
+                ("computed_at", models.DateTimeField()),
+                (
+                    "dance_class",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="trending_entries",
+                        to="classes.danceclass",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("list_key", "rank"), name="unique_trending_rank"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.1.5 on 2026-10-18 14:05
+
+from django.db import migrations, models
+
+from shared.const import Facilities, SportsCard
+from shared.flags import InvalidFlag, flag_bit, from_mask
+
+# Comma joined string field -> bitmask field, with the choices it holds
+FLAG_FIELDS = (
+    ("facilities", "facilities_mask", Facilities),
+    ("sports_card", "sports_card_mask", SportsCard),
+)
+
+
+def strings_to_masks(apps, schema_editor):
+    Location = apps.get_model("classes", "Location")
+    for location in Location.objects.iterator():
+        for field, mask_field, choices in FLAG_FIELDS:
+            mask = 0
+            for value in (getattr(location, field) or "").split(","):
+                try:
+                    mask |= flag_bit(choices, value)
+                except InvalidFlag:
+                    # Empty or stale values have no bit and are dropped
+                    pass
+            setattr(location, mask_field, mask)
+        location.save(update_fields=[mask_field for _, mask_field, _ in FLAG_FIELDS])
+
+
+def masks_to_strings(apps, schema_editor):
+    Location = apps.get_model("classes", "Location")
+    for location in Location.objects.iterator():
+        for field, mask_field, choices in FLAG_FIELDS:
+            values = from_mask(choices, getattr(location, mask_field))
+            setattr(location, field, ",".join(values) or None)
+        location.save(update_fields=[field for field, _, _ in FLAG_FIELDS])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("classes", "0003_trending"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="location",
+            name="facilities_mask",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="location",
+            name="sports_card_mask",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(strings_to_masks, masks_to_strings),
+        migrations.RemoveField(
+            model_name="location",
+            name="facilities",
+        ),
+        migrations.RemoveField(
+            model_name="location",
+            name="sports_card",
+        ),
+        migrations.RenameField(
+            model_name="location",
+            old_name="facilities_mask",
+            new_name="facilities",
+        ),
+        migrations.RenameField(
+            model_name="location",
+            old_name="sports_card_mask",
+            new_name="sports_card",
+        ),
+    ]
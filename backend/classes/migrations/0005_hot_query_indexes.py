@@ -0,0 +1,57 @@
+# Generated by Django 5.1.5 on 2026-10-18 12:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("classes", "0004_location_flag_masks"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="danceclass",
+            name="instructor",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="classes",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="danceclass",
+            index=models.Index(
+                fields=["instructor", "end_date"], name="class_instructor_end_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="danceclass",
+            index=models.Index(
+                condition=models.Q(("location__isnull", False)),
+                fields=["location", "end_date"],
+                name="class_location_end_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="danceclass",
+            index=models.Index(
+                fields=["style", "end_date"], name="class_style_end_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="danceclass",
+            index=models.Index(
+                fields=["level", "end_date"], name="class_level_end_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="danceclass",
+            index=models.Index(
+                fields=["end_date", "start_date"], name="class_dates_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.1.5 on 2026-10-18 13:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("classes", "0006_uuid7_primary_keys"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="danceclass",
+            name="rating",
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="location",
+            name="rating",
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="danceclass",
+            index=models.Index(
+                fields=["rating", "created_at", "id"], name="class_rating_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="danceclass",
+            index=models.Index(
+                fields=["price", "-rating", "id"], name="class_price_asc_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="danceclass",
+            index=models.Index(
+                fields=["price", "rating", "id"], name="class_price_desc_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="danceclass",
+            index=models.Index(
+                fields=["start_date", "rating", "id"], name="class_start_rating_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="location",
+            index=models.Index(fields=["name", "id"], name="location_name_idx"),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.5 on 2026-10-18 13:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("classes", "0007_listing_rating"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TrendingAppliedReview",
+            fields=[
+                ("review_id", models.UUIDField(primary_key=True, serialize=False)),
+                ("review_created_at", models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
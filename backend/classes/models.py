@@ -1,10 +1,14 @@
-from typing import List
+from typing import List, Optional
+from uuid import UUID
 from accounts.models import User
 from django.db import models
 from mydanceclub.models import BaseModel
 from classes.schemas.location import LocationSchema
 from classes.schemas.dance_class import DanceClassSchema
+from classes.schemas.user_schema import InstructorPublicSchema
 from shared.const import ClassType, DanceStyle, Facilities, SkillLevel, SportsCard
+from shared.flags import from_mask, to_mask
+from shared.geo import GEOHASH_PRECISION, geohash_encode
 from django.db.models import Avg
 
 class Location(BaseModel):
@@ -19,41 +23,51 @@ class Location(BaseModel):
     longitude = models.DecimalField(
         max_digits=9, decimal_places=6, null=True, blank=True
     )
-    url = models.URLField(null=True, blank=True)
-    phone = models.CharField(max_length=255, null=True, blank=True)
-    facilities = models.CharField(
-        max_length=1000,
-        choices=Facilities.choices,
-        blank=True,
+    geohash = models.CharField(
+        max_length=GEOHASH_PRECISION,
         null=True,
+        blank=True,
+        editable=False,
+        db_index=True,
+        help_text="Geohash of the coordinates, used to prefilter nearby searches",
     )
+    url = models.URLField(null=True, blank=True)
+    phone = models.CharField(max_length=255, null=True, blank=True)
+    # Bitmasks of shared.const.Facilities and SportsCard, see shared.flags
+    facilities = models.BigIntegerField(default=0)
+    sports_card = models.IntegerField(default=0)
+    # Average overall rating, 0 until reviewed; kept by RatingStatsService
+    rating = models.FloatField(default=0, editable=False)
+
+    class Meta(BaseModel.Meta):
+        indexes = [
+            # Sort order of the location listing (LOCATION_PAGINATOR)
+            models.Index(fields=["name", "id"], name="location_name_idx"),
+        ]
 
     def set_facilities(self, facilities: List[Facilities]):
-        self.facilities = ",".join(facilities)
+        self.facilities = to_mask(Facilities, facilities)
 
     def get_facilities(self) -> List[Facilities]:
-        return (
-            [Facilities(facility) for facility in self.facilities.split(",")]
-            if self.facilities
-            else []
-        )
-
-    sports_card = models.CharField(
-        max_length=1000,
-        choices=SportsCard.choices,
-        blank=True,
-        null=True,
-    )
+        return from_mask(Facilities, self.facilities)
 
     def set_sports_card(self, sports_cards: List[SportsCard]):
-        self.sports_card = ",".join(sports_cards)
+        self.sports_card = to_mask(SportsCard, sports_cards)
 
     def get_sports_card(self) -> List[SportsCard]:
-        return (
-            [SportsCard(card) for card in self.sports_card.split(",")]
-            if self.sports_card
-            else []
-        )
+        return from_mask(SportsCard, self.sports_card)
+
+    def compute_geohash(self) -> Optional[str]:
+        if self.latitude is None or self.longitude is None:
+            return None
+        return geohash_encode(float(self.latitude), float(self.longitude))
+
+    def save(self, *args, **kwargs):
+        self.geohash = self.compute_geohash()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"latitude", "longitude"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "geohash"}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.name} ({self.address})"
@@ -76,8 +90,9 @@ class DanceClass(BaseModel):
 
     name = models.CharField(max_length=100)
     description = models.TextField()
+    # Indexed by the (instructor, end_date) index in Meta
     instructor = models.ForeignKey(
-        User, on_delete=models.CASCADE, related_name="classes"
+        User, on_delete=models.CASCADE, related_name="classes", db_index=False
     )
 
     level = models.CharField(
@@ -107,25 +122,132 @@ class DanceClass(BaseModel):
         related_name="classes",
     )
 
+    # Average overall rating, 0 until reviewed; kept by RatingStatsService
+    # so the listing sorts on an indexed, non-null column
+    rating = models.FloatField(default=0, editable=False)
+
+    instructor_id: UUID
+    location_id: Optional[UUID]
+
+    class Meta(BaseModel.Meta):
+        indexes = [
+            # Upcoming classes of an instructor or location: their class
+            # pages and the instructor listing's class count filter on
+            # end_date >= today
+            models.Index(
+                fields=["instructor", "end_date"], name="class_instructor_end_idx"
+            ),
+            models.Index(
+                fields=["location", "end_date"],
+                name="class_location_end_idx",
+                condition=models.Q(location__isnull=False),
+            ),
+            # Style and level filters of the class listing, usually combined
+            # with a date range
+            models.Index(fields=["style", "end_date"], name="class_style_end_idx"),
+            models.Index(fields=["level", "end_date"], name="class_level_end_idx"),
+            # Sort orders of the class listing (CLASS_LIST_PAGINATORS), read
+            # forwards or backwards from the cursor
+            models.Index(
+                fields=["rating", "created_at", "id"], name="class_rating_idx"
+            ),
+            models.Index(fields=["price", "-rating", "id"], name="class_price_asc_idx"),
+            models.Index(fields=["price", "rating", "id"], name="class_price_desc_idx"),
+            models.Index(
+                fields=["start_date", "rating", "id"], name="class_start_rating_idx"
+            ),
+            # Date range overlap: end_date >= start AND start_date <= end
+            models.Index(fields=["end_date", "start_date"], name="class_dates_idx"),
+        ]
+
     def __str__(self):
         return f"{self.name} - {self.level}"
 
-    def to_schema(self) -> DanceClassSchema:
-        reviews = getattr(self, 'reviews', None)
+    def get_avg_rating(self) -> Optional[float]:
+        # Querysets annotated with avg_rating (see DanceClassSerializer) skip
+        # the per-row aggregate query
+        if hasattr(self, "avg_rating"):
+            return getattr(self, "avg_rating")
+        reviews = getattr(self, "reviews")
+        return reviews.aggregate(Avg("overall_rating"))["overall_rating__avg"]
+
+    def to_schema(
+        self,
+        location: Optional[LocationSchema] = None,
+        instructor: Optional[InstructorPublicSchema] = None,
+    ) -> DanceClassSchema:
+        if location is None and self.location:
+            location = self.location.to_schema()
+        if instructor is None:
+            instructor = self.instructor.to_instructor_schema()
         return DanceClassSchema(
             id=self.id,
             name=self.name,
             description=self.description,
-            instructor_id=self.instructor.id,
+            instructor_id=self.instructor_id,
             level=self.level,
             price=self.price,
             duration=self.duration,
             start_date=self.start_date,
             end_date=self.end_date,
-            location=self.location.to_schema() if self.location else None,
+            location=location,
             created_at=self.created_at,
             updated_at=self.updated_at,
             style=self.style,
-            instructor=self.instructor.to_instructor_schema(),
-            avg_rating=reviews.aggregate(Avg('overall_rating'))['overall_rating__avg'] if reviews else None,
+            instructor=instructor,
+            avg_rating=self.get_avg_rating(),
         )
+
+
+class ClassTrendingState(models.Model):
+    """Exponentially decayed review activity of a recently reviewed class.
+
+    Both accumulators are decayed to `decayed_at`; the trending refresh job
+    decays every row to the run time and adds the reviews written since the
+    previous run (see classes.services.trending).
+    """
+
+    dance_class = models.OneToOneField(
+        DanceClass,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="trending_state",
+    )
+    decayed_count = models.FloatField(default=0)
+    decayed_rating_sum = models.FloatField(default=0)
+    decayed_at = models.DateTimeField()
+
+
+class TrendingAppliedReview(models.Model):
+    """A review already added to the trending state by a refresh.
+
+    Each refresh re-reads the reviews created shortly before the previous
+    run, as some may have committed after it; the ones listed here are
+    skipped. Rows older than that window are pruned.
+    """
+
+    # Not a foreign key: reviews depend on this app
+    review_id = models.UUIDField(primary_key=True)
+    review_created_at = models.DateTimeField(db_index=True)
+
+
+class TrendingClass(models.Model):
+    """One ranked entry of a precomputed trending list"""
+
+    list_key = models.CharField(
+        max_length=150,
+        help_text='"all", or the style and/or level filter, e.g. "style=salsa"',
+    )
+    rank = models.PositiveIntegerField()
+    dance_class = models.ForeignKey(
+        DanceClass, on_delete=models.CASCADE, related_name="trending_entries"
+    )
+    score = models.FloatField()
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["list_key", "rank"], name="unique_trending_rank"
+            )
+        ]
@@ -2,6 +2,7 @@ from datetime import date as Date
 from datetime import datetime
 from decimal import Decimal
 from typing import Optional
+from uuid import UUID
 from ninja import Schema
 from classes.schemas.user_schema import InstructorPublicSchema
 from classes.schemas.location import LocationSchema
@@ -19,11 +20,12 @@ class CreateDanceClassSchema(Schema):
 
 
 class DanceClassSchema(CreateDanceClassSchema):
-    id: str
-    instructor_id: str
+    id: UUID
+    instructor_id: UUID
     created_at: datetime
     updated_at: datetime
     instructor: Optional[InstructorPublicSchema]
     location: Optional[LocationSchema]
     duration: int
     avg_rating: Optional[float]
+    distance_km: Optional[float] = None
@@ -1,11 +1,12 @@
 from ninja import Schema
 from typing import Optional, List
+from uuid import UUID
 
 from shared.const import Facilities, SportsCard
 
 
 class LocationSchema(Schema):
-    id: str
+    id: UUID
     name: str
     address: str
     latitude: Optional[float] = None
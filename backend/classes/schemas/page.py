@@ -0,0 +1,36 @@
+from typing import Optional
+from ninja import Schema
+from classes.schemas.dance_class import DanceClassSchema
+from classes.schemas.location import LocationSchema
+from classes.schemas.user_schema import InstructorPublicSchema
+from reviews.schemas.response import (
+    ReviewDanceClassStatsSchema,
+    ReviewDetailedDanceClassStatsSchema,
+    ReviewDetailedInstructorStatsSchema,
+    ReviewDetailedLocationStatsSchema,
+)
+from shared.pagination import CursorPageSchema
+
+
+class ClassPageSchema(Schema):
+    """A class with the sections named in include=, null when not included"""
+
+    dance_class: DanceClassSchema
+    stats: Optional[ReviewDetailedDanceClassStatsSchema] = None
+    reviews: Optional[CursorPageSchema[ReviewDanceClassStatsSchema]] = None
+
+
+class LocationPageSchema(Schema):
+    """A location with the sections named in include=, null when not included"""
+
+    location: LocationSchema
+    stats: Optional[ReviewDetailedLocationStatsSchema] = None
+    classes: Optional[CursorPageSchema[DanceClassSchema]] = None
+
+
+class InstructorPageSchema(Schema):
+    """An instructor with the sections named in include=, null when not included"""
+
+    instructor: InstructorPublicSchema
+    stats: Optional[ReviewDetailedInstructorStatsSchema] = None
+    classes: Optional[CursorPageSchema[DanceClassSchema]] = None
@@ -1,11 +1,12 @@
 from typing import Optional
+from uuid import UUID
 from ninja import Schema
 
 
 class UserPublicSchema(Schema):
     """Public user information"""
 
-    id: str
+    id: UUID
     first_name: str
     last_name: str
     bio: Optional[str]
@@ -1,12 +1,52 @@
+from math import ceil, log
 from typing import List, Optional
-from django.db.models import Avg, F, Count, FloatField
+from django.db.models import F, Q
+from django.db.models.functions import Coalesce
 from classes.models import DanceClass
 from classes.schemas.dance_class import DanceClassSchema
-from django.db.models.functions import ACos, Cos, Radians, Sin, Cast
+from classes.services.class_serializer import DanceClassSerializer
+from classes.services.trending import trending_list_key
+from shared.async_twin import async_twin
+from shared.metrics import instrumented
+from shared.pagination import DEFAULT_PAGE_SIZE, CursorPageSchema, KeysetPaginator
+from shared.query_count import expect_repeated_queries
+from shared.geo import (
+    bounding_box,
+    geohash_box_precision,
+    geohash_cells_in_box,
+    geohash_prefix_upper_bound,
+    haversine_km,
+)
 from datetime import date
 
+# A nearest-neighbour search without a radius starts with a small box and
+# widens it fourfold until it holds enough classes (or spans half the globe).
+NEARBY_START_RADIUS_KM = 2.0
+NEARBY_MAX_RADIUS_KM = 20_000.0
+# Search boxes tried at most: 2, 8, 32, ... km, then NEARBY_MAX_RADIUS_KM
+NEARBY_MAX_SEARCHES = ceil(log(NEARBY_MAX_RADIUS_KM / NEARBY_START_RADIUS_KM, 4)) + 1
+# Upper bound on geohash cells per search box; more cells mean tighter
+# candidate sets but a longer OR of index range scans.
+NEARBY_MAX_CELLS = 32
 
+# Keyset orderings of the class listing by sort_by. rating is the stored
+# average rating (0 until reviewed); each ordering is served by a DanceClass
+# index read forwards or backwards, so deep pages cost the same as the first.
+CLASS_LIST_PAGINATORS = {
+    "rating_desc": KeysetPaginator("-rating", "-created_at", "-pk"),
+    "price_asc": KeysetPaginator("price", "-rating", "pk"),
+    "price_desc": KeysetPaginator("-price", "-rating", "-pk"),
+    "date_desc": KeysetPaginator("-start_date", "-rating", "-pk"),
+    None: KeysetPaginator("-rating", "-created_at", "-pk"),
+}
+# Classes of one instructor or location, in schedule order
+SCHEDULE_PAGINATOR = KeysetPaginator("start_date")
+
+
+@instrumented
 class ClassSearchEngineService:
+    def __init__(self):
+        self.serializer = DanceClassSerializer()
 
     def get_classes_near_location(
         self,
@@ -15,29 +55,121 @@ class ClassSearchEngineService:
         start_date: date,
         end_date: date,
         limit: int = 10,
+        radius_km: Optional[float] = None,
+        rating_tiebreak: bool = True,
     ) -> List[DanceClassSchema]:
-        user_lat_rad = Radians(F("location__latitude"))
-        user_lon_rad = Radians(F("location__longitude"))
-
-        classes = (
-            DanceClass.objects.annotate(
-                distance=Cast(
-                    ACos(
-                        Sin(Radians(F("location__latitude"))) * Sin(user_lat_rad)
-                        + Cos(Radians(F("location__latitude")))
-                        * Cos(user_lat_rad)
-                        * Cos(Radians(F("location__longitude")) - user_lon_rad)
-                    )
-                    * 6371.0,
-                    output_field=FloatField(),
+        """Get the classes closest to a point, nearest first.
+
+        Candidates are prefiltered on the indexed geohash of their location
+        (every cell intersecting the search box) and refined with an exact
+        haversine distance. Without a radius the box is widened until it is
+        guaranteed to contain the `limit` nearest classes.
+        """
+        if limit <= 0:
+            return []
+        classes = self._nearby_candidates(start_date, end_date)
+
+        search_radius_km = radius_km or NEARBY_START_RADIUS_KM
+        # One query per widening, at most NEARBY_MAX_SEARCHES
+        with expect_repeated_queries():
+            while True:
+                rows = classes.filter(
+                    self._nearby_cells(latitude, longitude, search_radius_km)
                 )
-            )
-            .filter(end_date__gte=start_date, start_date__lte=end_date)
-            .annotate(avg_rating=Avg("reviews__overall_rating"))
-            .order_by("-avg_rating")[:limit]
+                nearest = self._within_radius(
+                    rows, latitude, longitude, search_radius_km
+                )
+                next_radius_km = self._next_radius(
+                    nearest, limit, radius_km, search_radius_km
+                )
+                if next_radius_km is None:
+                    break
+                search_radius_km = next_radius_km
+
+        distances = self._nearest_distances(nearest, limit)
+        candidates = list(
+            self.serializer.prepare(DanceClass.objects.filter(id__in=distances))
         )
+        return self._rank_nearby(candidates, distances, limit, rating_tiebreak)
+
+    aget_classes_near_location = async_twin(get_classes_near_location)
+
+    def _nearby_candidates(self, start_date: date, end_date: date):
+        """(id, latitude, longitude) of the located classes in the date range"""
+        return DanceClass.objects.filter(
+            end_date__gte=start_date,
+            start_date__lte=end_date,
+            location__geohash__isnull=False,
+        ).values_list("id", "location__latitude", "location__longitude")
+
+    def _nearby_cells(self, latitude: float, longitude: float, radius_km: float) -> Q:
+        """Filter on every geohash cell intersecting the search box"""
+        box = bounding_box(latitude, longitude, radius_km)
+        precision = geohash_box_precision(*box, max_cells=NEARBY_MAX_CELLS)
+        cells = Q()
+        for cell in geohash_cells_in_box(*box, precision):
+            cell_range = Q(location__geohash__gte=cell)
+            upper_bound = geohash_prefix_upper_bound(cell)
+            if upper_bound:
+                cell_range &= Q(location__geohash__lt=upper_bound)
+            cells |= cell_range
+        return cells
+
+    def _within_radius(
+        self, rows, latitude: float, longitude: float, radius_km: float
+    ) -> List[tuple]:
+        """(distance, id) of the candidate rows inside the radius"""
+        nearest = []
+        for class_id, class_lat, class_lon in rows:
+            distance = haversine_km(
+                latitude, longitude, float(class_lat), float(class_lon)
+            )
+            if distance <= radius_km:
+                nearest.append((distance, class_id))
+        return nearest
+
+    def _next_radius(
+        self,
+        nearest: List[tuple],
+        limit: int,
+        radius_km: Optional[float],
+        search_radius_km: float,
+    ) -> Optional[float]:
+        """Radius of the next, wider search box; None when the search is done"""
+        if (
+            radius_km
+            or len(nearest) >= limit
+            or search_radius_km >= NEARBY_MAX_RADIUS_KM
+        ):
+            return None
+        return min(search_radius_km * 4, NEARBY_MAX_RADIUS_KM)
 
-        return [cls.to_schema() for cls in classes]
+    def _nearest_distances(self, nearest: List[tuple], limit: int) -> dict:
+        nearest.sort()
+        if len(nearest) > limit:
+            # Keep classes tied with the last one so the tiebreak can pick
+            cutoff = nearest[limit - 1][0]
+            nearest = [item for item in nearest if item[0] <= cutoff]
+        return {class_id: distance for distance, class_id in nearest}
+
+    def _rank_nearby(
+        self,
+        candidates: List[DanceClass],
+        distances: dict,
+        limit: int,
+        rating_tiebreak: bool,
+    ) -> List[DanceClassSchema]:
+        if rating_tiebreak:
+            candidates.sort(
+                key=lambda cls: (distances[cls.id], -(cls.get_avg_rating() or 0))
+            )
+        else:
+            candidates.sort(key=lambda cls: distances[cls.id])
+
+        results = self.serializer.serialize_loaded(candidates[:limit])
+        for schema in results:
+            schema.distance_km = round(distances[schema.id], 3)
+        return results
 
     def get_classes_with_filters(
         self,
@@ -49,13 +181,31 @@ class ClassSearchEngineService:
         end_date: Optional[date] = None,
         min_rating: Optional[float] = None,
         sort_by: Optional[str] = None,
-    ) -> List[DanceClassSchema]:
-        """Get classes with filters and sorting"""
-        # Base query with review stats
-        classes = DanceClass.objects.annotate(
-            avg_rating=Avg("reviews__overall_rating"),
-            review_count=Count("reviews"),
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        with_total: bool = False,
+    ) -> CursorPageSchema[DanceClassSchema]:
+        """Get a page of classes with filters and sorting"""
+        classes = self._filtered_classes(
+            instructor_id, location_id, style, level, start_date, end_date, min_rating
         )
+        paginator = CLASS_LIST_PAGINATORS.get(sort_by, CLASS_LIST_PAGINATORS[None])
+        return self._paginate(paginator, classes, cursor, limit, with_total)
+
+    aget_classes_with_filters = async_twin(get_classes_with_filters)
+
+    def _filtered_classes(
+        self,
+        instructor_id: Optional[str],
+        location_id: Optional[str],
+        style: Optional[str],
+        level: Optional[str],
+        start_date: Optional[date],
+        end_date: Optional[date],
+        min_rating: Optional[float],
+    ):
+        # Base query with the stored review stats
+        classes = DanceClass.objects.annotate(avg_rating=F("rating_stats__avg_rating"))
 
         # Apply filters
         if instructor_id:
@@ -71,53 +221,113 @@ class ClassSearchEngineService:
         if end_date:
             classes = classes.filter(start_date__lte=end_date)
         if min_rating:
-            classes = classes.filter(avg_rating__gte=min_rating)
-
-        # Apply sorting
-        if sort_by == "rating_desc":
-            classes = classes.order_by("-avg_rating", "-review_count", "-created_at")
-        elif sort_by == "price_asc":
-            classes = classes.order_by("price", "-avg_rating")
-        elif sort_by == "price_desc":
-            classes = classes.order_by("-price", "-avg_rating")
-        elif sort_by == "date_desc":
-            classes = classes.order_by("-start_date", "-avg_rating")
-        else:
-            classes = classes.order_by("-avg_rating", "-created_at")
-
-        return [cls.to_schema() for cls in classes]
+            classes = classes.filter(rating__gte=min_rating)
+        return classes
 
     def get_classes_by_instructor(
-        self, instructor_id: str, include_past: bool = False
-    ) -> List[DanceClassSchema]:
-        """Get classes by instructor"""
-        classes = DanceClass.objects.filter(instructor_id=instructor_id)
-        if not include_past:
-            today = date.today()
-            classes = classes.filter(end_date__gte=today)
+        self,
+        instructor_id: str,
+        include_past: bool = False,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        with_total: bool = False,
+    ) -> CursorPageSchema[DanceClassSchema]:
+        """Get a page of classes by instructor"""
+        classes = self._scheduled_classes(include_past, instructor_id=instructor_id)
+        return self._paginate(SCHEDULE_PAGINATOR, classes, cursor, limit, with_total)
 
-        return [cls.to_schema() for cls in classes]
+    aget_classes_by_instructor = async_twin(get_classes_by_instructor)
 
     def get_classes_by_location(
-        self, location_id: str, include_past: bool = False
-    ) -> List[DanceClassSchema]:
-        """Get classes at a location"""
-        classes = DanceClass.objects.filter(location_id=location_id)
+        self,
+        location_id: str,
+        include_past: bool = False,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        with_total: bool = False,
+    ) -> CursorPageSchema[DanceClassSchema]:
+        """Get a page of classes at a location"""
+        classes = self._scheduled_classes(include_past, location_id=location_id)
+        return self._paginate(SCHEDULE_PAGINATOR, classes, cursor, limit, with_total)
+
+    aget_classes_by_location = async_twin(get_classes_by_location)
+
+    def _scheduled_classes(self, include_past: bool, **lookup):
+        classes = DanceClass.objects.filter(**lookup)
         if not include_past:
             today = date.today()
             classes = classes.filter(end_date__gte=today)
+        return classes
 
-        return [cls.to_schema() for cls in classes]
+    def _paginate(
+        self,
+        paginator: KeysetPaginator,
+        classes,
+        cursor: Optional[str],
+        limit: int,
+        with_total: bool,
+    ) -> CursorPageSchema[DanceClassSchema]:
+        page = paginator.paginate(
+            self.serializer.prepare(classes), cursor, limit, with_total
+        )
+        return page.to_schema(self.serializer.serialize_loaded(page.items))
 
     def get_class_by_id(self, class_id: str) -> DanceClassSchema:
         """Get a single class by ID"""
-        dance_class = DanceClass.objects.get(id=class_id)
-        return dance_class.to_schema()
+        return self.serializer.serialize_one(DanceClass.objects.all(), id=class_id)
+
+    aget_class_by_id = async_twin(get_class_by_id)
+
+    def get_class_version(self, class_id: str) -> Optional[tuple]:
+        """Fingerprint of every row get_class_by_id reads, None if missing"""
+        return self._class_version(class_id).first()
+
+    aget_class_version = async_twin(get_class_version)
+
+    def _class_version(self, class_id: str):
+        return DanceClass.objects.filter(id=class_id).values_list(
+            "updated_at",
+            "location__updated_at",
+            "instructor__updated_at",
+            "rating_stats__review_count",
+            "rating_stats__updated_at",
+        )
+
+    def get_trending_classes(
+        self,
+        style: Optional[str] = None,
+        level: Optional[str] = None,
+        limit: int = 10,
+    ) -> List[DanceClassSchema]:
+        """Get the top of a precomputed trending list (see TrendingService)"""
+        trending = self.serializer.serialize_many(
+            self._trending_classes(style, level, limit)
+        )
+        if trending:
+            return trending
+
+        # Nothing trending yet (or the refresh job has not run): best rated
+        return self.serializer.serialize_many(
+            self._best_rated_classes(style, level), limit=limit
+        )
 
-    def get_trending_classes(self) -> List[DanceClassSchema]:
-        """Get trending classes"""
+    aget_trending_classes = async_twin(get_trending_classes)
+
+    def _trending_classes(self, style: Optional[str], level: Optional[str], limit: int):
+        return DanceClass.objects.filter(
+            trending_entries__list_key=trending_list_key(style, level),
+            trending_entries__rank__lte=limit,
+        ).order_by("trending_entries__rank")
+
+    def _best_rated_classes(self, style: Optional[str], level: Optional[str]):
         classes = DanceClass.objects.annotate(
-            avg_rating=Avg("reviews__overall_rating"),
-            review_count=Count("reviews"),
-        ).order_by("-avg_rating", "-review_count", "-created_at")[:10]
-        return [cls.to_schema() for cls in classes]
\ No newline at end of file
+            avg_rating=F("rating_stats__avg_rating"),
+            review_count=Coalesce("rating_stats__review_count", 0),
+        ).order_by(
+            F("avg_rating").desc(nulls_last=True), "-review_count", "-created_at"
+        )
+        if style:
+            classes = classes.filter(style=style)
+        if level:
+            classes = classes.filter(level=level)
+        return classes
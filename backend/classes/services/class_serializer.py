@@ -0,0 +1,61 @@
+from typing import Dict, List, Optional
+from django.db.models import F, QuerySet
+from classes.models import DanceClass
+from classes.schemas.dance_class import DanceClassSchema
+from classes.schemas.location import LocationSchema
+from classes.schemas.user_schema import InstructorPublicSchema
+
+
+class DanceClassSerializer:
+    """Builds DanceClassSchema objects for a whole queryset in one query.
+
+    Instructors and locations come from select_related, the average rating
+    from the stored rating stats, and the nested schemas are built once per distinct
+    instructor or location and shared between the classes that reference it.
+    """
+
+    def prepare(self, classes: QuerySet[DanceClass]) -> QuerySet[DanceClass]:
+        """Add the joins and annotations serialization needs.
+
+        Apply before slicing; querysets that already annotate avg_rating keep
+        their own annotation.
+        """
+        classes = classes.select_related("instructor", "location")
+        if "avg_rating" not in classes.query.annotations:
+            classes = classes.annotate(avg_rating=F("rating_stats__avg_rating"))
+        return classes
+
+    def serialize_many(
+        self, classes: QuerySet[DanceClass], limit: Optional[int] = None
+    ) -> List[DanceClassSchema]:
+        classes = self.prepare(classes)
+        if limit is not None:
+            classes = classes[:limit]
+        return self.serialize_loaded(classes)
+
+    def serialize_one(
+        self, classes: QuerySet[DanceClass], **lookup
+    ) -> DanceClassSchema:
+        """Serialize a single class, raising DanceClass.DoesNotExist if missing"""
+        return self.serialize_loaded([self.prepare(classes).get(**lookup)])[0]
+
+    def serialize_loaded(self, classes) -> List[DanceClassSchema]:
+        """Serialize classes already fetched through prepare()"""
+        locations: Dict[str, LocationSchema] = {}
+        instructors: Dict[str, InstructorPublicSchema] = {}
+        schemas = []
+        for dance_class in classes:
+            location = None
+            if dance_class.location is not None:
+                location = locations.get(dance_class.location.id)
+                if location is None:
+                    location = dance_class.location.to_schema()
+                    locations[dance_class.location.id] = location
+            instructor = instructors.get(dance_class.instructor_id)
+            if instructor is None:
+                instructor = dance_class.instructor.to_instructor_schema()
+                instructors[dance_class.instructor_id] = instructor
+            schemas.append(
+                dance_class.to_schema(location=location, instructor=instructor)
+            )
+        return schemas
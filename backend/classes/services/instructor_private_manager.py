@@ -2,17 +2,20 @@ from typing import List
 from classes.models import DanceClass
 from classes.schemas.dance_class import CreateDanceClassSchema, DanceClassSchema
 from classes.schemas.instructor import InstructorStatsSchema
+from classes.services.class_serializer import DanceClassSerializer
 from django.db.models import Sum, Avg
 
 
 class InstructorPrivateManagerService:
+    def __init__(self):
+        self.serializer = DanceClassSerializer()
+
     def get_classes_by_instructor(self, instructor_id: str) -> List[DanceClassSchema]:
         classes = DanceClass.objects.filter(instructor_id=instructor_id)
-        return [class_.to_schema() for class_ in classes]
+        return self.serializer.serialize_many(classes)
 
     def get_class_by_id(self, class_id: str) -> DanceClassSchema:
-        class_ = DanceClass.objects.get(id=class_id)
-        return class_.to_schema()
+        return self.serializer.serialize_one(DanceClass.objects.all(), id=class_id)
 
     def get_instructor_stats(self, instructor_id: str) -> InstructorStatsSchema:
         classes = DanceClass.objects.filter(instructor_id=instructor_id)
@@ -1,30 +1,59 @@
-from typing import List, Optional
-from django.db.models import Avg, Count
+from datetime import date
+from typing import Optional
+from django.db.models import Count, Exists, OuterRef, QuerySet, Subquery
+from django.db.models.functions import Coalesce
 from accounts.models import User
-from classes.services.class_search_engine import ClassSearchEngineService
+from classes.models import DanceClass
 from classes.schemas.user_schema import InstructorPublicSchema
+from shared.async_twin import async_twin
+from shared.pagination import DEFAULT_PAGE_SIZE, CursorPageSchema, KeysetPaginator
+
+# Keyset orderings of the instructor listing by sort_by; rating is the stored
+# average rating (0 until reviewed), read backwards from the User index on
+# (role, rating, created_at, id). The class count is computed per request,
+# so its ordering has no index.
+INSTRUCTOR_LIST_PAGINATORS = {
+    "rating_desc": KeysetPaginator("-rating", "-created_at", "-pk"),
+    "classes_count_desc": KeysetPaginator("-classes_count", "-rating"),
+    None: KeysetPaginator("-rating", "-created_at", "-pk"),
+}
 
 
 class InstructorPublicManagerService:
-    def __init__(self):
-        self.class_search_engine = ClassSearchEngineService()
+    def _annotated_instructors(self) -> QuerySet[User]:
+        """Instructors annotated with every stat of their public profile.
+
+        Ratings are stored on the user and its rating stats row and the
+        class count comes from a scalar subquery, so the query never fans out and a
+        page of instructors is serialized without further queries.
+        """
+        upcoming_classes = (
+            DanceClass.objects.filter(
+                instructor=OuterRef("pk"), end_date__gte=date.today()
+            )
+            .order_by()
+            .values("instructor")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        return User.objects.filter(role="instructor").annotate(
+            total_reviews=Coalesce("rating_stats__review_count", 0),
+            classes_count=Coalesce(Subquery(upcoming_classes), 0),
+        )
 
     def _get_instructor_public_profile(
         self, instructor: User
     ) -> InstructorPublicSchema:
-        instructor_schema = instructor.to_schema()
-        instructor_classes = self.class_search_engine.get_classes_by_instructor(
-            instructor.id
-        )
+        """Serialize an instructor loaded by _annotated_instructors"""
         return InstructorPublicSchema(
-            id=instructor_schema.id,
-            first_name=instructor_schema.first_name,
-            last_name=instructor_schema.last_name,
-            bio=instructor_schema.bio,
-            profile_picture=instructor_schema.profile_picture,
-            classes_count=len(instructor_classes),
-            rating=0,
-            reviews_count=0,
+            id=instructor.id,
+            first_name=instructor.first_name,
+            last_name=instructor.last_name,
+            bio=instructor.bio,
+            profile_picture=instructor.profile_picture_url,
+            classes_count=getattr(instructor, "classes_count"),
+            rating=instructor.rating,
+            reviews_count=getattr(instructor, "total_reviews"),
         )
 
     def get_instructors(
@@ -32,46 +61,40 @@ class InstructorPublicManagerService:
         min_rating: Optional[float] = None,
         style: Optional[str] = None,
         sort_by: Optional[str] = None,
-    ) -> List[InstructorPublicSchema]:
-        """Get instructors with optional filters and sorting"""
-        # Base query with aggregated stats
-        instructors = User.objects.filter(role="instructor").annotate(
-            # Get average rating from reviews that reference this instructor through instructor_stats
-            avg_rating=Avg("instructor_reviews__overall_rating"),
-            classes_count=Count("classes", distinct=True),
-            total_reviews=Count("instructor_reviews", distinct=True),
-        )
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        with_total: bool = False,
+    ) -> CursorPageSchema[InstructorPublicSchema]:
+        """Get a page of instructors with optional filters and sorting"""
+        instructors = self._annotated_instructors()
 
         # Apply filters
         if min_rating:
-            instructors = instructors.filter(avg_rating__gte=min_rating)
+            instructors = instructors.filter(rating__gte=min_rating)
         if style:
-            instructors = instructors.filter(classes__style=style)
+            instructors = instructors.filter(
+                Exists(
+                    DanceClass.objects.filter(instructor=OuterRef("pk"), style=style)
+                )
+            )
 
         # Apply sorting
-        if sort_by == "rating_desc":
-            instructors = instructors.order_by("-avg_rating", "-total_reviews")
-        elif sort_by == "classes_count_desc":
-            instructors = instructors.order_by("-classes_count", "-avg_rating")
-        else:
-            instructors = instructors.order_by("-avg_rating", "-classes_count")
+        paginator = INSTRUCTOR_LIST_PAGINATORS.get(
+            sort_by, INSTRUCTOR_LIST_PAGINATORS[None]
+        )
+        page = paginator.paginate(instructors, cursor, limit, with_total)
+        return page.to_schema(
+            [
+                self._get_instructor_public_profile(instructor)
+                for instructor in page.items
+            ]
+        )
 
-        return [
-            self._get_instructor_public_profile(instructor)
-            for instructor in instructors.distinct()
-        ]
+    aget_instructors = async_twin(get_instructors)
 
     def get_instructor_by_id(self, instructor_id: str) -> InstructorPublicSchema:
         """Get instructor details with aggregated stats"""
-        instructor = (
-            User.objects.filter(role="instructor")
-            .annotate(
-                # Get average rating from reviews that reference this instructor through instructor_stats
-                avg_rating=Avg("instructor_reviews__overall_rating"),
-                classes_count=Count("classes", distinct=True),
-                total_reviews=Count("instructor_reviews", distinct=True),
-            )
-            .get(id=instructor_id)
-        )
-
+        instructor = self._annotated_instructors().get(id=instructor_id)
         return self._get_instructor_public_profile(instructor)
+
+    aget_instructor_by_id = async_twin(get_instructor_by_id)
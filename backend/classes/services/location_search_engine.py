@@ -1,11 +1,20 @@
-from typing import List, Optional
+from typing import Optional
 from django.db import models
-from django.db.models import Count, Avg
-from classes.models import Location
+from django.db.models import Count, Exists, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from classes.models import DanceClass, Location
 from classes.schemas.location import LocationSchema
+from shared.const import Facilities, SportsCard
+from shared.flags import FlagMatch, match_flags, parse_mask
+from shared.async_twin import async_twin
+from shared.metrics import instrumented
+from shared.pagination import DEFAULT_PAGE_SIZE, CursorPageSchema, KeysetPaginator
 from math import cos, radians
 
+LOCATION_PAGINATOR = KeysetPaginator("name")
 
+
+@instrumented
 class LocationSearchEngineService:
     def get_locations(
         self,
@@ -16,8 +25,13 @@ class LocationSearchEngineService:
         min_location_rating: Optional[float] = None,
         radius_km: Optional[float] = None,
         facility: Optional[str] = None,
+        facility_match: FlagMatch = "all",
         sports_card: Optional[str] = None,
-    ) -> List[LocationSchema]:
+        sports_card_match: FlagMatch = "any",
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        with_total: bool = False,
+    ) -> CursorPageSchema[LocationSchema]:
         locations = self._get_filtered_locations(
             has_active_classes=has_active_classes,
             dance_style=dance_style,
@@ -25,9 +39,12 @@ class LocationSearchEngineService:
             min_classes=min_classes,
             min_location_rating=min_location_rating,
             facility=facility,
+            facility_match=facility_match,
             sports_card=sports_card,
+            sports_card_match=sports_card_match,
         )
-        return [location.to_schema() for location in locations]
+        return self._paginate(locations, cursor, limit, with_total)
+
     def get_locations_nearby(
         self,
         has_active_classes: bool = True,
@@ -39,8 +56,13 @@ class LocationSearchEngineService:
         min_location_rating: Optional[float] = None,
         radius_km: Optional[float] = None,
         facility: Optional[str] = None,
+        facility_match: FlagMatch = "all",
         sports_card: Optional[str] = None,
-    ) -> List[LocationSchema]:
+        sports_card_match: FlagMatch = "any",
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        with_total: bool = False,
+    ) -> CursorPageSchema[LocationSchema]:
         locations = self._get_filtered_locations(
             has_active_classes=has_active_classes,
             dance_style=dance_style,
@@ -48,28 +70,47 @@ class LocationSearchEngineService:
             min_classes=min_classes,
             min_location_rating=min_location_rating,
             facility=facility,
+            facility_match=facility_match,
             sports_card=sports_card,
+            sports_card_match=sports_card_match,
         )
-
         if latitude and longitude:
-            # Convert kilometers to degrees (approximate)
-            # 1 degree of latitude = ~111km
-            # 1 degree of longitude = ~111km * cos(latitude)
-            radius_km = radius_km or 10  # Default 10km radius, can be made configurable
-            lat_degree_delta = radius_km / 111.0
-            lng_degree_delta = radius_km / (111.0 * abs(cos(radians(latitude))))
+            locations = self._within_box(locations, latitude, longitude, radius_km)
+        return self._paginate(locations, cursor, limit, with_total)
 
-            locations = locations.filter(
-                latitude__isnull=False, longitude__isnull=False
-            )
-            locations = locations.filter(
-                models.Q(latitude__lte=latitude + lat_degree_delta)
-                & models.Q(latitude__gte=latitude - lat_degree_delta)
-                & models.Q(longitude__lte=longitude + lng_degree_delta)
-                & models.Q(longitude__gte=longitude - lng_degree_delta)
-            )
+    aget_locations_nearby = async_twin(get_locations_nearby)
+
+    def _within_box(
+        self,
+        locations: models.QuerySet,
+        latitude: float,
+        longitude: float,
+        radius_km: Optional[float],
+    ) -> models.QuerySet:
+        # Convert kilometers to degrees (approximate)
+        # 1 degree of latitude = ~111km
+        # 1 degree of longitude = ~111km * cos(latitude)
+        radius_km = radius_km or 10  # Default 10km radius, can be made configurable
+        lat_degree_delta = radius_km / 111.0
+        lng_degree_delta = radius_km / (111.0 * abs(cos(radians(latitude))))
 
-        return [location.to_schema() for location in locations]
+        locations = locations.filter(latitude__isnull=False, longitude__isnull=False)
+        return locations.filter(
+            models.Q(latitude__lte=latitude + lat_degree_delta)
+            & models.Q(latitude__gte=latitude - lat_degree_delta)
+            & models.Q(longitude__lte=longitude + lng_degree_delta)
+            & models.Q(longitude__gte=longitude - lng_degree_delta)
+        )
+
+    def _paginate(
+        self,
+        locations: models.QuerySet,
+        cursor: Optional[str],
+        limit: int,
+        with_total: bool,
+    ) -> CursorPageSchema[LocationSchema]:
+        page = LOCATION_PAGINATOR.paginate(locations, cursor, limit, with_total)
+        return page.to_schema([location.to_schema() for location in page.items])
 
     def _get_filtered_locations(
         self,
@@ -79,40 +120,55 @@ class LocationSearchEngineService:
         min_classes: Optional[int] = None,
         min_location_rating: Optional[float] = None,
         facility: Optional[str] = None,
+        facility_match: FlagMatch = "all",
         sports_card: Optional[str] = None,
+        sports_card_match: FlagMatch = "any",
     ) -> models.QuerySet:
+        """Filter locations with EXISTS and scalar subqueries.
+
+        Class and review filters never join into the location rows, so
+        nothing fans out and no DISTINCT is needed; the average rating is the
+        location's stored rating column.
+        """
         locations = Location.objects.all()
 
-        # Start with base filtering
+        classes = DanceClass.objects.filter(location=OuterRef("pk"))
         if has_active_classes:
-            locations = locations.filter(classes__isnull=False).distinct()
-
+            locations = locations.filter(Exists(classes))
         if dance_style:
-            dance_styles = dance_style.split(',')
-            locations = locations.filter(classes__style__in=dance_styles)
+            dance_styles = dance_style.split(",")
+            locations = locations.filter(Exists(classes.filter(style__in=dance_styles)))
         if level:
-            levels = level.split(',')
-            locations = locations.filter(classes__level__in=levels)
+            levels = level.split(",")
+            locations = locations.filter(Exists(classes.filter(level__in=levels)))
         if facility:
-            facilities = facility.split(',')
-            locations = locations.filter(facilities__in=facilities)
+            mask = parse_mask(Facilities, facility)
+            locations = locations.filter(
+                match_flags("facilities", mask, facility_match)
+            )
         if sports_card:
-            sports_cards = sports_card.split(',')
-            locations = locations.filter(sports_card__in=sports_cards)
-
-        # Add annotations for class count and average rating
-        locations = locations.annotate(
-            class_count=Count('classes', distinct=True),
-            avg_rating=Avg('reviews__overall_rating'),
-        )
+            mask = parse_mask(SportsCard, sports_card)
+            locations = locations.filter(
+                match_flags("sports_card", mask, sports_card_match)
+            )
 
         if min_classes:
-            locations = locations.filter(class_count__gte=min_classes)
+            class_count = (
+                classes.order_by()
+                .values("location")
+                .annotate(count=Count("pk"))
+                .values("count")
+            )
+            locations = locations.alias(
+                class_count=Coalesce(Subquery(class_count), 0)
+            ).filter(class_count__gte=min_classes)
         if min_location_rating:
-            locations = locations.filter(avg_rating__gte=min_location_rating)
+            locations = locations.filter(rating__gte=min_location_rating)
 
         return locations
 
     def get_location_by_id(self, location_id: str) -> LocationSchema:
         location = Location.objects.get(id=location_id)
         return location.to_schema()
+
+    aget_location_by_id = async_twin(get_location_by_id)
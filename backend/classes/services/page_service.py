@@ -0,0 +1,93 @@
+from typing import Optional
+from classes.schemas.page import (
+    ClassPageSchema,
+    InstructorPageSchema,
+    LocationPageSchema,
+)
+from classes.services.class_search_engine import ClassSearchEngineService
+from classes.services.instructor_public_manager import InstructorPublicManagerService
+from classes.services.location_search_engine import LocationSearchEngineService
+from reviews.services.review_manager import ReviewManagerService
+from reviews.services.stats_service import ReviewStatsService
+from shared.async_twin import async_twin
+from shared.include import parse_include
+
+# Sections each composite page may include, as named in include=
+CLASS_PAGE_SECTIONS = ("stats", "reviews")
+LOCATION_PAGE_SECTIONS = ("stats", "classes")
+INSTRUCTOR_PAGE_SECTIONS = ("stats", "classes")
+# Items in the first page of an included list section
+PAGE_SECTION_LIMIT = 10
+
+
+class PageService:
+    """Composite detail pages: an entity plus the sections named in include=.
+
+    Each section is one service call, made in turn: Django runs a request's
+    queries one at a time on its sync thread, so starting them together
+    would not overlap them. The async twins run a whole page on that thread.
+    """
+
+    def __init__(self):
+        self.class_search_engine = ClassSearchEngineService()
+        self.location_search_engine = LocationSearchEngineService()
+        self.instructor_manager = InstructorPublicManagerService()
+        self.review_manager = ReviewManagerService()
+        self.stats_service = ReviewStatsService()
+
+    def get_class_page(
+        self,
+        class_id: str,
+        include: Optional[str] = None,
+        limit: int = PAGE_SECTION_LIMIT,
+    ) -> ClassPageSchema:
+        sections = parse_include(include, CLASS_PAGE_SECTIONS)
+        dance_class = self.class_search_engine.get_class_by_id(class_id)
+        stats = reviews = None
+        if "stats" in sections:
+            stats = self.stats_service.get_dance_class_stats(class_id)
+        if "reviews" in sections:
+            reviews = self.review_manager.get_class_reviews_paginated(
+                class_id, limit=limit
+            )
+        return ClassPageSchema(dance_class=dance_class, stats=stats, reviews=reviews)
+
+    aget_class_page = async_twin(get_class_page)
+
+    def get_location_page(
+        self,
+        location_id: str,
+        include: Optional[str] = None,
+        limit: int = PAGE_SECTION_LIMIT,
+    ) -> LocationPageSchema:
+        sections = parse_include(include, LOCATION_PAGE_SECTIONS)
+        location = self.location_search_engine.get_location_by_id(location_id)
+        stats = classes = None
+        if "stats" in sections:
+            stats = self.stats_service.get_location_stats(location_id)
+        if "classes" in sections:
+            classes = self.class_search_engine.get_classes_by_location(
+                location_id, limit=limit
+            )
+        return LocationPageSchema(location=location, stats=stats, classes=classes)
+
+    aget_location_page = async_twin(get_location_page)
+
+    def get_instructor_page(
+        self,
+        instructor_id: str,
+        include: Optional[str] = None,
+        limit: int = PAGE_SECTION_LIMIT,
+    ) -> InstructorPageSchema:
+        sections = parse_include(include, INSTRUCTOR_PAGE_SECTIONS)
+        instructor = self.instructor_manager.get_instructor_by_id(instructor_id)
+        stats = classes = None
+        if "stats" in sections:
+            stats = self.stats_service.get_instructor_stats(instructor_id)
+        if "classes" in sections:
+            classes = self.class_search_engine.get_classes_by_instructor(
+                instructor_id, limit=limit
+            )
+        return InstructorPageSchema(instructor=instructor, stats=stats, classes=classes)
+
+    aget_instructor_page = async_twin(get_instructor_page)
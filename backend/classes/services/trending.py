@@ -0,0 +1,201 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+from django.db import transaction
+from django.db.models import F, Max, Sum
+from django.utils import timezone
+from classes.models import ClassTrendingState, TrendingAppliedReview, TrendingClass
+from reviews.models import DanceClassRatingStats, DanceClassReview
+from shared.response_cache import TRENDING, response_cache
+
+# A review's weight halves every TRENDING_HALF_LIFE
+TRENDING_HALF_LIFE = timedelta(days=7)
+# Full rebuilds ignore reviews older than this many half-lives (weight < 0.4%)
+TRENDING_HORIZON_HALF_LIVES = 8
+# Classes whose decayed review count falls below this leave the state table
+TRENDING_MIN_WEIGHT = 0.01
+# Weight, in decayed reviews, of the global mean rating in the Bayesian prior
+TRENDING_PRIOR_WEIGHT = 3.0
+# Mean rating assumed before any class has been reviewed
+TRENDING_DEFAULT_MEAN_RATING = 3.0
+# Entries stored per trending list
+TRENDING_LIST_SIZE = 50
+# Longest a review may take to commit after its created_at is set. Each
+# refresh re-reads this much before the previous run and skips the reviews
+# it already applied; reviews committing later still are only counted by
+# the next full rebuild.
+TRENDING_COMMIT_OVERLAP = timedelta(minutes=10)
+
+
+def trending_list_key(style: Optional[str] = None, level: Optional[str] = None) -> str:
+    """Key of the trending list for a style and/or level filter"""
+    parts = []
+    if style:
+        parts.append(f"style={style}")
+    if level:
+        parts.append(f"level={level}")
+    return "&".join(parts) or "all"
+
+
+@dataclass
+class TrendingRefreshResult:
+    full: bool
+    new_reviews: int
+    tracked_classes: int
+    lists: int
+
+
+class TrendingService:
+    """Maintains the precomputed trending class lists.
+
+    A class's trending score is its review velocity, the exponentially
+    decayed count of its reviews, times a Bayesian estimate of its recent
+    rating that shrinks towards the global mean when there are few reviews.
+
+    Decay is applied incrementally: refresh() multiplies every state row by
+    the decay since the previous run and adds only the reviews written since
+    then, so a run costs the new reviews plus the small set of classes with
+    recent activity. A review is stamped before its transaction commits, so
+    the window starts TRENDING_COMMIT_OVERLAP before the previous run and
+    skips the reviews recorded as applied. Review edits and deletions are
+    only picked up by a full rebuild, which the periodic job should run
+    daily.
+    """
+
+    def refresh(
+        self, now: Optional[datetime] = None, full: bool = False
+    ) -> TrendingRefreshResult:
+        now = now or timezone.now()
+        with transaction.atomic():
+            last_run = ClassTrendingState.objects.aggregate(last=Max("decayed_at"))[
+                "last"
+            ]
+            reviews = DanceClassReview.objects.filter(created_at__lte=now)
+            if full or last_run is None:
+                full = True
+                ClassTrendingState.objects.all().delete()
+                TrendingAppliedReview.objects.all().delete()
+                horizon = TRENDING_HALF_LIFE * TRENDING_HORIZON_HALF_LIVES
+                reviews = reviews.filter(created_at__gt=now - horizon)
+            else:
+                decay = self._decay(now - last_run)
+                ClassTrendingState.objects.update(
+                    decayed_count=F("decayed_count") * decay,
+                    decayed_rating_sum=F("decayed_rating_sum") * decay,
+                    decayed_at=now,
+                )
+                reviews = reviews.filter(
+                    created_at__gt=last_run - TRENDING_COMMIT_OVERLAP
+                ).exclude(pk__in=TrendingAppliedReview.objects.values("review_id"))
+
+            new_reviews = self._add_reviews(reviews, now)
+            ClassTrendingState.objects.filter(
+                decayed_count__lt=TRENDING_MIN_WEIGHT
+            ).delete()
+            # The next run re-reads from now - TRENDING_COMMIT_OVERLAP
+            TrendingAppliedReview.objects.filter(
+                review_created_at__lte=now - TRENDING_COMMIT_OVERLAP
+            ).delete()
+            lists = self._rank(now)
+            response_cache.bump(TRENDING)
+
+        return TrendingRefreshResult(
+            full=full,
+            new_reviews=new_reviews,
+            tracked_classes=ClassTrendingState.objects.count(),
+            lists=lists,
+        )
+
+    def _decay(self, age: timedelta) -> float:
+        return 0.5 ** (max(age, timedelta()) / TRENDING_HALF_LIFE)
+
+    def _add_reviews(self, reviews, now: datetime) -> int:
+        counts: Dict[str, float] = defaultdict(float)
+        rating_sums: Dict[str, float] = defaultdict(float)
+        review_count = 0
+        applied = []
+        for review_id, class_id, created_at, rating in reviews.values_list(
+            "pk", "dance_class_id", "created_at", "overall_rating"
+        ):
+            weight = self._decay(now - created_at)
+            counts[class_id] += weight
+            rating_sums[class_id] += weight * rating
+            review_count += 1
+            if created_at > now - TRENDING_COMMIT_OVERLAP:
+                applied.append(
+                    TrendingAppliedReview(
+                        review_id=review_id, review_created_at=created_at
+                    )
+                )
+        TrendingAppliedReview.objects.bulk_create(applied, batch_size=1000)
+
+        states = ClassTrendingState.objects.in_bulk(list(counts))
+        for state in states.values():
+            state.decayed_count += counts[state.pk]
+            state.decayed_rating_sum += rating_sums[state.pk]
+        ClassTrendingState.objects.bulk_update(
+            states.values(), ["decayed_count", "decayed_rating_sum"]
+        )
+        ClassTrendingState.objects.bulk_create(
+            ClassTrendingState(
+                dance_class_id=class_id,
+                decayed_count=counts[class_id],
+                decayed_rating_sum=rating_sums[class_id],
+                decayed_at=now,
+            )
+            for class_id in counts
+            if class_id not in states
+        )
+        return review_count
+
+    def _global_mean_rating(self) -> float:
+        totals = DanceClassRatingStats.objects.aggregate(
+            ratings=Sum("overall_rating_sum"), reviews=Sum("review_count")
+        )
+        if not totals["reviews"]:
+            return TRENDING_DEFAULT_MEAN_RATING
+        return totals["ratings"] / totals["reviews"]
+
+    def _rank(self, now: datetime) -> int:
+        """Rebuild every trending list from the state table in one pass"""
+        prior = TRENDING_PRIOR_WEIGHT * self._global_mean_rating()
+        candidates: Dict[str, List] = defaultdict(list)
+        states = ClassTrendingState.objects.filter(
+            dance_class__end_date__gte=date.today()
+        ).values_list(
+            "dance_class_id",
+            "decayed_count",
+            "decayed_rating_sum",
+            "dance_class__style",
+            "dance_class__level",
+        )
+        for class_id, count, rating_sum, style, level in states:
+            rating = (prior + rating_sum) / (TRENDING_PRIOR_WEIGHT + count)
+            entry = (count * rating, class_id)
+            for key in (
+                trending_list_key(),
+                trending_list_key(style=style),
+                trending_list_key(level=level),
+                trending_list_key(style=style, level=level),
+            ):
+                candidates[key].append(entry)
+
+        entries = []
+        for key, scored in candidates.items():
+            scored.sort(key=lambda entry: (-entry[0], entry[1]))
+            entries.extend(
+                TrendingClass(
+                    list_key=key,
+                    rank=rank,
+                    dance_class_id=class_id,
+                    score=score,
+                    computed_at=now,
+                )
+                for rank, (score, class_id) in enumerate(
+                    scored[:TRENDING_LIST_SIZE], start=1
+                )
+            )
+        TrendingClass.objects.all().delete()
+        TrendingClass.objects.bulk_create(entries, batch_size=1000)
+        return len(candidates)
@@ -0,0 +1,35 @@
+from dataclasses import dataclass
+from random import Random
+from typing import List
+
+import pytest
+
+from accounts.models import User
+from classes.management.bench_data import (
+    create_bench_class_reviews,
+    create_bench_classes,
+    create_bench_instructors,
+    create_bench_locations,
+)
+from classes.models import DanceClass, Location
+from classes.services.trending import TrendingService
+
+
+@dataclass(frozen=True)
+class Catalog:
+    instructors: List[User]
+    locations: List[Location]
+    classes: List[DanceClass]
+
+
+@pytest.fixture
+def catalog(db) -> Catalog:
+    """A few instructors, nearby locations and reviewed classes, with
+    trending computed"""
+    rng = Random(7)
+    instructors = create_bench_instructors(3, prefix="catalog")
+    locations = create_bench_locations(4, rng, spread_degrees=0.05)
+    classes = create_bench_classes(locations, instructors, 3, rng)
+    create_bench_class_reviews(classes, 2, rng)
+    TrendingService().refresh(full=True)
+    return Catalog(instructors, locations, classes)
@@ -0,0 +1,62 @@
+"""Every public endpoint stays within the query budget its route declares
+with query_budget(), and runs no query once per row (N+1)."""
+
+import pytest
+
+from classes.management.bench_data import CENTER_LATITUDE, CENTER_LONGITUDE
+from classes.services.class_search_engine import NEARBY_MAX_SEARCHES
+from shared.query_count import assert_query_budget
+
+# The widest variant of each route: with_total adds a count query, ETag
+# routes a version query, and nearby classes far from every class widen
+# their search up to NEARBY_MAX_SEARCHES times
+PUBLIC_ENDPOINT_BUDGETS = {
+    "/api/public/classes?with_total=true": 2,
+    "/api/public/classes/trending": 2,
+    "/api/public/classes/nearby?latitude={far_lat}&longitude={lon}": (
+        NEARBY_MAX_SEARCHES + 1
+    ),
+    "/api/public/classes/stats?ids={class_id},{other_class_id}": 1,
+    "/api/public/classes/{class_id}": 2,
+    "/api/public/classes/{class_id}/page?include=stats,reviews": 3,
+    "/api/public/classes/{class_id}/stats": 2,
+    "/api/public/classes/{class_id}/reviews?with_total=true": 2,
+    "/api/public/instructors?with_total=true": 2,
+    "/api/public/instructors/stats?ids={instructor_id}": 1,
+    "/api/public/instructors/{instructor_id}": 1,
+    "/api/public/instructors/{instructor_id}/page?include=stats,classes": 3,
+    "/api/public/instructors/{instructor_id}/classes?with_total=true": 2,
+    "/api/public/instructors/{instructor_id}/stats": 2,
+    "/api/public/locations?with_total=true": 2,
+    "/api/public/locations/nearby?latitude={lat}&longitude={lon}&with_total=true": 2,
+    "/api/public/locations/stats?ids={location_id}": 1,
+    "/api/public/locations/{location_id}": 1,
+    "/api/public/locations/{location_id}/page?include=stats,classes": 3,
+    "/api/public/locations/{location_id}/classes?with_total=true": 2,
+    "/api/public/locations/{location_id}/stats": 2,
+}
+
+
+@pytest.fixture(autouse=True)
+def uncached(settings):
+    # Cache hits would skip the queries being counted
+    settings.RESPONSE_CACHE_ENABLED = False
+
+
+@pytest.mark.parametrize("template,budget", PUBLIC_ENDPOINT_BUDGETS.items())
+def test_endpoint_within_budget(client, catalog, template, budget):
+    url = template.format(
+        lat=CENTER_LATITUDE,
+        far_lat=CENTER_LATITUDE + 30,
+        lon=CENTER_LONGITUDE,
+        class_id=catalog.classes[0].id,
+        other_class_id=catalog.classes[1].id,
+        instructor_id=catalog.instructors[0].id,
+        location_id=catalog.locations[0].id,
+    )
+
+    with assert_query_budget(budget, label=url) as queries:
+        response = client.get(url)
+
+    assert response.status_code == 200
+    assert queries.count > 0
@@ -0,0 +1,48 @@
+"""Every public class endpoint runs a pinned number of queries, however
+many classes it returns. A higher count means a per-row query crept back
+in; the error lists every statement, so the repeated one shows."""
+
+import pytest
+
+from classes.management.bench_data import CENTER_LATITUDE, CENTER_LONGITUDE
+from shared.query_count import assert_num_queries
+
+# Routes with an ETag spend one extra query on the version fingerprint
+CLASS_ENDPOINT_QUERY_COUNTS = {
+    "/api/public/classes": 1,
+    "/api/public/classes/trending": 1,
+    "/api/public/classes/nearby?latitude={lat}&longitude={lon}&radius_km=50": 2,
+    "/api/public/classes/{class_id}": 2,
+    "/api/public/classes/{class_id}/stats": 2,
+    "/api/public/classes/stats?ids={class_id},{other_class_id}": 1,
+    "/api/public/classes/{class_id}/page?include=stats,reviews": 3,
+    "/api/public/instructors": 1,
+    "/api/public/instructors/{instructor_id}": 1,
+    "/api/public/instructors/{instructor_id}/classes": 1,
+    "/api/public/instructors/{instructor_id}/page?include=stats,classes": 3,
+    "/api/public/locations/{location_id}/classes": 1,
+    "/api/public/locations/{location_id}/page?include=stats,classes": 3,
+}
+
+
+@pytest.fixture(autouse=True)
+def uncached(settings):
+    # Cache hits would skip the queries being counted
+    settings.RESPONSE_CACHE_ENABLED = False
+
+
+@pytest.mark.parametrize("template,expected", CLASS_ENDPOINT_QUERY_COUNTS.items())
+def test_endpoint_query_count(client, catalog, template, expected):
+    url = template.format(
+        lat=CENTER_LATITUDE,
+        lon=CENTER_LONGITUDE,
+        class_id=catalog.classes[0].id,
+        other_class_id=catalog.classes[1].id,
+        instructor_id=catalog.instructors[0].id,
+        location_id=catalog.locations[0].id,
+    )
+
+    with assert_num_queries(expected, label=url):
+        response = client.get(url)
+
+    assert response.status_code == 200
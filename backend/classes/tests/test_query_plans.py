@@ -0,0 +1,180 @@
+"""EXPLAIN checks that no hot public query falls back to a full table scan.
+
+The tables are seeded large enough, and analyzed, for the planner to pick
+the indexes it would pick on production data.
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from random import Random
+from typing import Any, Callable, Tuple
+
+import pytest
+from django.db import connection
+
+from classes.management.bench_data import (
+    CENTER_LATITUDE,
+    CENTER_LONGITUDE,
+    create_bench_class_reviews,
+    create_bench_classes,
+    create_bench_instructors,
+    create_bench_locations,
+)
+from classes.models import DanceClass, Location
+from classes.services.class_search_engine import ClassSearchEngineService
+from classes.services.instructor_public_manager import InstructorPublicManagerService
+from classes.services.location_search_engine import LocationSearchEngineService
+from reviews.models import DanceClassReview
+from reviews.services.review_manager import ReviewManagerService
+from reviews.services.stats_service import ReviewStatsService
+from shared.benchmark import rolled_back
+from shared.const import DanceStyle, SkillLevel
+from shared.query_plan import assert_no_full_scan, full_scans
+
+
+@dataclass(frozen=True)
+class Seeded:
+    # Services take ids as the API passes them, as strings
+    class_id: str
+    instructor_id: str
+    location_id: str
+
+
+@pytest.fixture(scope="module")
+def seeded(django_db_setup, django_db_blocker):
+    rng = Random(42)
+    with django_db_blocker.unblock(), rolled_back():
+        instructors = create_bench_instructors(200, prefix="query-plan")
+        locations = create_bench_locations(5000, rng)
+        classes = create_bench_classes(locations, instructors, 2, rng)
+        create_bench_class_reviews(classes, 5, rng)
+        # Give the planner the statistics of the seeded tables
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        yield Seeded(
+            class_id=str(classes[0].id),
+            instructor_id=str(instructors[0].id),
+            location_id=str(locations[0].id),
+        )
+
+
+class_search = ClassSearchEngineService()
+location_search = LocationSearchEngineService()
+instructor_manager = InstructorPublicManagerService()
+review_manager = ReviewManagerService()
+stats_service = ReviewStatsService()
+today = date.today()
+
+# (hot query, models whose tables it must not read in full, service call)
+HOT_QUERIES: Tuple[Tuple[str, Tuple[type, ...], Callable[[Seeded], Any]], ...] = (
+    (
+        "upcoming classes of an instructor",
+        (DanceClass,),
+        lambda ids: class_search.get_classes_by_instructor(ids.instructor_id),
+    ),
+    (
+        "upcoming classes at a location",
+        (DanceClass,),
+        lambda ids: class_search.get_classes_by_location(ids.location_id),
+    ),
+    (
+        "class listing by style",
+        (DanceClass,),
+        lambda ids: class_search.get_classes_with_filters(
+            start_date=today, style=DanceStyle.values[0]
+        ),
+    ),
+    (
+        "class listing by level",
+        (DanceClass,),
+        lambda ids: class_search.get_classes_with_filters(
+            start_date=today, level=SkillLevel.values[0]
+        ),
+    ),
+    (
+        "class listing in a date range",
+        (DanceClass,),
+        lambda ids: class_search.get_classes_with_filters(
+            start_date=today + timedelta(days=110),
+            end_date=today + timedelta(days=120),
+        ),
+    ),
+    (
+        "nearby classes",
+        (DanceClass, Location),
+        lambda ids: class_search.get_classes_near_location(
+            CENTER_LATITUDE, CENTER_LONGITUDE, today, today, radius_km=5
+        ),
+    ),
+    (
+        "instructor listing class counts",
+        (DanceClass,),
+        lambda ids: instructor_manager.get_instructors(),
+    ),
+    (
+        "locations with a style",
+        (DanceClass,),
+        lambda ids: location_search.get_locations(dance_style=DanceStyle.values[0]),
+    ),
+    (
+        "class reviews, newest first",
+        (DanceClassReview,),
+        lambda ids: review_manager.get_class_reviews_paginated(ids.class_id),
+    ),
+    (
+        "class reviews, best rated",
+        (DanceClassReview,),
+        lambda ids: review_manager.get_class_reviews_paginated(
+            ids.class_id, sort_by="rating_desc"
+        ),
+    ),
+    (
+        "class review stats",
+        (DanceClassReview,),
+        lambda ids: stats_service.get_dance_class_stats(ids.class_id),
+    ),
+)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "label,models,call", HOT_QUERIES, ids=[label for label, _, _ in HOT_QUERIES]
+)
+def test_hot_query_uses_indexes(seeded, label, models, call):
+    tables = [model._meta.db_table for model in models]
+    with assert_no_full_scan(tables, label=label):
+        call(seeded)
+
+
+# PostgreSQL plans of an index walk: unbounded, stopped by a Limit, and
+# repeated as the inner side of a nested loop
+FULL_INDEX_WALK = [
+    "Sort  (cost=9.1..9.2 rows=40 width=8)",
+    "  ->  Index Scan using class_rating_idx on classes_danceclass  (cost=0.29..8.6)",
+    "        Filter: (style = 'salsa')",
+]
+LIMITED_INDEX_WALK = [
+    "Limit  (cost=1.01..106.40 rows=51 width=8)",
+    "  ->  Nested Loop Left Join  (cost=1.01..4245.59 rows=2054 width=8)",
+    "        ->  Index Scan Backward using class_rating_idx on classes_danceclass",
+    "              Filter: (style = 'salsa')",
+    "        ->  Index Scan using users_pkey on users  (cost=0.14..0.18 rows=1)",
+    "              Index Cond: (id = classes_danceclass.instructor_id)",
+]
+INNER_INDEX_WALK = [
+    "Limit  (cost=1.01..106.40 rows=51 width=8)",
+    "  ->  Nested Loop  (cost=1.01..4245.59 rows=2054 width=8)",
+    "        ->  Index Scan using users_pkey on users  (cost=0.14..0.18 rows=1)",
+    "        ->  Index Scan using class_rating_idx on classes_danceclass",
+    "              Filter: (instructor_id = users.id)",
+]
+
+
+@pytest.mark.parametrize(
+    "plan,full",
+    [(FULL_INDEX_WALK, True), (LIMITED_INDEX_WALK, False), (INNER_INDEX_WALK, True)],
+    ids=["full", "limited", "inner"],
+)
+def test_postgresql_index_walk(monkeypatch, plan, full):
+    monkeypatch.setattr(connection, "vendor", "postgresql")
+    assert bool(full_scans(plan, ["classes_danceclass"])) == full
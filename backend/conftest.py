@@ -0,0 +1,24 @@
+import pytest
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# Database alias of the read replica tests can route to; it mirrors the test
+# database, so it holds the same rows
+TEST_REPLICA = "replica_test"
+
+
+@pytest.fixture(scope="session")
+def django_db_modify_db_settings(django_db_modify_db_settings_parallel_suffix):
+    """Add TEST_REPLICA before the test databases are set up. Routing only
+    uses it once a test lists it in DATABASE_REPLICAS."""
+    settings.DATABASES[TEST_REPLICA] = {
+        **settings.DATABASES[DEFAULT_DB_ALIAS],
+        "TEST": {"MIRROR": DEFAULT_DB_ALIAS},
+    }
+
+
+@pytest.fixture(autouse=True)
+def strict_query_budgets(settings):
+    """Fail a test whose requests go over their route's query budget or run
+    an N+1 pattern, rather than logging it"""
+    settings.QUERY_BUDGET_STRICT = True
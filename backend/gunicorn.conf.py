@@ -0,0 +1,27 @@
+import os
+import shutil
+
+# Gunicorn reads this file from the working directory. Each worker keeps its
+# own metrics; with PROMETHEUS_MULTIPROC_DIR set they share them through
+# files there, which /internal/metrics adds up (see shared.metrics).
+
+# The app is served through ASGI: each uvicorn worker runs the async views
+# on its event loop and sync ones on threads. WEB_CONCURRENCY sets the
+# number of workers.
+wsgi_app = "mydanceclub.asgi:application"
+worker_class = "uvicorn_worker.UvicornWorker"
+
+
+def on_starting(server):
+    # Files of a previous run would be added to the new one's counters
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,72 @@
+from django.contrib import admin
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html
+from unfold.admin import ModelAdmin
+
+from .models import RequestProfile
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(ModelAdmin):
+    list_display = (
+        "created_at",
+        "method",
+        "path",
+        "status_code",
+        "duration_ms",
+        "sample_count",
+        "trigger",
+        "user",
+        "download_link",
+    )
+    list_filter = ("trigger", "method", "status_code")
+    search_fields = ("path",)
+    date_hierarchy = "created_at"
+    readonly_fields = (
+        "method",
+        "path",
+        "status_code",
+        "trigger",
+        "user",
+        "duration_ms",
+        "interval_ms",
+        "sample_count",
+        "download_link",
+        "stacks",
+        "created_at",
+    )
+    exclude = ("updated_at",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        return [
+            path(
+                "<uuid:profile_id>/folded/",
+                self.admin_site.admin_view(self.download),
+                name="mydanceclub_requestprofile_folded",
+            ),
+            *super().get_urls(),
+        ]
+
+    @admin.display(description="Flamegraph")
+    def download_link(self, obj):
+        url = reverse("admin:mydanceclub_requestprofile_folded", args=[obj.id])
+        return format_html('<a href="{}">profile.folded</a>', url)
+
+    def download(self, request, profile_id):
+        """The stacks as a file for flamegraph.pl or speedscope.app"""
+        if not self.has_view_permission(request):
+            return HttpResponse(status=403)
+        profile = get_object_or_404(RequestProfile, id=profile_id)
+        response = HttpResponse(profile.stacks, content_type="text/plain")
+        response["Content-Disposition"] = (
+            f'attachment; filename="profile-{profile.id}.folded"'
+        )
+        return response
@@ -1,12 +1,56 @@
+from django.core.exceptions import ValidationError
 from ninja import NinjaAPI
+from shared.db_pool import PoolExhausted
+from shared.flags import InvalidFlag
+from shared.include import InvalidInclude
+from shared.metrics import track_operations
+from shared.pagination import InvalidCursor
+from shared.server_timing import TimedRenderer, time_operations
+from shared.worker_pool import PoolSaturated
 
 from ..auth import AuthBearer
+from ..profiler import profile_operations
 from .private.auth import router as auth_router
 from .public import router as public_router
 # from .private.private import router as private_router
 
-api = NinjaAPI(auth=AuthBearer())
+api = NinjaAPI(auth=AuthBearer(), renderer=TimedRenderer())
 
+
+@api.exception_handler(InvalidCursor)
+def invalid_cursor(request, exc: InvalidCursor):
+    return api.create_response(request, {"detail": str(exc)}, status=400)
+
+
+@api.exception_handler(InvalidFlag)
+def invalid_flag(request, exc: InvalidFlag):
+    return api.create_response(request, {"detail": str(exc)}, status=400)
+
+
+@api.exception_handler(InvalidInclude)
+def invalid_include(request, exc: InvalidInclude):
+    return api.create_response(request, {"detail": str(exc)}, status=400)
+
+
+@api.exception_handler(ValidationError)
+def invalid_value(request, exc: ValidationError):
+    # e.g. a malformed UUID in an id path or query parameter
+    return api.create_response(request, {"detail": " ".join(exc.messages)}, status=400)
+
+
+@api.exception_handler(PoolSaturated)
+@api.exception_handler(PoolExhausted)
+def pool_saturated(request, exc: PoolSaturated | PoolExhausted):
+    response = api.create_response(
+        request, {"detail": "Server busy, retry shortly"}, status=503
+    )
+    response["Retry-After"] = "1"
+    return response
+
+
+track_operations(api)
+time_operations(api)
 api.add_router("/auth", auth_router)
 api.add_router("/public", public_router)
 # api.add_router("/private", private_router)
+profile_operations(api)
@@ -1,7 +1,5 @@
-from typing import cast
-
 from accounts.models import User
-from django.contrib.auth import authenticate
+from accounts.passwords import aauthenticate_user, ahash_password
 from django.http import HttpRequest, HttpResponse
 from ninja import Router
 
@@ -15,7 +13,9 @@ router = Router()
 
 
 @router.post("/signup", response=TokenResponse, auth=None)
-def signup(request: HttpRequest, data: SignupSchema) -> HttpResponse | TokenResponse:
+async def signup(
+    request: HttpRequest, data: SignupSchema
+) -> HttpResponse | TokenResponse:
     if data.role not in ["student", "instructor"]:
         return HttpResponse(
             "{\"detail\": \"Invalid role. Must be either 'student' or 'instructor'\"}",
@@ -23,27 +23,29 @@ def signup(request: HttpRequest, data: SignupSchema) -> HttpResponse | TokenResp
             content_type="application/json",
         )
 
-    if User.objects.filter(email=data.email).exists():
+    email = User.objects.normalize_email(data.email)
+    if await User.objects.filter(email=email).aexists():
         return HttpResponse(
             '{"detail": "Email already exists"}',
             status=400,
             content_type="application/json",
         )
 
-    user = User.objects.create_user(
-        username=data.email,
-        email=data.email,
-        password=data.password,
-        role=data.role,
+    # The hash is computed on the password pool, off the request worker
+    user = User(
+        email=email, password=await ahash_password(data.password), role=data.role
     )
+    await user.asave()
 
     token = create_token(user)
     return TokenResponse(access=token, email=user.email)
 
 
 @router.post("/login", response=TokenResponse, auth=None)
-def login(request: HttpRequest, data: LoginSchema) -> HttpResponse | TokenResponse:
-    user = authenticate(request, username=data.email, password=data.password)
+async def login(
+    request: HttpRequest, data: LoginSchema
+) -> HttpResponse | TokenResponse:
+    user = await aauthenticate_user(data.email, data.password)
     if user is None:
         return HttpResponse(
             '{"detail": "Invalid credentials"}',
@@ -51,18 +53,20 @@ def login(request: HttpRequest, data: LoginSchema) -> HttpResponse | TokenRespon
             content_type="application/json",
         )
 
-    token = create_token(cast(User, user))
+    token = create_token(user)
     return TokenResponse(access=token, email=user.email)
 
 
 @router.get("/me", response=UserPrivateSchema)
 def me(request: AuthenticatedRequest) -> UserPrivateSchema:
+    # Authentication only loads the slim auth fields, fetch the rest at once
+    profile = User.objects.values("bio", "profile_picture_url").get(id=request.auth.id)
     return UserPrivateSchema(
         id=request.auth.id,
         email=request.auth.email,
         role=request.auth.role,
         first_name=request.auth.first_name,
         last_name=request.auth.last_name,
-        bio=request.auth.bio,
-        profile_picture=request.auth.profile_picture_url,
+        bio=profile["bio"],
+        profile_picture=profile["profile_picture_url"],
     )
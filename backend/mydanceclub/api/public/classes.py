@@ -1,24 +1,43 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import date
 from ninja import Router
+from ninja.decorators import decorate_view
 from classes.schemas.dance_class import DanceClassSchema
-from classes.services.class_search_engine import ClassSearchEngineService
-from reviews.services.stats_service import ReviewStatsService
+from classes.schemas.page import ClassPageSchema
+from classes.services.class_search_engine import (
+    NEARBY_MAX_SEARCHES,
+    ClassSearchEngineService,
+)
+from classes.services.page_service import PAGE_SECTION_LIMIT, PageService
+from classes.services.trending import TRENDING_LIST_SIZE
+from reviews.services.stats_service import MAX_STATS_BATCH_SIZE, ReviewStatsService
 from reviews.schemas.response import (
-    ReviewAggregatedDanceClassStatsSchema,
     ReviewDanceClassStatsSchema,
-    ReviewListSchema,
+    ReviewDetailedDanceClassStatsSchema,
 )
 from reviews.services.review_manager import ReviewManagerService
+from shared.response_cache import (
+    CLASSES,
+    LOCATIONS,
+    REVIEWS,
+    TRENDING,
+    USERS,
+    cached_response,
+)
+from shared.etag import etag_condition
+from shared.pagination import DEFAULT_PAGE_SIZE, CursorPageSchema
+from shared.query_count import query_budget
 
 router = Router()
 class_search_engine = ClassSearchEngineService()
 stats_service = ReviewStatsService()
 review_manager = ReviewManagerService()
+page_service = PageService()
 
 
-@router.get("/classes", response=List[DanceClassSchema], auth=None)
-def get_classes(
+@router.get("/classes", response=CursorPageSchema[DanceClassSchema], auth=None)
+@decorate_view(cached_response(CLASSES, LOCATIONS, USERS, REVIEWS), query_budget(2))
+async def get_classes(
     request,
     instructor_id: Optional[str] = None,
     location_id: Optional[str] = None,
@@ -28,9 +47,12 @@ def get_classes(
     end_date: Optional[date] = None,
     min_rating: Optional[float] = None,
     sort_by: Optional[str] = None,
-) -> List[DanceClassSchema]:
-    """Get all classes with filters"""
-    return class_search_engine.get_classes_with_filters(
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    with_total: bool = False,
+) -> CursorPageSchema[DanceClassSchema]:
+    """Get a page of classes with filters"""
+    return await class_search_engine.aget_classes_with_filters(
         instructor_id=instructor_id,
         location_id=location_id,
         style=style,
@@ -39,43 +61,130 @@ def get_classes(
         end_date=end_date,
         min_rating=min_rating,
         sort_by=sort_by,
+        cursor=cursor,
+        limit=limit,
+        with_total=with_total,
     )
 
 
 @router.get("/classes/trending", response=List[DanceClassSchema], auth=None)
-def get_trending_classes(request) -> List[DanceClassSchema]:
-    """Get all trending classes"""
-    return class_search_engine.get_trending_classes()
+@decorate_view(
+    cached_response(TRENDING, CLASSES, LOCATIONS, USERS, REVIEWS), query_budget(2)
+)
+async def get_trending_classes(
+    request,
+    style: Optional[str] = None,
+    level: Optional[str] = None,
+    limit: int = 10,
+) -> List[DanceClassSchema]:
+    """Get trending classes, optionally for one style and/or level"""
+    return await class_search_engine.aget_trending_classes(
+        style=style, level=level, limit=min(limit, TRENDING_LIST_SIZE)
+    )
+
+
+@router.get("/classes/nearby", response=List[DanceClassSchema], auth=None)
+@decorate_view(
+    cached_response(CLASSES, LOCATIONS, USERS, REVIEWS),
+    query_budget(NEARBY_MAX_SEARCHES + 1),
+)
+async def get_classes_nearby(
+    request,
+    latitude: float,
+    longitude: float,
+    radius_km: Optional[float] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    limit: int = 10,
+    rating_tiebreak: bool = True,
+) -> List[DanceClassSchema]:
+    """Get the classes nearest to a point, ordered by distance"""
+    start_date = start_date or date.today()
+    return await class_search_engine.aget_classes_near_location(
+        latitude=latitude,
+        longitude=longitude,
+        start_date=start_date,
+        end_date=end_date or start_date,
+        limit=min(limit, 100),
+        radius_km=radius_km,
+        rating_tiebreak=rating_tiebreak,
+    )
+
+
+@router.get(
+    "/classes/stats",
+    response=Dict[str, ReviewDetailedDanceClassStatsSchema],
+    auth=None,
+)
+@decorate_view(cached_response(REVIEWS), query_budget(1))
+async def get_classes_stats(
+    request, ids: str
+) -> Dict[str, ReviewDetailedDanceClassStatsSchema]:
+    """Get review statistics for comma separated class ids, keyed by id"""
+    return await stats_service.aget_dance_classes_stats(
+        ids.split(",")[:MAX_STATS_BATCH_SIZE]
+    )
+
 
 @router.get("/classes/{class_id}", response=DanceClassSchema, auth=None)
-def get_class(request, class_id: str) -> DanceClassSchema:
+@decorate_view(
+    cached_response(CLASSES, LOCATIONS, USERS, REVIEWS),
+    etag_condition(class_search_engine.aget_class_version),
+    query_budget(2),
+)
+async def get_class(request, class_id: str) -> DanceClassSchema:
     """Get a class by ID"""
-    return class_search_engine.get_class_by_id(class_id)
+    return await class_search_engine.aget_class_by_id(class_id)
+
+
+@router.get("/classes/{class_id}/page", response=ClassPageSchema, auth=None)
+@decorate_view(cached_response(CLASSES, LOCATIONS, USERS, REVIEWS), query_budget(3))
+async def get_class_page(
+    request,
+    class_id: str,
+    include: Optional[str] = None,
+    limit: int = PAGE_SECTION_LIMIT,
+) -> ClassPageSchema:
+    """Get a class with the sections named in include (stats, reviews)"""
+    return await page_service.aget_class_page(class_id, include, limit)
 
 
 @router.get(
     "/classes/{class_id}/stats",
-    response=ReviewAggregatedDanceClassStatsSchema,
+    response=ReviewDetailedDanceClassStatsSchema,
     auth=None,
 )
-def get_class_stats(request, class_id: str) -> ReviewAggregatedDanceClassStatsSchema:
+@decorate_view(
+    cached_response(REVIEWS),
+    etag_condition(stats_service.aget_dance_class_stats_version),
+    query_budget(2),
+)
+async def get_class_stats(
+    request, class_id: str
+) -> ReviewDetailedDanceClassStatsSchema:
     """Get comprehensive review statistics for a class"""
-    return stats_service.get_dance_class_stats(class_id)
+    return await stats_service.aget_dance_class_stats(class_id)
 
 
 @router.get(
     "/classes/{class_id}/reviews",
-    response=ReviewListSchema[ReviewDanceClassStatsSchema],
+    response=CursorPageSchema[ReviewDanceClassStatsSchema],
     auth=None,
 )
-def get_class_reviews(
+@decorate_view(cached_response(REVIEWS, USERS), query_budget(2))
+async def get_class_reviews(
     request,
     class_id: str,
-    page: int = 1,
-    page_size: int = 10,
+    cursor: Optional[str] = None,
+    limit: int = 10,
     sort_by: Optional[str] = None,  # Keep basic sorting for UI flexibility
-) -> ReviewListSchema[ReviewDanceClassStatsSchema]:
-    """Get paginated reviews for a specific class"""
-    return review_manager.get_class_reviews_paginated(
-        class_id=class_id, page=page, page_size=page_size, sort_by=sort_by
+    with_total: bool = False,
+) -> CursorPageSchema[ReviewDanceClassStatsSchema]:
+    """Get a page of reviews for a specific class"""
+    return await review_manager.aget_class_reviews_paginated(
+        class_id=class_id,
+        cursor=cursor,
+        limit=limit,
+        sort_by=sort_by,
+        with_total=with_total,
     )
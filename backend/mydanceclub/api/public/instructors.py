@@ -1,47 +1,110 @@
-from typing import List
+from typing import Dict, Optional
 from ninja import Router
+from ninja.decorators import decorate_view
 from classes.schemas.dance_class import DanceClassSchema
+from classes.schemas.page import InstructorPageSchema
 from classes.schemas.user_schema import InstructorPublicSchema
 from classes.services.instructor_public_manager import InstructorPublicManagerService
 from classes.services.class_search_engine import ClassSearchEngineService
-from reviews.schemas.response import ReviewAggregatedInstructorStatsSchema
-from reviews.services.stats_service import ReviewStatsService
+from classes.services.page_service import PAGE_SECTION_LIMIT, PageService
+from reviews.schemas.response import ReviewDetailedInstructorStatsSchema
+from reviews.services.stats_service import MAX_STATS_BATCH_SIZE, ReviewStatsService
+from shared.response_cache import CLASSES, LOCATIONS, REVIEWS, USERS, cached_response
+from shared.etag import etag_condition
+from shared.pagination import DEFAULT_PAGE_SIZE, CursorPageSchema
+from shared.query_count import query_budget
 
 router = Router()
 instructor_manager = InstructorPublicManagerService()
 class_search_engine = ClassSearchEngineService()
 stats_service = ReviewStatsService()
+page_service = PageService()
 
 
-@router.get("/instructors", response=List[InstructorPublicSchema], auth=None)
-def get_instructors(request) -> List[InstructorPublicSchema]:
-    """Get all instructors"""
-    return instructor_manager.get_instructors()
+@router.get(
+    "/instructors", response=CursorPageSchema[InstructorPublicSchema], auth=None
+)
+@decorate_view(cached_response(USERS, CLASSES, REVIEWS), query_budget(2))
+async def get_instructors(
+    request,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    with_total: bool = False,
+) -> CursorPageSchema[InstructorPublicSchema]:
+    """Get a page of instructors"""
+    return await instructor_manager.aget_instructors(
+        cursor=cursor, limit=limit, with_total=with_total
+    )
+
+
+@router.get(
+    "/instructors/stats",
+    response=Dict[str, ReviewDetailedInstructorStatsSchema],
+    auth=None,
+)
+@decorate_view(cached_response(REVIEWS), query_budget(1))
+async def get_instructors_stats(
+    request, ids: str
+) -> Dict[str, ReviewDetailedInstructorStatsSchema]:
+    """Get stats for comma separated instructor ids, keyed by id"""
+    return await stats_service.aget_instructors_stats(
+        ids.split(",")[:MAX_STATS_BATCH_SIZE]
+    )
 
 
 @router.get("/instructors/{instructor_id}", response=InstructorPublicSchema, auth=None)
-def get_instructor(request, instructor_id: str) -> InstructorPublicSchema:
+@decorate_view(cached_response(USERS, CLASSES, REVIEWS), query_budget(1))
+async def get_instructor(request, instructor_id: str) -> InstructorPublicSchema:
     """Get an instructor by ID"""
-    return instructor_manager.get_instructor_by_id(instructor_id)
+    return await instructor_manager.aget_instructor_by_id(instructor_id)
 
 
 @router.get(
-    "/instructors/{instructor_id}/classes", response=List[DanceClassSchema], auth=None
+    "/instructors/{instructor_id}/page", response=InstructorPageSchema, auth=None
 )
-def get_instructor_classes(
-    request, instructor_id: str, include_past: bool = False
-) -> List[DanceClassSchema]:
-    """Get all classes by an instructor"""
-    return class_search_engine.get_classes_by_instructor(instructor_id, include_past)
+@decorate_view(cached_response(USERS, CLASSES, LOCATIONS, REVIEWS), query_budget(3))
+async def get_instructor_page(
+    request,
+    instructor_id: str,
+    include: Optional[str] = None,
+    limit: int = PAGE_SECTION_LIMIT,
+) -> InstructorPageSchema:
+    """Get an instructor with the sections named in include (stats, classes)"""
+    return await page_service.aget_instructor_page(instructor_id, include, limit)
+
+
+@router.get(
+    "/instructors/{instructor_id}/classes",
+    response=CursorPageSchema[DanceClassSchema],
+    auth=None,
+)
+@decorate_view(cached_response(CLASSES, LOCATIONS, USERS, REVIEWS), query_budget(2))
+async def get_instructor_classes(
+    request,
+    instructor_id: str,
+    include_past: bool = False,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    with_total: bool = False,
+) -> CursorPageSchema[DanceClassSchema]:
+    """Get a page of classes by an instructor"""
+    return await class_search_engine.aget_classes_by_instructor(
+        instructor_id, include_past, cursor, limit, with_total
+    )
 
 
 @router.get(
     "/instructors/{instructor_id}/stats",
-    response=ReviewAggregatedInstructorStatsSchema,
+    response=ReviewDetailedInstructorStatsSchema,
     auth=None,
 )
-def get_instructor_stats(
+@decorate_view(
+    cached_response(REVIEWS),
+    etag_condition(stats_service.aget_instructor_stats_version),
+    query_budget(2),
+)
+async def get_instructor_stats(
     request, instructor_id: str
-) -> ReviewAggregatedInstructorStatsSchema:
+) -> ReviewDetailedInstructorStatsSchema:
     """Get stats for an instructor"""
-    return stats_service.get_instructor_stats(instructor_id)
+    return await stats_service.aget_instructor_stats(instructor_id)
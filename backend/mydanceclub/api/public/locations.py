@@ -1,39 +1,57 @@
-from typing import List, Optional
+from typing import Dict, Optional
 from ninja import Router
+from ninja.decorators import decorate_view
 from classes.schemas.dance_class import DanceClassSchema
 from classes.schemas.location import LocationSchema
+from classes.schemas.page import LocationPageSchema
 from classes.services.location_search_engine import LocationSearchEngineService
 from classes.services.class_search_engine import ClassSearchEngineService
-from reviews.schemas.response import ReviewAggregatedLocationStatsSchema
-from reviews.services.stats_service import ReviewStatsService
+from classes.services.page_service import PAGE_SECTION_LIMIT, PageService
+from reviews.schemas.response import ReviewDetailedLocationStatsSchema
+from reviews.services.stats_service import MAX_STATS_BATCH_SIZE, ReviewStatsService
+from shared.response_cache import CLASSES, LOCATIONS, REVIEWS, USERS, cached_response
+from shared.etag import etag_condition
+from shared.flags import FlagMatch
+from shared.pagination import DEFAULT_PAGE_SIZE, CursorPageSchema
+from shared.query_count import query_budget
 from ..private.types import AuthenticatedRequest
 
 router = Router()
 location_search_engine = LocationSearchEngineService()
 class_search_engine = ClassSearchEngineService()
 review_stats_service = ReviewStatsService()
+page_service = PageService()
 
 
-@router.get("/locations", response=List[LocationSchema], auth=None)
-def get_locations(
+@router.get("/locations", response=CursorPageSchema[LocationSchema], auth=None)
+@decorate_view(cached_response(LOCATIONS, CLASSES, USERS, REVIEWS), query_budget(2))
+async def get_locations(
     request,
     has_active_classes: bool = True,
     dance_style: Optional[str] = None,
     level: Optional[str] = None,
     min_classes: Optional[int] = None,
     min_rating: Optional[float] = None,
-) -> List[LocationSchema]:
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    with_total: bool = False,
+) -> CursorPageSchema[LocationSchema]:
     """Get locations, optionally filtered to those with active classes"""
-    return location_search_engine.get_locations_nearby(
+    return await location_search_engine.aget_locations_nearby(
         has_active_classes=has_active_classes,
         dance_style=dance_style,
         level=level,
         min_classes=min_classes,
         min_location_rating=min_rating,
+        cursor=cursor,
+        limit=limit,
+        with_total=with_total,
     )
 
-@router.get("/locations/nearby", response=List[LocationSchema], auth=None)
-def get_locations_nearby(
+
+@router.get("/locations/nearby", response=CursorPageSchema[LocationSchema], auth=None)
+@decorate_view(cached_response(LOCATIONS, CLASSES, USERS, REVIEWS), query_budget(2))
+async def get_locations_nearby(
     request,
     has_active_classes: bool = True,
     latitude: Optional[float] = None,
@@ -46,10 +64,15 @@ def get_locations_nearby(
     min_class_rating: Optional[float] = None,
     radius_km: Optional[float] = None,
     facility: Optional[str] = None,
+    facility_match: FlagMatch = "all",
     sports_card: Optional[str] = None,
-) -> List[LocationSchema]:
+    sports_card_match: FlagMatch = "any",
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    with_total: bool = False,
+) -> CursorPageSchema[LocationSchema]:
     """Get locations, optionally filtered to those with active classes"""
-    return location_search_engine.get_locations_nearby(
+    return await location_search_engine.aget_locations_nearby(
         has_active_classes=has_active_classes,
         latitude=latitude,
         longitude=longitude,
@@ -59,32 +82,82 @@ def get_locations_nearby(
         min_location_rating=min_location_rating,
         radius_km=radius_km,
         facility=facility,
+        facility_match=facility_match,
         sports_card=sports_card,
+        sports_card_match=sports_card_match,
+        cursor=cursor,
+        limit=limit,
+        with_total=with_total,
+    )
+
+
+@router.get(
+    "/locations/stats",
+    response=Dict[str, ReviewDetailedLocationStatsSchema],
+    auth=None,
+)
+@decorate_view(cached_response(REVIEWS), query_budget(1))
+async def get_locations_stats(
+    request, ids: str
+) -> Dict[str, ReviewDetailedLocationStatsSchema]:
+    """Get stats for comma separated location ids, keyed by id"""
+    return await review_stats_service.aget_locations_stats(
+        ids.split(",")[:MAX_STATS_BATCH_SIZE]
     )
 
 
 @router.get("/locations/{location_id}", response=LocationSchema, auth=None)
-def get_location(request: AuthenticatedRequest, location_id: str) -> LocationSchema:
-    return location_search_engine.get_location_by_id(location_id)
+@decorate_view(cached_response(LOCATIONS), query_budget(1))
+async def get_location(
+    request: AuthenticatedRequest, location_id: str
+) -> LocationSchema:
+    return await location_search_engine.aget_location_by_id(location_id)
+
+
+@router.get("/locations/{location_id}/page", response=LocationPageSchema, auth=None)
+@decorate_view(cached_response(LOCATIONS, CLASSES, USERS, REVIEWS), query_budget(3))
+async def get_location_page(
+    request,
+    location_id: str,
+    include: Optional[str] = None,
+    limit: int = PAGE_SECTION_LIMIT,
+) -> LocationPageSchema:
+    """Get a location with the sections named in include (stats, classes)"""
+    return await page_service.aget_location_page(location_id, include, limit)
 
 
 @router.get(
-    "/locations/{location_id}/classes", response=List[DanceClassSchema], auth=None
+    "/locations/{location_id}/classes",
+    response=CursorPageSchema[DanceClassSchema],
+    auth=None,
 )
-def get_location_classes(
-    request, location_id: str, include_past: bool = False
-) -> List[DanceClassSchema]:
-    """Get all classes at a location"""
-    return class_search_engine.get_classes_by_location(location_id, include_past)
+@decorate_view(cached_response(CLASSES, LOCATIONS, USERS, REVIEWS), query_budget(2))
+async def get_location_classes(
+    request,
+    location_id: str,
+    include_past: bool = False,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    with_total: bool = False,
+) -> CursorPageSchema[DanceClassSchema]:
+    """Get a page of classes at a location"""
+    return await class_search_engine.aget_classes_by_location(
+        location_id, include_past, cursor, limit, with_total
+    )
 
 
 @router.get(
     "/locations/{location_id}/stats",
-    response=ReviewAggregatedLocationStatsSchema,
+    response=ReviewDetailedLocationStatsSchema,
     auth=None,
 )
-def get_location_stats(
+@decorate_view(
+    cached_response(REVIEWS),
+    etag_condition(review_stats_service.aget_location_stats_version),
+    query_budget(2),
+)
+async def get_location_stats(
     request, location_id: str
-) -> ReviewAggregatedLocationStatsSchema:
+) -> ReviewDetailedLocationStatsSchema:
     """Get stats for a location"""
-    return review_stats_service.get_location_stats(location_id)
+    return await review_stats_service.aget_location_stats(location_id)
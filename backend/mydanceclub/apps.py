@@ -0,0 +1,24 @@
+from django.apps import AppConfig
+
+
+class MydanceclubConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "mydanceclub"
+
+    def ready(self):
+        from mydanceclub.auth import connect_auth_cache_signals
+        from mydanceclub.profiler import connect_profiler_signals
+        from shared.query_count import connect_query_tracker_signals
+        from shared.replicas import connect_query_counter_signals
+        from shared.response_cache import connect_response_cache_signals
+        from shared.slow_queries import connect_slow_query_signals
+        from shared.sql_comments import connect_sql_comment_signals
+
+        # First, so the query comments are added innermost of the wrappers
+        connect_sql_comment_signals()
+        connect_auth_cache_signals()
+        connect_profiler_signals()
+        connect_query_counter_signals()
+        connect_query_tracker_signals()
+        connect_response_cache_signals()
+        connect_slow_query_signals()
@@ -1,16 +1,45 @@
+import time
 from datetime import UTC, datetime
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
 import jwt
 from accounts.models import User
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from ninja.security import HttpBearer
 
+from shared.lru import LRUCache
+from shared.server_timing import timed
+
+# The only User fields authentication loads and caches; any other field of
+# an authenticated user is deferred and read from the database on access
+AUTH_USER_FIELDS = (
+    "id",
+    "email",
+    "role",
+    "first_name",
+    "last_name",
+    "is_active",
+    "is_staff",
+    "is_superuser",
+)
+# Entries of the per-process caches of verified tokens and auth users
+AUTH_TOKEN_MEMO_SIZE = 10_000
+AUTH_USER_LRU_SIZE = 10_000
+# Shared cache lifetime of a user's slim fields, in seconds
+AUTH_USER_CACHE_TIMEOUT = 60 * 60
+
+# Verified token payloads until the token expires, by token
+verified_tokens: LRUCache[str, Dict[str, Any]] = LRUCache(AUTH_TOKEN_MEMO_SIZE)
+# (version, slim fields) of recently authenticated users, by user id
+auth_users: LRUCache[str, Tuple[int, Dict[str, Any]]] = LRUCache(AUTH_USER_LRU_SIZE)
+
 
 def create_token(user: User) -> str:
     """Create a JWT token for a user."""
     payload = {
-        "user_id": user.id,
+        "user_id": str(user.id),
         "email": user.email,
         "role": user.role,
         "exp": datetime.now(UTC) + settings.JWT_LIFETIME,
@@ -18,19 +47,115 @@ def create_token(user: User) -> str:
     return jwt.encode(payload, settings.JWT_SECRET, algorithm="HS256")
 
 
+def decode_token(token: str) -> Dict[str, Any]:
+    """Verify a token, memoizing the payload until the token expires.
+
+    Raises jwt.InvalidTokenError like jwt.decode.
+    """
+    if not settings.AUTH_CACHE_ENABLED:
+        return jwt.decode(token, settings.JWT_SECRET, algorithms=["HS256"])
+
+    payload = verified_tokens.get(token)
+    if payload is None:
+        payload = jwt.decode(token, settings.JWT_SECRET, algorithms=["HS256"])
+        verified_tokens.set(token, payload)
+    elif payload["exp"] <= time.time():
+        verified_tokens.delete(token)
+        raise jwt.ExpiredSignatureError("Signature has expired")
+    return payload
+
+
+def get_user_version(user_id: str) -> int:
+    """Version of a user's auth data, shared by every process"""
+    key = _user_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so an evicted version never reverts to one
+        # that stale entries were cached under
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_user_version(user_id: str) -> None:
+    """Make every process reload the user's auth data on its next request"""
+
+    def bump():
+        key = _user_version_key(user_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
+        auth_users.delete(user_id)
+
+    transaction.on_commit(bump)
+
+
+def get_auth_user(user_id: str) -> Optional[User]:
+    """Load the slim auth fields of a user through the auth caches.
+
+    The per-process LRU and the shared cache both hold entries tagged with
+    the user's version, which is read from the shared cache on every call,
+    so a save anywhere revokes the cached data everywhere immediately.
+    """
+    if not settings.AUTH_CACHE_ENABLED:
+        return User.objects.filter(id=user_id).first()
+
+    version = get_user_version(user_id)
+    cached = auth_users.get(user_id)
+    if cached is not None and cached[0] == version:
+        return _to_user(cached[1])
+
+    key = f"auth:user:{user_id}:{version}"
+    fields = cache.get(key)
+    if fields is None:
+        fields = User.objects.filter(id=user_id).values(*AUTH_USER_FIELDS).first()
+        if fields is None:
+            return None
+        cache.set(key, fields, timeout=AUTH_USER_CACHE_TIMEOUT)
+    auth_users.set(user_id, (version, fields))
+    return _to_user(fields)
+
+
 def get_user_from_token(token: str) -> Optional[User]:
     """Get user from JWT token."""
     try:
-        payload = jwt.decode(token, settings.JWT_SECRET, algorithms=["HS256"])
-        user = User.objects.get(id=payload["user_id"])
-        return user
-    except (jwt.InvalidTokenError, User.DoesNotExist):
+        payload = decode_token(token)
+    except jwt.InvalidTokenError:
+        return None
+    user = get_auth_user(payload["user_id"])
+    if user is None or not user.is_active:
         return None
+    return user
+
+
+def _to_user(fields: Dict[str, Any]) -> User:
+    # A User as if loaded with .only(*AUTH_USER_FIELDS); from_db expects the
+    # values in the model's field order
+    names = [f.attname for f in User._meta.concrete_fields if f.attname in fields]
+    return User.from_db("default", names, [fields[name] for name in names])
+
+
+def _user_version_key(user_id: str) -> str:
+    return f"auth:user-version:{user_id}"
+
+
+def invalidate_auth_user(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_user_version(str(instance.pk))
+
+
+def connect_auth_cache_signals():
+    from django.db.models.signals import post_delete, post_save
+
+    post_save.connect(invalidate_auth_user, sender=User, dispatch_uid="auth_user")
+    post_delete.connect(invalidate_auth_user, sender=User, dispatch_uid="auth_user")
 
 
 class AuthBearer(HttpBearer):
     def authenticate(self, request, token: str) -> Optional[User]:
-        user = get_user_from_token(token)
+        with timed("auth"):
+            user = get_user_from_token(token)
         if user:
             request.user = user
         return user
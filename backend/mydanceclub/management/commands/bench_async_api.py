@@ -0,0 +1,190 @@
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from http.client import HTTPConnection
+from time import perf_counter, sleep
+from typing import Dict, Iterator, List, Tuple
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from rich.console import Console
+from rich.panel import Panel
+
+from classes.models import DanceClass, Location
+from shared.benchmark import add_latency_row, latency_table
+
+console = Console()
+
+# Seconds a server gets to start answering
+STARTUP_TIMEOUT = 30
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the public API served by gunicorn through WSGI (gthread "
+        "workers) and through ASGI (uvicorn workers), under concurrent HTTP "
+        "clients, against the committed development data"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--servers",
+            nargs="+",
+            choices=["wsgi", "asgi"],
+            default=["wsgi", "asgi"],
+        )
+        parser.add_argument("--workers", type=int, default=1)
+        parser.add_argument(
+            "--threads", type=int, default=8, help="Threads per WSGI worker"
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            nargs="+",
+            default=[1, 8, 32],
+            help="Concurrent client connections",
+        )
+        parser.add_argument(
+            "--requests", type=int, default=400, help="Requests per scenario run"
+        )
+        parser.add_argument("--port", type=int, default=8765)
+
+    def handle(self, *args, **options):
+        console.print(Panel.fit("⚡ WSGI vs ASGI entry points", style="bold green"))
+        paths = self.paths()
+        table = latency_table("Public API latency over HTTP")
+        throughput = []
+
+        for server in options["servers"]:
+            with self.serve(server, options):
+                for name, path in paths.items():
+                    for concurrency in options["concurrency"]:
+                        samples, errors, elapsed = self.load(
+                            options["port"], path, concurrency, options["requests"]
+                        )
+                        if errors:
+                            raise CommandError(f"{server} {path}: {errors} errors")
+                        scenario = f"{name}: {server}, {concurrency} clients"
+                        add_latency_row(table, scenario, len(samples), samples)
+                        throughput.append((scenario, len(samples) / elapsed))
+
+        console.print(table)
+        for scenario, rate in throughput:
+            console.print(f"{scenario}: [green]{rate:,.0f} req/s")
+
+    def paths(self) -> Dict[str, str]:
+        dance_class = DanceClass.objects.order_by("id").first()
+        point = (
+            Location.objects.filter(latitude__isnull=False, longitude__isnull=False)
+            .order_by("id")
+            .values_list("latitude", "longitude")
+            .first()
+        )
+        if dance_class is None or point is None:
+            raise CommandError("No classes to benchmark; run seed_test_data first")
+        near = f"latitude={point[0]}&longitude={point[1]}"
+        return {
+            "/classes": "/api/public/classes?with_total=true",
+            "/classes/{id}": f"/api/public/classes/{dance_class.id}",
+            "/classes/{id}/stats": f"/api/public/classes/{dance_class.id}/stats",
+            "/classes/{id}/page": (
+                f"/api/public/classes/{dance_class.id}/page?include=stats,reviews"
+            ),
+            "/locations/nearby": f"/api/public/locations/nearby?{near}&with_total=true",
+        }
+
+    @contextmanager
+    def serve(self, server: str, options) -> Iterator[None]:
+        """Run the API under gunicorn, the way production runs it"""
+        if server == "wsgi":
+            app = [
+                "mydanceclub.wsgi:application",
+                "--worker-class",
+                "gthread",
+                "--threads",
+                str(options["threads"]),
+            ]
+        else:
+            app = [
+                "mydanceclub.asgi:application",
+                "--worker-class",
+                "uvicorn_worker.UvicornWorker",
+            ]
+        command = [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            *app,
+            "--bind",
+            f"127.0.0.1:{options['port']}",
+            "--workers",
+            str(options["workers"]),
+        ]
+        # Measure the views rather than the response cache
+        env = {**os.environ, "RESPONSE_CACHE_ENABLED": "false"}
+        process = subprocess.Popen(
+            command,
+            cwd=settings.BASE_DIR,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        try:
+            with console.status(f"Starting the {server} server..."):
+                self.wait_ready(process, options["port"])
+            yield
+        finally:
+            process.terminate()
+            process.wait()
+
+    def wait_ready(self, process: subprocess.Popen, port: int) -> None:
+        deadline = perf_counter() + STARTUP_TIMEOUT
+        while perf_counter() < deadline:
+            if process.poll() is not None:
+                stderr = process.stderr.read().decode() if process.stderr else ""
+                raise CommandError(f"The server exited:\n{stderr}")
+            connection = HTTPConnection("localhost", port)
+            try:
+                status, _ = self.get(connection, "/api/public")
+            except OSError:
+                sleep(0.2)
+                continue
+            finally:
+                connection.close()
+            if status < 500:
+                return
+        raise CommandError(f"The server did not answer within {STARTUP_TIMEOUT}s")
+
+    def load(
+        self, port: int, path: str, concurrency: int, requests: int
+    ) -> Tuple[List[float], int, float]:
+        """Latencies in milliseconds, errors and elapsed seconds of
+        `requests` GETs of path spread over concurrent keep-alive clients"""
+
+        def client(count: int) -> Tuple[List[float], int]:
+            connection = HTTPConnection("localhost", port)
+            samples, errors = [], 0
+            try:
+                self.get(connection, path)  # Warm up the connection
+                for _ in range(count):
+                    started = perf_counter()
+                    status, _ = self.get(connection, path)
+                    samples.append((perf_counter() - started) * 1000)
+                    errors += status >= 400
+            finally:
+                connection.close()
+            return samples, errors
+
+        started = perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(client, [requests // concurrency] * concurrency))
+        elapsed = perf_counter() - started
+        samples = [sample for batch, _ in results for sample in batch]
+        return samples, sum(errors for _, errors in results), elapsed
+
+    def get(self, connection: HTTPConnection, path: str) -> Tuple[int, bytes]:
+        connection.request("GET", path)
+        response = connection.getresponse()
+        return response.status, response.read()
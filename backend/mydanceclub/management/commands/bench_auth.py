@@ -0,0 +1,86 @@
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import List
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from rich.console import Console
+from rich.panel import Panel
+
+from accounts.models import User
+from mydanceclub.auth import auth_users, create_token, verified_tokens
+from shared.benchmark import add_latency_row, latency_table
+
+console = Console()
+
+# Email of the throwaway user the benchmark authenticates as
+BENCH_EMAIL = "bench.auth@example.com"
+
+
+class Command(BaseCommand):
+    help = "Benchmarks /auth/me under concurrent load with and without auth caching"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, nargs="+", default=[1, 8])
+        parser.add_argument(
+            "--requests", type=int, default=500, help="Requests per thread count"
+        )
+
+    def handle(self, *args, **options):
+        console.print(Panel.fit("🔐 Auth overhead benchmark", style="bold green"))
+        table = latency_table("/api/auth/me latency")
+        throughput = []
+
+        # Worker threads use their own connections, so the user is committed
+        # rather than seeded in a rolled back transaction
+        User.objects.filter(email=BENCH_EMAIL).delete()
+        user = User.objects.create_user(
+            username=BENCH_EMAIL,
+            email=BENCH_EMAIL,
+            password="bench-password",
+            role="student",
+            bio="Benchmark user " * 50,
+        )
+        header = {"HTTP_AUTHORIZATION": f"Bearer {create_token(user)}"}
+        try:
+            for threads in options["threads"]:
+                for cached in (False, True):
+                    verified_tokens.clear()
+                    auth_users.clear()
+                    with override_settings(AUTH_CACHE_ENABLED=cached):
+                        samples, elapsed = self.run_load(
+                            header, threads, options["requests"]
+                        )
+                    scenario = (
+                        f"{'cached' if cached else 'uncached'}, {threads} threads"
+                    )
+                    add_latency_row(table, scenario, len(samples), samples)
+                    throughput.append((scenario, len(samples) / elapsed))
+        finally:
+            user.delete()
+
+        console.print(table)
+        for scenario, rate in throughput:
+            console.print(f"{scenario}: [green]{rate:,.0f} req/s")
+
+    def run_load(self, header, threads: int, requests: int):
+        def worker(count: int) -> List[float]:
+            client = Client()
+            samples = []
+            try:
+                for _ in range(count):
+                    started = perf_counter()
+                    response = client.get("/api/auth/me", **header)
+                    samples.append((perf_counter() - started) * 1000)
+                    if response.status_code != 200:
+                        raise RuntimeError(f"/api/auth/me: HTTP {response.status_code}")
+            finally:
+                connection.close()
+            return samples
+
+        started = perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            batches = list(pool.map(worker, [requests // threads] * threads))
+        elapsed = perf_counter() - started
+        return [sample for batch in batches for sample in batch], elapsed
@@ -0,0 +1,159 @@
+from time import perf_counter
+from typing import Any, Callable, List, Tuple, Type
+from uuid import uuid4
+
+from django.apps.registry import Apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models, transaction
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from mydanceclub.models import uuid7
+
+console = Console()
+
+# (name, primary key field, key factory) of every compared key scheme
+KeyScheme = Tuple[str, Callable[[], models.Field], Callable[[], Any]]
+
+KEY_SCHEMES: List[KeyScheme] = [
+    (
+        "char(36) uuid4",
+        lambda: models.CharField(primary_key=True, max_length=36),
+        lambda: str(uuid4()),
+    ),
+    ("uuid uuid4", lambda: models.UUIDField(primary_key=True), uuid4),
+    ("uuid uuid7", lambda: models.UUIDField(primary_key=True), uuid7),
+]
+
+# Bytes on disk of all indexes of a table, by database vendor
+INDEX_SIZE_QUERIES = {
+    "sqlite": (
+        "SELECT COALESCE(SUM(pgsize), 0) FROM dbstat WHERE name IN "
+        "(SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = %s)"
+    ),
+    "postgresql": (
+        "SELECT COALESCE(SUM(pg_relation_size(indexrelid)), 0) "
+        "FROM pg_index WHERE indrelid = %s::regclass"
+    ),
+}
+
+
+def bench_models(
+    number: int, primary_key: Callable[[], models.Field]
+) -> Tuple[Type[models.Model], Type[models.Model]]:
+    """A parent model and a child referencing it, keyed by `primary_key`.
+
+    Registered in their own app registry so they never show up in
+    migrations.
+    """
+    apps = Apps()
+
+    def meta(table: str) -> type:
+        return type("Meta", (), {"app_label": "bench", "apps": apps, "db_table": table})
+
+    parent = type(
+        f"BenchParent{number}",
+        (models.Model,),
+        {
+            "__module__": __name__,
+            "Meta": meta(f"bench_pk_parent_{number}"),
+            "id": primary_key(),
+            "created_at": models.DateTimeField(auto_now_add=True),
+        },
+    )
+    child = type(
+        f"BenchChild{number}",
+        (models.Model,),
+        {
+            "__module__": __name__,
+            "Meta": meta(f"bench_pk_child_{number}"),
+            "id": primary_key(),
+            "parent": models.ForeignKey(parent, on_delete=models.CASCADE),
+        },
+    )
+    return parent, child
+
+
+def index_size(table: str) -> int:
+    query = INDEX_SIZE_QUERIES.get(connection.vendor)
+    if query is None:
+        raise CommandError(f"No index size query for {connection.vendor}")
+    with connection.cursor() as cursor:
+        cursor.execute(query, [table])
+        (size,) = cursor.fetchone() or (0,)
+        return int(size)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares insert throughput and index size of random string, random "
+        "UUID and time-ordered UUIDv7 primary keys"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", type=int, default=100_000, help="Parent rows per scheme"
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=500, help="Rows per transaction"
+        )
+
+    def handle(self, *args, **options):
+        console.print(Panel.fit("🔑 Primary key benchmark", style="bold green"))
+        rows = options["rows"]
+        table = Table(
+            title=f"{rows:,} parents and children, {connection.vendor}",
+            show_header=True,
+            header_style="bold magenta",
+        )
+        table.add_column("Key", style="cyan")
+        table.add_column("Inserts/s", justify="right", style="green")
+        table.add_column("Parent PK index", justify="right")
+        table.add_column("Child PK + FK indexes", justify="right")
+
+        # Tables are created and dropped around each run rather than rolled
+        # back, so the inserts commit and the sizes are those of real pages
+        for number, (name, primary_key, new_key) in enumerate(KEY_SCHEMES):
+            parent, child = bench_models(number, primary_key)
+            with connection.schema_editor() as editor:
+                editor.create_model(parent)
+                editor.create_model(child)
+            try:
+                with console.status(f"Inserting with {name} keys..."):
+                    elapsed = self.insert(
+                        parent, child, new_key, rows, options["batch_size"]
+                    )
+                table.add_row(
+                    name,
+                    f"{2 * rows / elapsed:,.0f}",
+                    f"{index_size(parent._meta.db_table) / 1024:,.0f} KiB",
+                    f"{index_size(child._meta.db_table) / 1024:,.0f} KiB",
+                )
+            finally:
+                with connection.schema_editor() as editor:
+                    editor.delete_model(child)
+                    editor.delete_model(parent)
+
+        console.print(table)
+
+    def insert(
+        self,
+        parent: Type[models.Model],
+        child: Type[models.Model],
+        new_key: Callable[[], Any],
+        rows: int,
+        batch_size: int,
+    ) -> float:
+        """Insert `rows` parents with one child each; the seconds it took"""
+        started = perf_counter()
+        for start in range(0, rows, batch_size):
+            parents = [
+                parent(id=new_key()) for _ in range(min(batch_size, rows - start))
+            ]
+            with transaction.atomic():
+                parent._default_manager.bulk_create(parents)
+                child._default_manager.bulk_create(
+                    [child(id=new_key(), parent=row) for row in parents]
+                )
+        return perf_counter() - started
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from rich.console import Console
+from rich.table import Table
+
+from shared.replicas import query_counters
+
+console = Console()
+
+
+class Command(BaseCommand):
+    help = (
+        "Shows the queries web requests ran on each database alias. The "
+        "counters are only shared with the web workers on a shared cache "
+        "backend (CACHE_URL)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset", action="store_true", help="Zero the counters after printing"
+        )
+
+    def handle(self, *args, **options):
+        counts = query_counters.stats()
+        total = sum(counts.values())
+        table = Table(
+            title="Queries per database",
+            show_header=True,
+            header_style="bold magenta",
+        )
+        table.add_column("Alias", style="cyan")
+        table.add_column("Queries", justify="right", style="green")
+        table.add_column("Share", justify="right")
+        for alias, count in counts.items():
+            table.add_row(alias, f"{count:,}", f"{count / total if total else 0:.1%}")
+        console.print(table)
+
+        if options["reset"]:
+            query_counters.reset()
+            console.print("[green]Query counters reset")
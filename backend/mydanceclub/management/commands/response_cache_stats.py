@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from rich.console import Console
+from rich.table import Table
+
+from shared.response_cache import response_cache
+
+console = Console()
+
+
+class Command(BaseCommand):
+    help = (
+        "Shows the response cache hit/miss counters of every cached route. "
+        "The counters are only shared with the web workers on a shared cache "
+        "backend (CACHE_URL)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset", action="store_true", help="Zero the counters after printing"
+        )
+
+    def handle(self, *args, **options):
+        # Importing the API registers its cached routes
+        import mydanceclub.api  # noqa: F401
+
+        table = Table(
+            title="Response cache",
+            show_header=True,
+            header_style="bold magenta",
+        )
+        table.add_column("Route", style="cyan")
+        table.add_column("Hits", justify="right", style="green")
+        table.add_column("Misses", justify="right", style="yellow")
+        table.add_column("Hit rate", justify="right")
+        for stats in response_cache.stats():
+            table.add_row(
+                stats.route,
+                f"{stats.hits:,}",
+                f"{stats.misses:,}",
+                f"{stats.hit_rate:.1%}",
+            )
+        console.print(table)
+
+        if options["reset"]:
+            response_cache.reset_stats()
+            console.print("[green]Response cache counters reset")
@@ -0,0 +1,141 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from django.core.management.base import BaseCommand
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+from rich.text import Text
+
+from shared.slow_queries import slow_query_log
+
+console = Console()
+
+# Entry fields the report can group by: (column title, Offender counter)
+GROUPS = {
+    "shape": ("Query", "shapes"),
+    "route": ("Route", "routes"),
+    "service": ("Service", "services"),
+}
+
+
+@dataclass
+class Offender:
+    # Value of the grouped field shared by the entries
+    key: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_seen: str = ""
+    shapes: Counter[str] = field(default_factory=Counter)
+    routes: Counter[str] = field(default_factory=Counter)
+    services: Counter[str] = field(default_factory=Counter)
+    call_sites: Counter[str] = field(default_factory=Counter)
+    # Latest plan captured for the shape, or why it could not be
+    plan: Optional[str] = None
+    plan_error: Optional[str] = None
+
+    def add(self, entry: Dict[str, Any]) -> None:
+        self.count += 1
+        self.total_ms += entry["duration_ms"]
+        self.max_ms = max(self.max_ms, entry["duration_ms"])
+        self.last_seen = max(self.last_seen, entry["at"])
+        self.shapes[entry["shape"]] += 1
+        self.routes[entry.get("route") or "-"] += 1
+        self.services[entry.get("service") or "-"] += 1
+        self.call_sites[entry.get("call_site") or "-"] += 1
+        if entry.get("plan") is not None:
+            self.plan, self.plan_error = "\n".join(entry["plan"]), None
+        elif entry.get("plan_error") is not None:
+            self.plan, self.plan_error = None, entry["plan_error"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Summarizes the slow query log of this host by query shape, route or "
+        "service method, worst total time first. Queries are logged once "
+        "they take SLOW_QUERY_THRESHOLD_MS."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit", type=int, default=10, help="Number of groups to show"
+        )
+        parser.add_argument(
+            "--group-by",
+            choices=list(GROUPS),
+            default="shape",
+            help="Entry field to group by",
+        )
+        parser.add_argument(
+            "--plans", action="store_true", help="Print the latest plan of each group"
+        )
+        parser.add_argument(
+            "--clear", action="store_true", help="Delete the log after printing"
+        )
+
+    def handle(self, *args, **options):
+        group = options["group_by"]
+        offenders: Dict[str, Offender] = {}
+        for entry in slow_query_log.entries():
+            key = entry.get(group) or "-"
+            offenders.setdefault(key, Offender(key)).add(entry)
+        if not offenders:
+            console.print(f"[yellow]No slow queries in {slow_query_log.path}")
+            return
+
+        top = sorted(offenders.values(), key=lambda o: o.total_ms, reverse=True)
+        top = top[: options["limit"]]
+        table = Table(
+            title=f"Slow queries ({sum(o.count for o in offenders.values())} "
+            f"logged, {len(offenders)} {group}s)",
+            show_header=True,
+            header_style="bold magenta",
+        )
+        table.add_column("#", justify="right")
+        table.add_column(GROUPS[group][0], style="cyan", max_width=60)
+        table.add_column("Count", justify="right")
+        table.add_column("Total ms", justify="right", style="green")
+        table.add_column("Mean ms", justify="right")
+        table.add_column("Max ms", justify="right")
+        # The most frequent value of every other field
+        others = [columns for name, columns in GROUPS.items() if name != group]
+        for title, _ in others:
+            table.add_column(
+                f"Top {title.lower()}", max_width=60, no_wrap=True, overflow="ellipsis"
+            )
+        table.add_column("Call site")
+        table.add_column("Last seen")
+        for number, offender in enumerate(top, 1):
+            table.add_row(
+                str(number),
+                offender.key,
+                f"{offender.count:,}",
+                f"{offender.total_ms:,.0f}",
+                f"{offender.total_ms / offender.count:,.1f}",
+                f"{offender.max_ms:,.1f}",
+                *(
+                    getattr(offender, counter).most_common(1)[0][0]
+                    for _, counter in others
+                ),
+                offender.call_sites.most_common(1)[0][0],
+                offender.last_seen[:19],
+            )
+        console.print(table)
+
+        if options["plans"]:
+            for number, offender in enumerate(top, 1):
+                if offender.plan is not None:
+                    body = Text(offender.plan)
+                elif offender.plan_error is not None:
+                    body = f"[red]EXPLAIN failed: {offender.plan_error}"
+                else:
+                    body = "[yellow]No plan captured (not a SELECT, or none yet)"
+                console.print(
+                    Panel(body, title=f"#{number} {offender.key[:80]}", expand=False)
+                )
+
+        if options["clear"]:
+            slow_query_log.clear()
+            console.print("[green]Slow query log cleared")
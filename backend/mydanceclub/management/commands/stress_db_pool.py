@@ -0,0 +1,166 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Lock, Thread
+from time import perf_counter
+from typing import Dict, List
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from rich.console import Console
+from rich.panel import Panel
+from prometheus_client import REGISTRY
+from rich.table import Table
+
+from shared.db_pool import WAIT_BUCKETS, PoolExhausted
+
+console = Console()
+
+
+def pool_counters(alias: str) -> Dict[str, float]:
+    """This process' db_pool_* counters of one database, as read by a scraper"""
+
+    def sample(name: str, **labels: str) -> float:
+        value = REGISTRY.get_sample_value(name, {"database": alias, **labels})
+        return value or 0.0
+
+    counters = {
+        "checkouts": sample("db_pool_checkout_wait_seconds_count"),
+        "wait_seconds": sample("db_pool_checkout_wait_seconds_sum"),
+        "exhausted": sample("db_pool_exhausted_total"),
+    }
+    for bound in WAIT_BUCKETS:
+        counters[f"le {bound}"] = sample(
+            "db_pool_checkout_wait_seconds_bucket", le=str(bound).replace("inf", "+Inf")
+        )
+    return counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Stress tests a PostgreSQL connection pool with more threads than "
+        "connections and checks it never opens more than its max size"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default")
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=50,
+            help="Concurrent threads, as many as ASGI runs sync ORM work in",
+        )
+        parser.add_argument(
+            "--checkouts", type=int, default=20, help="Checkouts per thread"
+        )
+        parser.add_argument(
+            "--hold-ms",
+            type=float,
+            default=10,
+            help="Time a thread holds its connection, as a query would",
+        )
+
+    def handle(self, *args, **options):
+        alias = options["database"]
+        pool_options = connections[alias].settings_dict["OPTIONS"].get("pool")
+        if connections[alias].vendor != "postgresql" or not pool_options:
+            raise CommandError(
+                f"{alias} is not a pooled PostgreSQL database; "
+                "set DATABASE_POOL_MAX_SIZE above 0"
+            )
+        console.print(Panel.fit("🏊 Connection pool stress test", style="bold green"))
+        pool = getattr(connections[alias], "pool")
+        before = pool_counters(alias)
+        errors: List[str] = []
+        errors_lock = Lock()
+        peak = {"size": 0, "in_use": 0, "waiting": 0}
+        done = Event()
+
+        def sample():
+            while not done.wait(0.005):
+                gauges = pool.get_stats()
+                in_use = gauges["pool_size"] - gauges["pool_available"]
+                peak["size"] = max(peak["size"], gauges["pool_size"])
+                peak["in_use"] = max(peak["in_use"], in_use)
+                peak["waiting"] = max(peak["waiting"], gauges["requests_waiting"])
+
+        def worker():
+            connection = connections[alias]
+            for _ in range(options["checkouts"]):
+                try:
+                    with connection.cursor() as cursor:
+                        cursor.execute(
+                            "SELECT pg_sleep(%s)", [options["hold_ms"] / 1000]
+                        )
+                except PoolExhausted:
+                    pass  # Counted by the pool metrics
+                except Exception as error:
+                    with errors_lock:
+                        errors.append(repr(error))
+                finally:
+                    # Back to the pool, as at the end of every request
+                    connection.close()
+
+        sampler = Thread(target=sample, daemon=True)
+        sampler.start()
+        started = perf_counter()
+        with ThreadPoolExecutor(max_workers=options["threads"]) as executor:
+            for _ in range(options["threads"]):
+                executor.submit(worker)
+        elapsed = perf_counter() - started
+        done.set()
+        sampler.join()
+
+        after = pool_counters(alias)
+        counters = {name: after[name] - before[name] for name in after}
+        in_use = REGISTRY.get_sample_value(
+            "db_pool_connections_in_use", {"database": alias}
+        )
+        console.print(self.summary(alias, pool, counters, peak, elapsed))
+        console.print(self.histogram(counters))
+
+        failures = []
+        if peak["size"] > pool.max_size:
+            failures.append(f"pool grew to {peak['size']} of {pool.max_size}")
+        if in_use:
+            failures.append(f"{in_use:.0f} connections never went back")
+        failures.extend(errors[:10])
+        if failures:
+            raise CommandError("\n".join(failures))
+
+    def summary(
+        self,
+        alias: str,
+        pool,
+        counters: Dict[str, float],
+        peak: Dict[str, int],
+        elapsed: float,
+    ) -> Table:
+        table = Table(
+            title=f"Pool {alias}", show_header=True, header_style="bold magenta"
+        )
+        table.add_column("Metric", style="cyan")
+        table.add_column("Value", justify="right", style="green")
+        checkouts = counters["checkouts"]
+        mean_ms = counters["wait_seconds"] * 1000 / checkouts if checkouts else 0
+        table.add_row("Min / max size", f"{pool.min_size} / {pool.max_size}")
+        table.add_row("Peak open connections", str(peak["size"]))
+        table.add_row("Peak in use", str(peak["in_use"]))
+        table.add_row("Peak waiting", str(peak["waiting"]))
+        table.add_row("Checkouts", f"{checkouts:,.0f}")
+        table.add_row("Exhausted (503)", f"{counters['exhausted']:,.0f}")
+        table.add_row("Mean wait (ms)", f"{mean_ms:.2f}")
+        table.add_row("Checkouts/s", f"{checkouts / elapsed:,.0f}")
+        return table
+
+    def histogram(self, counters: Dict[str, float]) -> Table:
+        table = Table(
+            title="Checkout wait", show_header=True, header_style="bold magenta"
+        )
+        table.add_column("Wait ≤ (ms)", justify="right", style="cyan")
+        table.add_column("Checkouts", justify="right", style="green")
+        table.add_column("Share", justify="right")
+        checkouts = counters["checkouts"]
+        for bound in WAIT_BUCKETS:
+            count = counters[f"le {bound}"]
+            share = count / checkouts if checkouts else 0
+            table.add_row(f"{bound * 1000:g}", f"{count:,.0f}", f"{share:.1%}")
+        return table
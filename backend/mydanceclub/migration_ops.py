@@ -0,0 +1,61 @@
+from typing import List, Tuple
+
+from django.db import migrations
+
+
+def uuid_key_columns(connection, table: str, column: str) -> List[Tuple[str, str]]:
+    """(table, column) of a key and of every foreign key column referencing it.
+
+    Read from the database rather than from the migration state, which only
+    holds the models of migrations planned before the current one.
+    """
+    columns = [(table, column)]
+    introspection = connection.introspection
+    with connection.cursor() as cursor:
+        for other in introspection.table_names(cursor):
+            relations = introspection.get_relations(cursor, other)
+            for fk_column, (referenced_column, referenced_table) in relations.items():
+                if (referenced_table, referenced_column) == (table, column):
+                    columns.append((other, fk_column))
+    return columns
+
+
+def NormalizeUUIDKeys(*model_names: str) -> migrations.RunPython:
+    """Rewrite string UUID keys into the format of UUIDField columns.
+
+    Run after AlterField turns a CharField primary key into a UUIDField.
+    PostgreSQL casts the values (and the referencing columns) to its native
+    uuid type during the AlterField; backends without one store UUIDField
+    as 32 hex digits, so the dashes of the old 36 character keys are
+    stripped here. Reversing puts the dashes back.
+    """
+
+    def rewrite(apps, schema_editor, expression: str):
+        if schema_editor.connection.features.has_native_uuid_field:
+            return
+        quote = schema_editor.quote_name
+        for model_name in model_names:
+            meta = apps.get_model(model_name)._meta
+            key_columns = uuid_key_columns(
+                schema_editor.connection, meta.db_table, meta.pk.column
+            )
+            for table, column in key_columns:
+                name = quote(column)
+                schema_editor.execute(
+                    f"UPDATE {quote(table)} SET {name} = {expression.format(name)}"
+                    f" WHERE {name} IS NOT NULL"
+                )
+
+    def strip_dashes(apps, schema_editor):
+        rewrite(apps, schema_editor, "REPLACE({0}, '-', '')")
+
+    def add_dashes(apps, schema_editor):
+        rewrite(
+            apps,
+            schema_editor,
+            "SUBSTR({0}, 1, 8) || '-' || SUBSTR({0}, 9, 4) || '-' || "
+            "SUBSTR({0}, 13, 4) || '-' || SUBSTR({0}, 17, 4) || '-' || "
+            "SUBSTR({0}, 21)",
+        )
+
+    return migrations.RunPython(strip_dashes, add_dashes)
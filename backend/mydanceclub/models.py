@@ -1,15 +1,68 @@
+import os
+import time
 import uuid
 from django.db import models
 
 
 def generate_uuid():
+    # Default of the string keys before UUIDv7; kept for old migrations
     return str(uuid.uuid4())
 
 
+def uuid7() -> uuid.UUID:
+    """Time-ordered UUID (RFC 9562 version 7).
+
+    48 bits of Unix milliseconds lead, then 12 bits of sub-millisecond
+    time and 62 random bits, so keys created later sort after earlier ones
+    and inserts land at the right edge of the B-tree instead of at random
+    pages.
+    """
+    nanoseconds = time.time_ns()
+    milliseconds, remainder = divmod(nanoseconds, 1_000_000)
+    sub_milliseconds = remainder * 4096 // 1_000_000
+    random_bits = int.from_bytes(os.urandom(8)) & ((1 << 62) - 1)
+    value = (
+        (milliseconds & ((1 << 48) - 1)) << 80
+        | 0x7 << 76
+        | sub_milliseconds << 64
+        | 0b10 << 62
+        | random_bits
+    )
+    return uuid.UUID(int=value)
+
+
 class BaseModel(models.Model):
-    id = models.CharField(primary_key=True, max_length=36, default=generate_uuid)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         abstract = True
+
+
+class RequestProfile(BaseModel):
+    """Stack samples of one API request, taken by mydanceclub.profiler"""
+
+    class Trigger(models.TextChoices):
+        HEADER = "header", "Requested by staff"
+        SAMPLED = "sampled", "Sampled"
+
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=500)
+    status_code = models.PositiveSmallIntegerField()
+    trigger = models.CharField(max_length=10, choices=Trigger.choices)
+    user = models.ForeignKey(
+        "accounts.User", null=True, blank=True, on_delete=models.SET_NULL
+    )
+    duration_ms = models.FloatField()
+    interval_ms = models.FloatField()
+    sample_count = models.PositiveIntegerField()
+    # One "frame;frame;... count" line per distinct stack, for flamegraph.pl
+    # or speedscope
+    stacks = models.TextField()
+
+    class Meta(BaseModel.Meta):
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
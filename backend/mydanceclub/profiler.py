@@ -0,0 +1,261 @@
+import random
+import sys
+import sysconfig
+import threading
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from inspect import iscoroutinefunction
+from time import perf_counter
+from types import FrameType
+from typing import Any, Optional, Set
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.http import HttpRequest, HttpResponse
+from django.utils.decorators import sync_and_async_middleware
+from ninja import NinjaAPI
+
+from accounts.models import User
+from mydanceclub.auth import get_user_from_token
+from mydanceclub.models import RequestProfile
+
+# Header a staff member sends, with their bearer token, to profile a request
+REQUEST_HEADER = "X-Profile"
+# Response header naming the stored RequestProfile
+RESPONSE_HEADER = "X-Profile-Id"
+PROFILED_PREFIX = "/api/"
+# Shortest interval between samples; shorter ones would slow the request
+# more than they tell
+MIN_INTERVAL_MS = 1.0
+STDLIB_DIR = f"{sysconfig.get_paths()['stdlib']}/"
+
+# One profile at a time per process, so neither staff nor the sample rate
+# can have more than one sampler thread running
+_profiling = threading.Lock()
+
+
+@dataclass
+class Profile:
+    """Wall-clock stack samples of the threads serving one request"""
+
+    interval_ms: float
+    max_samples: int
+    # Threads running the request's code: its handler, the thread running
+    # the Ninja operation and any thread running its queries
+    threads: Set[int] = field(default_factory=set)
+    stacks: Counter[str] = field(default_factory=Counter)
+    samples: int = 0
+
+    def join_thread(self) -> None:
+        self.threads.add(threading.get_ident())
+
+    def sample(self) -> None:
+        frames = sys._current_frames()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident in list(self.threads):
+            frame = frames.get(ident)
+            if frame is not None:
+                thread = names.get(ident, str(ident))
+                self.stacks[";".join([thread, *_stack(frame)])] += 1
+        self.samples += 1
+
+    def folded(self) -> str:
+        """Samples in the folded format of flamegraph.pl and speedscope"""
+        return "\n".join(
+            f"{stack} {count}" for stack, count in self.stacks.most_common()
+        )
+
+
+_profile: ContextVar[Optional[Profile]] = ContextVar("request_profile", default=None)
+
+
+def _stack(frame: Optional[FrameType]) -> list[str]:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(
+            f"{code.co_qualname} ({_short_path(code.co_filename)}:"
+            f"{code.co_firstlineno})".replace(";", ",")
+        )
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+def _short_path(path: str) -> str:
+    if "site-packages/" in path:
+        return path.rsplit("site-packages/", 1)[1]
+    return path.removeprefix(f"{settings.BASE_DIR}/").removeprefix(STDLIB_DIR)
+
+
+def _sample_until(profile: Profile, stop: threading.Event) -> None:
+    interval = max(profile.interval_ms, MIN_INTERVAL_MS) / 1000
+    while not stop.wait(interval) and profile.samples < profile.max_samples:
+        profile.sample()
+
+
+def _trigger(request: HttpRequest) -> Optional[str]:
+    """Why the request would be profiled; "header" still needs _staff_user()"""
+    if not request.path.startswith(PROFILED_PREFIX):
+        return None
+    if REQUEST_HEADER in request.headers:
+        return "header"
+    if random.random() < settings.PROFILER_SAMPLE_RATE:
+        return "sampled"
+    return None
+
+
+def _staff_user(request: HttpRequest) -> Optional[User]:
+    """The staff member whose bearer token the request carries, if any"""
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer":
+        return None
+    user = get_user_from_token(token)
+    return user if user is not None and user.is_staff else None
+
+
+class _Profiling:
+    """Runs the sampler for one request and stores what it collected"""
+
+    def __init__(self, request: HttpRequest, trigger: str, user: Optional[User]):
+        self.request = request
+        self.trigger = trigger
+        self.user = user
+        self.profile = Profile(
+            interval_ms=settings.PROFILER_INTERVAL_MS,
+            max_samples=settings.PROFILER_MAX_SAMPLES,
+        )
+        self.profile.join_thread()
+        self.stop = threading.Event()
+        self.sampler = threading.Thread(
+            target=_sample_until,
+            args=(self.profile, self.stop),
+            name="request-profiler",
+            daemon=True,
+        )
+
+    def start(self) -> None:
+        self.token = _profile.set(self.profile)
+        self.started = perf_counter()
+        self.sampler.start()
+
+    def finish(self) -> float:
+        duration_ms = (perf_counter() - self.started) * 1000
+        self.stop.set()
+        self.sampler.join()
+        _profile.reset(self.token)
+        return duration_ms
+
+    def save(self, response: HttpResponse, duration_ms: float) -> None:
+        profile = RequestProfile.objects.create(
+            method=self.request.method or "",
+            path=self.request.get_full_path()[:500],
+            status_code=response.status_code,
+            trigger=self.trigger,
+            user=self.user,
+            duration_ms=duration_ms,
+            interval_ms=self.profile.interval_ms,
+            sample_count=self.profile.samples,
+            stacks=self.profile.folded(),
+        )
+        stale = RequestProfile.objects.values_list("id", flat=True)[
+            settings.PROFILER_KEEP :
+        ]
+        RequestProfile.objects.filter(id__in=list(stale)).delete()
+        response[RESPONSE_HEADER] = str(profile.id)
+
+
+@sync_and_async_middleware
+def profiler_middleware(get_response):
+    """Profiles an API request a staff member asks for with X-Profile, or a
+    PROFILER_SAMPLE_RATE share of them, by sampling the stacks of the
+    threads serving it every PROFILER_INTERVAL_MS.
+
+    Bounded so it cannot be used to load the service: one request per
+    process is profiled at a time, others run unprofiled, and sampling
+    stops after PROFILER_MAX_SAMPLES. Profiles are stored as RequestProfile
+    for the admin, the last PROFILER_KEEP of them. Threads shared with other
+    requests, such as an ASGI server's event loop, add their samples too.
+    """
+    if iscoroutinefunction(get_response):
+
+        async def async_middleware(request: HttpRequest) -> HttpResponse:
+            trigger, user = _trigger(request), None
+            if trigger == "header":
+                user = await sync_to_async(_staff_user)(request)
+                trigger = trigger if user is not None else None
+            if trigger is None or not _profiling.acquire(blocking=False):
+                return await get_response(request)
+            try:
+                profiling = _Profiling(request, trigger, user)
+                profiling.start()
+                try:
+                    response = await get_response(request)
+                finally:
+                    duration_ms = profiling.finish()
+                await sync_to_async(profiling.save)(response, duration_ms)
+            finally:
+                _profiling.release()
+            return response
+
+        return async_middleware
+
+    def middleware(request: HttpRequest) -> HttpResponse:
+        trigger, user = _trigger(request), None
+        if trigger == "header":
+            user = _staff_user(request)
+            trigger = trigger if user is not None else None
+        if trigger is None or not _profiling.acquire(blocking=False):
+            return get_response(request)
+        try:
+            profiling = _Profiling(request, trigger, user)
+            profiling.start()
+            try:
+                response = get_response(request)
+            finally:
+                duration_ms = profiling.finish()
+            profiling.save(response, duration_ms)
+        finally:
+            _profiling.release()
+        return response
+
+    return middleware
+
+
+def profile_operations(api: NinjaAPI) -> None:
+    """Sample the thread each operation of the API runs in, which differs
+    from the handler's when an async view runs under a sync handler"""
+    create_temporal_response = api.create_temporal_response
+
+    @wraps(create_temporal_response)
+    def joined_create_temporal_response(*args: Any, **kwargs: Any) -> HttpResponse:
+        profile = _profile.get()
+        if profile is not None:
+            profile.join_thread()
+        return create_temporal_response(*args, **kwargs)
+
+    api.create_temporal_response = joined_create_temporal_response
+
+
+def _join_query_thread(execute, sql, params, many, context):
+    # The async ORM runs queries, and builds model instances from their
+    # rows, in a thread of its own
+    profile = _profile.get()
+    if profile is not None:
+        profile.join_thread()
+    return execute(sql, params, many, context)
+
+
+def _install_query_thread_hook(sender, connection, **kwargs):
+    # Inserted first, as execute_wrapper() blocks pop the last wrapper
+    if _join_query_thread not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _join_query_thread)
+
+
+def connect_profiler_signals():
+    connection_created.connect(
+        _install_query_thread_hook, dispatch_uid="request_profiler"
+    )
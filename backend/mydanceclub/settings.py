@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 from datetime import timedelta
 import os
 from pathlib import Path
+from typing import Any, Dict, Mapping
 import dj_database_url
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -47,6 +48,7 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "ninja",
+    "mydanceclub",
     "accounts",
     "classes",
     "reviews",
@@ -58,6 +60,12 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "shared.sql_comments.sql_comment_middleware",
+    "mydanceclub.profiler.profiler_middleware",
+    "shared.replicas.replica_routing_middleware",
+    "shared.query_count.query_budget_middleware",
+    "shared.metrics.metrics_middleware",
+    "shared.server_timing.server_timing_middleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -94,6 +102,8 @@ CORS_ALLOW_HEADERS = [
     "user-agent",
     "x-csrftoken",
     "x-requested-with",
+    "x-request-id",
+    "x-server-timing",
 ]
 
 TEMPLATES = [
@@ -112,20 +122,171 @@ TEMPLATES = [
     },
 ]
 
+# Servers run the ASGI app (mydanceclub.asgi, see gunicorn.conf.py); the
+# WSGI one is only used by runserver
 WSGI_APPLICATION = "mydanceclub.wsgi.application"
 
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# Connection pool of each PostgreSQL database, per process (psycopg_pool,
+# timed by shared.postgresql_pool); size it so processes * max size stays
+# under the server's max_connections. A request waits up to the timeout for
+# a connection, then gets a 503. DATABASE_POOL_MAX_SIZE=0 turns pooling off
+# for persistent per-thread connections.
+DATABASE_POOL_MIN_SIZE = int(os.getenv("DATABASE_POOL_MIN_SIZE", "2"))
+DATABASE_POOL_MAX_SIZE = int(os.getenv("DATABASE_POOL_MAX_SIZE", "10"))
+DATABASE_POOL_TIMEOUT = float(os.getenv("DATABASE_POOL_TIMEOUT", "5"))
+# Requests allowed to queue for a connection before failing fast, 0 for any
+DATABASE_POOL_MAX_WAITING = int(os.getenv("DATABASE_POOL_MAX_WAITING", "0"))
+# Seconds before an idle connection above the min size is closed, and
+# before any connection is replaced
+DATABASE_POOL_MAX_IDLE = float(os.getenv("DATABASE_POOL_MAX_IDLE", "300"))
+DATABASE_POOL_MAX_LIFETIME = float(os.getenv("DATABASE_POOL_MAX_LIFETIME", "3600"))
+
+
+def pooled(config: Mapping[str, Any], alias: str) -> Dict[str, Any]:
+    """Database settings using the connection pool on PostgreSQL"""
+    postgresql = config.get("ENGINE") == "django.db.backends.postgresql"
+    if not postgresql or not DATABASE_POOL_MAX_SIZE:
+        return dict(config)
+    pool = {
+        "name": alias,
+        "min_size": DATABASE_POOL_MIN_SIZE,
+        "max_size": DATABASE_POOL_MAX_SIZE,
+        "timeout": DATABASE_POOL_TIMEOUT,
+        "max_waiting": DATABASE_POOL_MAX_WAITING,
+        "max_idle": DATABASE_POOL_MAX_IDLE,
+        "max_lifetime": DATABASE_POOL_MAX_LIFETIME,
+    }
+    return {
+        **config,
+        "ENGINE": "shared.postgresql_pool",
+        # A connection goes back to the pool at the end of every request
+        "CONN_MAX_AGE": 0,
+        # The pool checks a connection is alive before handing it out
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {**config.get("OPTIONS", {}), "pool": pool},
+    }
+
+
 # Default database URL for local development
 DATABASES = {
-    "default": dj_database_url.config(
-        default=os.getenv("DATABASE_URL"),
-        conn_max_age=600,
+    "default": pooled(
+        dj_database_url.config(
+            default=os.getenv("DATABASE_URL"),
+            conn_max_age=600,
+        ),
+        "default",
+    )
+}
+
+# Read replicas, as comma separated URLs; shared.replicas sends the reads of
+# public catalog requests to them. A second local database can stand in for
+# one, and in Django's test runner every replica mirrors the primary.
+DATABASE_REPLICAS = []
+for number, url in enumerate(
+    filter(None, os.getenv("DATABASE_REPLICA_URLS", "").split(","))
+):
+    alias = f"replica_{number}"
+    DATABASES[alias] = {
+        **pooled(dj_database_url.parse(url, conn_max_age=600), alias),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+DATABASE_ROUTERS = ["shared.replicas.ReplicaRouter"]
+# Seconds a client reads from the primary after it wrote; keep above the
+# replication lag so it reads its own writes
+DATABASE_REPLICA_PIN_SECONDS = int(os.getenv("DATABASE_REPLICA_PIN_SECONDS", "5"))
+
+# Per-request query checks of shared.query_count: a route over the budget it
+# declares with query_budget(), or one query run this many times in a request
+# (N+1), raises in strict mode and logs a sampled warning otherwise. The test
+# suite turns strict mode on (see conftest.py)
+QUERY_BUDGET_STRICT = os.getenv("QUERY_BUDGET_STRICT", "false").lower() == "true"
+QUERY_BUDGET_LOG_SAMPLE_RATE = float(os.getenv("QUERY_BUDGET_LOG_SAMPLE_RATE", "0.1"))
+QUERY_REPEAT_THRESHOLD = int(os.getenv("QUERY_REPEAT_THRESHOLD", "3"))
+
+# Bearer token a Prometheus scraper sends for /internal/metrics; without one
+# the metrics are only served in DEBUG. Multi-process servers also need
+# PROMETHEUS_MULTIPROC_DIR, see gunicorn.conf.py
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Server-Timing header splitting each response into auth, db, schema and
+# render time (shared.server_timing): on every response, or only for
+# requests sending an X-Server-Timing header when that is allowed
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "false") == "true"
+SERVER_TIMING_ALLOW_HEADER = (
+    os.getenv("SERVER_TIMING_ALLOW_HEADER", str(DEBUG)).lower() == "true"
+)
+
+# Sampling profiler of API requests (mydanceclub.profiler), run for staff
+# sending X-Profile and for this share of all requests; one request per
+# process at a time, for at most PROFILER_MAX_SAMPLES samples
+PROFILER_SAMPLE_RATE = float(os.getenv("PROFILER_SAMPLE_RATE", "0"))
+PROFILER_INTERVAL_MS = float(os.getenv("PROFILER_INTERVAL_MS", "5"))
+PROFILER_MAX_SAMPLES = int(os.getenv("PROFILER_MAX_SAMPLES", "2000"))
+# Stored profiles kept for the admin, newest first
+PROFILER_KEEP = int(os.getenv("PROFILER_KEEP", "100"))
+
+# Slow query log (shared.slow_queries): queries taking at least this many
+# milliseconds are written with their plan to a rotated JSON lines file,
+# summarized by the slow_query_report command; 0 turns it off
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+SLOW_QUERY_LOG_PATH = os.getenv(
+    "SLOW_QUERY_LOG_PATH", str(BASE_DIR / "logs" / "slow_queries.jsonl")
+)
+SLOW_QUERY_LOG_MAX_BYTES = int(os.getenv("SLOW_QUERY_LOG_MAX_BYTES", "10485760"))
+SLOW_QUERY_LOG_BACKUPS = int(os.getenv("SLOW_QUERY_LOG_BACKUPS", "5"))
+
+# sqlcommenter-style comments on every query of a request, naming its route,
+# Ninja operation, service method and request id (shared.sql_comments).
+# Comments that differ per request defeat SQLite's statement cache
+SQL_COMMENTS_ENABLED = os.getenv("SQL_COMMENTS_ENABLED", "false") == "true"
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+# Production points CACHE_URL at Redis so every worker shares one cache;
+# without it each process keeps its own local-memory cache
+CACHES = {
+    "default": (
+        {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("CACHE_URL"),
+        }
+        if os.getenv("CACHE_URL")
+        else {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
     )
 }
 
+# Public GET responses cached by shared.response_cache
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true") == "true"
+# Upper bound, in seconds, on how long a cached response outlives its data
+# for changes no signal reports (bulk updates, the date rolling over)
+RESPONSE_CACHE_TIMEOUT = int(os.getenv("RESPONSE_CACHE_TIMEOUT", "300"))
+
+
+# Password hashing
+# https://docs.djangoproject.com/en/5.1/topics/auth/passwords/
+
+# The tunable hasher replaces Django's PBKDF2PasswordHasher, which shares its
+# algorithm name; the others only verify hashes made before a switch
+PASSWORD_HASHERS = [
+    "accounts.hashers.TunablePBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+# PBKDF2 cost; Django's default in production, lower it for development
+PASSWORD_HASH_ITERATIONS = int(os.getenv("PASSWORD_HASH_ITERATIONS", "870000"))
+# Threads hashing passwords per process, and hashes allowed to wait for one
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+PASSWORD_HASH_QUEUE_SIZE = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", "16"))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -177,3 +338,5 @@ AUTH_USER_MODEL = "accounts.User"
 # JWT Settings
 JWT_LIFETIME = timedelta(minutes=60)
 JWT_SECRET = SECRET_KEY
+# Memoize verified tokens and cache authenticated users (mydanceclub.auth)
+AUTH_CACHE_ENABLED = os.getenv("AUTH_CACHE_ENABLED", "true") == "true"
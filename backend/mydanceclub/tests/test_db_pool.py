@@ -0,0 +1,59 @@
+"""A checkout the PostgreSQL connection pool cannot serve in time raises
+PoolExhausted and shows in the db_pool_* metrics."""
+
+import pytest
+from django.db import DEFAULT_DB_ALIAS, connections
+from prometheus_client import REGISTRY
+
+from shared.db_pool import PoolExhausted
+from shared.postgresql_pool.base import DatabaseWrapper
+
+pytestmark = pytest.mark.skipif(
+    connections[DEFAULT_DB_ALIAS].vendor != "postgresql",
+    reason="Connection pools are PostgreSQL only",
+)
+
+ALIAS = "pool_test"
+# Seconds a checkout waits for the pool's single connection
+POOL_TIMEOUT = 0.2
+
+
+def sample(name: str) -> float:
+    return REGISTRY.get_sample_value(name, {"database": ALIAS}) or 0.0
+
+
+@pytest.fixture
+def pooled_connections(db):
+    """Two connections sharing a pool of one, to the test database"""
+    settings_dict = connections[DEFAULT_DB_ALIAS].settings_dict
+    pool = {"min_size": 1, "max_size": 1, "timeout": POOL_TIMEOUT}
+    settings_dict = {
+        **settings_dict,
+        "CONN_MAX_AGE": 0,
+        "OPTIONS": {**settings_dict["OPTIONS"], "pool": pool},
+    }
+    first = DatabaseWrapper(settings_dict, alias=ALIAS)
+    second = DatabaseWrapper(settings_dict, alias=ALIAS)
+    yield first, second
+    first.close()
+    second.close()
+    # Like pool, close_pool() is unknown to the stubs
+    getattr(first, "close_pool")()
+
+
+def test_exhausted_pool(pooled_connections):
+    first, second = pooled_connections
+    checkouts = sample("db_pool_checkout_wait_seconds_count")
+    exhausted = sample("db_pool_exhausted_total")
+
+    first.ensure_connection()
+    assert sample("db_pool_checkout_wait_seconds_count") == checkouts + 1
+    assert sample("db_pool_connections_in_use") == 1
+
+    with pytest.raises(PoolExhausted):
+        second.ensure_connection()
+    assert sample("db_pool_exhausted_total") == exhausted + 1
+
+    first.close()
+    second.ensure_connection()
+    assert sample("db_pool_checkout_wait_seconds_count") == checkouts + 2
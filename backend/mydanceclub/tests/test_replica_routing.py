@@ -0,0 +1,96 @@
+"""Public reads go to the replica, writes to the primary, and a client that
+wrote reads from the primary until its pin cookie expires."""
+
+import json
+from contextlib import ExitStack
+from random import Random
+from typing import Dict
+from uuid import uuid4
+
+import pytest
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+from classes.management.bench_data import (
+    create_bench_classes,
+    create_bench_instructors,
+    create_bench_locations,
+)
+from conftest import TEST_REPLICA
+from shared.replicas import PIN_COOKIE, query_counters
+
+# The replica is a second connection to the test database, which only sees
+# committed rows
+pytestmark = pytest.mark.django_db(transaction=True, databases="__all__")
+
+
+@pytest.fixture(autouse=True)
+def replica(settings):
+    settings.DATABASE_REPLICAS = [TEST_REPLICA]
+    # Cached responses would run no query at all
+    settings.RESPONSE_CACHE_ENABLED = False
+    query_counters.reset()
+    instructors = create_bench_instructors(1, prefix="replica")
+    locations = create_bench_locations(1, Random(3))
+    create_bench_classes(locations, instructors, 2, Random(3))
+
+
+def request(client, method: str, path: str, **kwargs) -> Dict[str, int]:
+    """Queries the request ran, by database alias"""
+    with ExitStack() as stack:
+        captured = {
+            alias: stack.enter_context(CaptureQueriesContext(connections[alias]))
+            for alias in (DEFAULT_DB_ALIAS, TEST_REPLICA)
+        }
+        response = getattr(client, method)(path, **kwargs)
+    assert response.status_code < 400, response.content
+    return {alias: len(queries) for alias, queries in captured.items()}
+
+
+def signup(client) -> Dict[str, int]:
+    body = {"email": f"{uuid4().hex}@example.com", "password": uuid4().hex}
+    return request(
+        client,
+        "post",
+        "/api/auth/signup",
+        data=json.dumps({**body, "role": "student"}),
+        content_type="application/json",
+    )
+
+
+def test_public_read_uses_replica(client):
+    queries = request(client, "get", "/api/public/classes?with_total=true")
+
+    assert queries[DEFAULT_DB_ALIAS] == 0
+    assert queries[TEST_REPLICA] > 0
+    assert query_counters.stats()[TEST_REPLICA] == queries[TEST_REPLICA]
+    assert query_counters.stats()[DEFAULT_DB_ALIAS] == 0
+    assert client.get("/api/public/classes?with_total=true").json()["total"] == 2
+
+
+def test_write_uses_primary_and_pins_client(client):
+    queries = signup(client)
+
+    assert queries[TEST_REPLICA] == 0
+    assert queries[DEFAULT_DB_ALIAS] > 0
+    assert query_counters.stats()[DEFAULT_DB_ALIAS] == queries[DEFAULT_DB_ALIAS]
+    assert PIN_COOKIE in client.cookies
+
+
+def test_pinned_client_reads_primary(client):
+    client.cookies[PIN_COOKIE] = "1"
+
+    queries = request(client, "get", "/api/public/classes")
+
+    assert queries[TEST_REPLICA] == 0
+    assert queries[DEFAULT_DB_ALIAS] > 0
+
+
+def test_expired_pin_reads_replica(client):
+    signup(client)
+    del client.cookies[PIN_COOKIE]
+
+    queries = request(client, "get", "/api/public/classes")
+
+    assert queries[DEFAULT_DB_ALIAS] == 0
+    assert queries[TEST_REPLICA] > 0
@@ -0,0 +1,48 @@
+"""Cached public routes are counted under their view's name."""
+
+import pytest
+
+from shared.response_cache import response_cache
+
+CACHED_ROUTES = {
+    "get_classes",
+    "get_trending_classes",
+    "get_classes_nearby",
+    "get_classes_stats",
+    "get_class",
+    "get_class_page",
+    "get_class_stats",
+    "get_class_reviews",
+    "get_instructors",
+    "get_instructors_stats",
+    "get_instructor",
+    "get_instructor_page",
+    "get_instructor_classes",
+    "get_instructor_stats",
+    "get_locations",
+    "get_locations_nearby",
+    "get_locations_stats",
+    "get_location",
+    "get_location_page",
+    "get_location_classes",
+    "get_location_stats",
+}
+
+
+def test_routes_named_after_views(client):
+    # Registered when the URLconf loads the API
+    client.get("/api/public")
+
+    assert sorted(response_cache.routes) == sorted(CACHED_ROUTES)
+
+
+@pytest.mark.django_db
+def test_hits_and_misses_counted_per_route(client, settings):
+    settings.RESPONSE_CACHE_ENABLED = True
+    response_cache.reset_stats()
+
+    client.get("/api/public/classes")
+    client.get("/api/public/classes")
+
+    stats = {entry.route: entry for entry in response_cache.stats()}
+    assert (stats["get_classes"].hits, stats["get_classes"].misses) == (1, 1)
@@ -0,0 +1,126 @@
+"""Queries of API requests are tagged with sqlcommenter comments, and only
+with SQL_COMMENTS_ENABLED."""
+
+import re
+from contextlib import contextmanager
+from random import Random
+from typing import Dict, Iterator, List, Tuple
+from urllib.parse import unquote
+from uuid import uuid4
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from classes.management.bench_data import (
+    create_bench_classes,
+    create_bench_instructors,
+    create_bench_locations,
+)
+from shared.sql_comments import REQUEST_ID_HEADER
+
+COMMENT = re.compile(r"/\*(.*)\*/$")
+TAG = re.compile(r"(\w+)='([^']*)'")
+
+PATHS = (
+    "/api/public/classes",
+    "/api/public/classes/trending",
+    "/api/public/classes/{class_id}",
+    "/api/public/locations",
+)
+
+
+def tags(sql: str) -> Dict[str, str]:
+    """Tags of the sqlcommenter comment ending the statement"""
+    match = COMMENT.search(sql)
+    if match is None:
+        return {}
+    return {key: unquote(value) for key, value in TAG.findall(match.group(1))}
+
+
+@contextmanager
+def capture_sent_queries() -> Iterator[Tuple[CaptureQueriesContext, List[str]]]:
+    """The block's queries, and their statements as sent to the database.
+
+    The debug cursor logs a statement before the execute wrappers run, so
+    on SQLite the captured queries lack the comment; a wrapper added last
+    runs innermost and sees it.
+    """
+    sent: List[str] = []
+
+    def record(execute, sql, params, many, context):
+        # %% is what the driver turns into % when it adds the parameters
+        sent.append(sql.replace("%%", "%") if params is not None else sql)
+        return execute(sql, params, many, context)
+
+    with CaptureQueriesContext(connection) as captured:
+        with connection.execute_wrapper(record):
+            yield captured, sent
+
+
+@pytest.fixture
+def class_id(db) -> str:
+    rng = Random(42)
+    locations = create_bench_locations(1, rng)
+    instructors = create_bench_instructors(1, prefix="sql-comments")
+    (dance_class,) = create_bench_classes(locations, instructors, 1, rng)
+    return str(dance_class.id)
+
+
+@pytest.fixture(autouse=True)
+def uncached(settings):
+    # Cached responses would run no query at all
+    settings.RESPONSE_CACHE_ENABLED = False
+
+
+@pytest.mark.parametrize("path", PATHS)
+def test_queries_tagged_when_enabled(client, settings, class_id, path):
+    settings.SQL_COMMENTS_ENABLED = True
+    request_id = uuid4().hex
+
+    with capture_sent_queries() as (captured, sent):
+        response = client.get(
+            path.format(class_id=class_id), headers={REQUEST_ID_HEADER: request_id}
+        )
+
+    assert response.status_code == 200
+    assert response[REQUEST_ID_HEADER] == request_id
+    assert len(captured) > 0
+    assert len(sent) == len(captured)
+    for sql in sent:
+        tagged = tags(sql)
+        assert tagged.get("request_id") == request_id, sql
+        assert tagged.get("route", "").startswith("/api/public/"), sql
+        assert tagged.get("controller"), sql
+
+
+def test_service_method_tagged(client, settings, class_id):
+    settings.SQL_COMMENTS_ENABLED = True
+
+    with capture_sent_queries() as (_, sent):
+        client.get(f"/api/public/classes/{class_id}")
+
+    services = {tags(sql).get("service") for sql in sent}
+    assert "ClassSearchEngineService.get_class_by_id" in services
+
+
+def test_invalid_request_id_replaced(client, settings, db):
+    settings.SQL_COMMENTS_ENABLED = True
+
+    response = client.get(
+        "/api/public/classes", headers={REQUEST_ID_HEADER: "not valid */"}
+    )
+
+    assert re.fullmatch(r"[0-9a-f]{32}", response[REQUEST_ID_HEADER])
+
+
+def test_nothing_tagged_when_disabled(client, settings, class_id):
+    settings.SQL_COMMENTS_ENABLED = False
+
+    with capture_sent_queries() as (captured, sent):
+        response = client.get("/api/public/classes")
+
+    assert response.status_code == 200
+    assert not response.has_header(REQUEST_ID_HEADER)
+    assert len(captured) > 0
+    assert not [sql for sql in sent if tags(sql)]
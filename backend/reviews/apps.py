@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class ReviewsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "reviews"
+
+    def ready(self):
+        from reviews.signals import connect_rating_stats_signals
+
+        connect_rating_stats_signals()
@@ -31,3 +31,30 @@ WAITING_AREA_OPTIONS = ["indoor", "outdoor", "both"]
 # Verification Constants
 VerificationMethodType = Literal["in_person", "video", "photo"]
 VERIFICATION_METHODS = ["in_person", "video", "photo"]
+
+# Rating dimensions aggregated per reviewed entity (see reviews.models *RatingStats)
+DANCE_CLASS_RATING_DIMENSIONS = (
+    "group_size",
+    "level",
+    "engagement",
+    "teaching_pace",
+    "overall_rating",
+)
+INSTRUCTOR_RATING_DIMENSIONS = (
+    "move_breakdown",
+    "individual_approach",
+    "posture_correction_ability",
+    "communication_and_feedback",
+    "patience_and_encouragement",
+    "motivation_and_energy",
+    "overall_rating",
+)
+LOCATION_RATING_DIMENSIONS = (
+    "cleanness",
+    "general_look",
+    "acustic_quality",
+    "additional_facilities",
+    "temperature",
+    "lighting",
+    "overall_rating",
+)
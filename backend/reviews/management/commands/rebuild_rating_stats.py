@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand, CommandError
+from rich.console import Console
+from rich.table import Table
+
+from reviews.services.rating_stats import RATING_STATS_TARGETS, RatingStatsService
+
+console = Console()
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the denormalized rating stats from the review tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report stats rows that drifted from the reviews",
+        )
+        parser.add_argument("--tolerance", type=float, default=1e-6)
+
+    def handle(self, *args, **options):
+        service = RatingStatsService()
+        if options["check"]:
+            self.check_drift(service, options["tolerance"])
+            return
+
+        table = Table(
+            title="Rating stats rebuild",
+            show_header=True,
+            header_style="bold magenta",
+        )
+        table.add_column("Stats", style="cyan")
+        table.add_column("Rows", justify="right", style="green")
+        for target in RATING_STATS_TARGETS:
+            table.add_row(target.name, str(service.rebuild(target)))
+        console.print(table)
+
+    def check_drift(self, service: RatingStatsService, tolerance: float):
+        table = Table(
+            title="Rating stats drift",
+            show_header=True,
+            header_style="bold magenta",
+        )
+        table.add_column("Stats", style="cyan")
+        table.add_column("Entity")
+        table.add_column("Field")
+        table.add_column("Stored", justify="right")
+        table.add_column("Actual", justify="right")
+        drift_count = 0
+        for target in RATING_STATS_TARGETS:
+            for drift in service.find_drift(target, tolerance):
+                drift_count += 1
+                table.add_row(
+                    drift.target,
+                    drift.entity_id,
+                    drift.field,
+                    str(drift.stored),
+                    str(drift.actual),
+                )
+
+        if not drift_count:
+            console.print("[green]Rating stats match the review tables")
+            return
+        console.print(table)
+        raise CommandError(
+            f"{drift_count} rating stats values drifted, "
+            "run rebuild_rating_stats to repair them"
+        )
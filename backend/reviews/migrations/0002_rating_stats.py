@@ -0,0 +1,162 @@
+# Generated by Django 5.1.5 on 2026-10-18 11:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+# (review model, stats model, entity field, rating dimensions)
+RATING_STATS = (
+    (
+        "DanceClassReview",
+        "DanceClassRatingStats",
+        "dance_class",
+        ("group_size", "level", "engagement", "teaching_pace", "overall_rating"),
+    ),
+    (
+        "InstructorReview",
+        "InstructorRatingStats",
+        "instructor",
+        (
+            "move_breakdown",
+            "individual_approach",
+            "posture_correction_ability",
+            "communication_and_feedback",
+            "patience_and_encouragement",
+            "motivation_and_energy",
+            "overall_rating",
+        ),
+    ),
+    (
+        "LocationReview",
+        "LocationRatingStats",
+        "location",
+        (
+            "cleanness",
+            "general_look",
+            "acustic_quality",
+            "additional_facilities",
+            "temperature",
+            "lighting",
+            "overall_rating",
+        ),
+    ),
+)
+
+
+def backfill_rating_stats(apps, schema_editor):
+    for review_name, stats_name, entity_field, dimensions in RATING_STATS:
+        review_model = apps.get_model("reviews", review_name)
+        stats_model = apps.get_model("reviews", stats_name)
+        entity = f"{entity_field}_id"
+        rows = (
+            review_model.objects.values(entity)
+            .annotate(
+                review_count=Count("pk"),
+                **{f"{dimension}_sum": Sum(dimension) for dimension in dimensions},
+            )
+            .order_by()
+        )
+        stats = []
+        for row in rows:
+            row = {
+                name: value if name in (entity, "review_count") else value or 0
+                for name, value in row.items()
+            }
+            row["avg_rating"] = row["overall_rating_sum"] / row["review_count"]
+            stats.append(stats_model(**row))
+        stats_model.objects.bulk_create(stats, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0002_alter_user_phone"),
+        ("classes", "0002_location_geohash"),
+        ("reviews", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DanceClassRatingStats",
+            fields=[
+                ("review_count", models.IntegerField(default=0)),
+                ("avg_rating", models.FloatField(blank=True, db_index=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "dance_class",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="rating_stats",
+                        serialize=False,
+                        to="classes.danceclass",
+                    ),
+                ),
+                ("group_size_sum", models.FloatField(default=0)),
+                ("level_sum", models.FloatField(default=0)),
+                ("engagement_sum", models.FloatField(default=0)),
+                ("teaching_pace_sum", models.FloatField(default=0)),
+                ("overall_rating_sum", models.FloatField(default=0)),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="InstructorRatingStats",
+            fields=[
+                ("review_count", models.IntegerField(default=0)),
+                ("avg_rating", models.FloatField(blank=True, db_index=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "instructor",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="rating_stats",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("move_breakdown_sum", models.FloatField(default=0)),
+                ("individual_approach_sum", models.FloatField(default=0)),
+                ("posture_correction_ability_sum", models.FloatField(default=0)),
+                ("communication_and_feedback_sum", models.FloatField(default=0)),
+                ("patience_and_encouragement_sum", models.FloatField(default=0)),
+                ("motivation_and_energy_sum", models.FloatField(default=0)),
+                ("overall_rating_sum", models.FloatField(default=0)),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="LocationRatingStats",
+            fields=[
+                ("review_count", models.IntegerField(default=0)),
+                ("avg_rating", models.FloatField(blank=True, db_index=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "location",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="rating_stats",
+                        serialize=False,
+                        to="classes.location",
+                    ),
+                ),
+                ("cleanness_sum", models.FloatField(default=0)),
+                ("general_look_sum", models.FloatField(default=0)),
+                ("acustic_quality_sum", models.FloatField(default=0)),
+                ("additional_facilities_sum", models.FloatField(default=0)),
+                ("temperature_sum", models.FloatField(default=0)),
+                ("lighting_sum", models.FloatField(default=0)),
+                ("overall_rating_sum", models.FloatField(default=0)),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        migrations.RunPython(backfill_rating_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.5 on 2026-10-18 12:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("classes", "0005_hot_query_indexes"),
+        ("reviews", "0002_rating_stats"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="danceclassreview",
+            name="dance_class",
+            field=models.ForeignKey(
+                db_index=False,
+                help_text="The dance class being reviewed",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="reviews",
+                to="classes.danceclass",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="danceclassreview",
+            index=models.Index(
+                fields=["dance_class", "created_at"], name="class_review_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="danceclassreview",
+            index=models.Index(
+                fields=["dance_class", "overall_rating", "created_at"],
+                name="class_review_rating_idx",
+            ),
+        ),
+    ]
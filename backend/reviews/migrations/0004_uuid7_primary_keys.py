@@ -0,0 +1,49 @@
+# Generated by Django 5.1.5 on 2026-10-18 12:21
+
+import mydanceclub.models
+from mydanceclub.migration_ops import NormalizeUUIDKeys
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reviews", "0003_hot_query_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="danceclassreview",
+            name="id",
+            field=models.UUIDField(
+                default=mydanceclub.models.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="instructorreview",
+            name="id",
+            field=models.UUIDField(
+                default=mydanceclub.models.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="locationreview",
+            name="id",
+            field=models.UUIDField(
+                default=mydanceclub.models.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        NormalizeUUIDKeys(
+            "reviews.DanceClassReview",
+            "reviews.InstructorReview",
+            "reviews.LocationReview",
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.5 on 2026-10-18 13:19
+
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+# (stats model, reviewed app and model)
+RATED_ENTITIES = (
+    ("DanceClassRatingStats", "classes", "DanceClass"),
+    ("InstructorRatingStats", "accounts", "User"),
+    ("LocationRatingStats", "classes", "Location"),
+)
+
+
+def backfill_listing_rating(apps, schema_editor):
+    for stats_name, app_label, entity_name in RATED_ENTITIES:
+        stats_model = apps.get_model("reviews", stats_name)
+        entity_model = apps.get_model(app_label, entity_name)
+        avg_rating = stats_model.objects.filter(pk=OuterRef("pk")).values("avg_rating")
+        entity_model.objects.filter(pk__in=stats_model.objects.values("pk")).update(
+            rating=Coalesce(Subquery(avg_rating), 0.0)
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0004_listing_rating"),
+        ("classes", "0007_listing_rating"),
+        ("reviews", "0004_uuid7_primary_keys"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_listing_rating, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,14 @@
+from typing import Optional
 from accounts.models import User
 from classes.models import DanceClass, Location
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
 from mydanceclub.models import BaseModel
+from .constants import (
+    DANCE_CLASS_RATING_DIMENSIONS,
+    INSTRUCTOR_RATING_DIMENSIONS,
+    LOCATION_RATING_DIMENSIONS,
+)
 from .schemas.response import (
     ReviewDanceClassStatsSchema,
     ReviewInstructorStatsSchema,
@@ -10,7 +16,22 @@ from .schemas.response import (
 )
 
 
-class DanceClassReview(BaseModel):
+class RatedReviewModel(BaseModel):
+    """Review whose ratings feed the reviewed entity's *RatingStats row.
+
+    Saving runs in a transaction so the rating stats signal handlers (see
+    reviews.signals) commit or roll back together with the review itself.
+    """
+
+    class Meta(BaseModel.Meta):
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
+
+
+class DanceClassReview(RatedReviewModel):
     user = models.ForeignKey(
         User,
         on_delete=models.SET_NULL,
@@ -33,11 +54,13 @@ class DanceClassReview(BaseModel):
 
     # ------------------------------------------
 
+    # Indexed by the (dance_class, ...) indexes in Meta
     dance_class = models.ForeignKey(
         DanceClass,
         on_delete=models.CASCADE,
         related_name="reviews",
         help_text="The dance class being reviewed",
+        db_index=False,
     )
 
     group_size = models.FloatField(
@@ -65,6 +88,18 @@ class DanceClassReview(BaseModel):
         help_text="General comments and observations about the dance class experience"
     )
 
+    class Meta(RatedReviewModel.Meta):
+        indexes = [
+            # Keyset pages of a class's reviews, by date or by rating
+            models.Index(
+                fields=["dance_class", "created_at"], name="class_review_created_idx"
+            ),
+            models.Index(
+                fields=["dance_class", "overall_rating", "created_at"],
+                name="class_review_rating_idx",
+            ),
+        ]
+
     def get_author_name(self) -> str:
         if self.user:
             return self.user.first_name + " " + self.user.last_name
@@ -85,7 +120,7 @@ class DanceClassReview(BaseModel):
         )
 
 
-class InstructorReview(BaseModel):
+class InstructorReview(RatedReviewModel):
     user = models.ForeignKey(
         User,
         on_delete=models.SET_NULL,
@@ -169,7 +204,7 @@ class InstructorReview(BaseModel):
         )
 
 
-class LocationReview(BaseModel):
+class LocationReview(RatedReviewModel):
     user = models.ForeignKey(
         User,
         on_delete=models.SET_NULL,
@@ -250,3 +285,78 @@ class LocationReview(BaseModel):
             lighting=self.lighting,
             avg_rating=self.overall_rating,
         )
+
+
+class RatingStats(models.Model):
+    """Running rating aggregates of one reviewed entity.
+
+    Holds the review count, the sum of every rating dimension and the
+    overall average, kept up to date by reviews.signals on every review
+    write so list pages can filter and sort on an indexed column.
+    """
+
+    DIMENSIONS: tuple = ()
+
+    review_count = models.IntegerField(default=0)
+    avg_rating = models.FloatField(null=True, blank=True, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        abstract = True
+
+    def get_average(self, dimension: str) -> Optional[float]:
+        if not self.review_count:
+            return None
+        return getattr(self, f"{dimension}_sum") / self.review_count
+
+
+class DanceClassRatingStats(RatingStats):
+    DIMENSIONS = DANCE_CLASS_RATING_DIMENSIONS
+
+    dance_class = models.OneToOneField(
+        DanceClass,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="rating_stats",
+    )
+    group_size_sum = models.FloatField(default=0)
+    level_sum = models.FloatField(default=0)
+    engagement_sum = models.FloatField(default=0)
+    teaching_pace_sum = models.FloatField(default=0)
+    overall_rating_sum = models.FloatField(default=0)
+
+
+class InstructorRatingStats(RatingStats):
+    DIMENSIONS = INSTRUCTOR_RATING_DIMENSIONS
+
+    instructor = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="rating_stats",
+    )
+    move_breakdown_sum = models.FloatField(default=0)
+    individual_approach_sum = models.FloatField(default=0)
+    posture_correction_ability_sum = models.FloatField(default=0)
+    communication_and_feedback_sum = models.FloatField(default=0)
+    patience_and_encouragement_sum = models.FloatField(default=0)
+    motivation_and_energy_sum = models.FloatField(default=0)
+    overall_rating_sum = models.FloatField(default=0)
+
+
+class LocationRatingStats(RatingStats):
+    DIMENSIONS = LOCATION_RATING_DIMENSIONS
+
+    location = models.OneToOneField(
+        Location,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="rating_stats",
+    )
+    cleanness_sum = models.FloatField(default=0)
+    general_look_sum = models.FloatField(default=0)
+    acustic_quality_sum = models.FloatField(default=0)
+    additional_facilities_sum = models.FloatField(default=0)
+    temperature_sum = models.FloatField(default=0)
+    lighting_sum = models.FloatField(default=0)
+    overall_rating_sum = models.FloatField(default=0)
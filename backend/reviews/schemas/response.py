@@ -1,10 +1,11 @@
 from datetime import datetime
-from typing import List
+from typing import Dict, Optional
+from uuid import UUID
 from ninja import Schema
 
 
 class BaseReviewSchema(Schema):
-    id: str
+    id: UUID
     author_name: str
     comment: str
     created_at: datetime
@@ -33,6 +34,22 @@ class BaseReviewSchema(Schema):
             return "just now"
 
 
+class ReviewDimensionStatsSchema(Schema):
+    """Distribution of one rating dimension over an entity's reviews"""
+
+    avg: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    stddev: Optional[float] = None
+
+
+class ReviewDistributionSchema(Schema):
+    """Review count and per-dimension distribution, keyed by rating field"""
+
+    review_count: int = 0
+    dimensions: Dict[str, ReviewDimensionStatsSchema] = {}
+
+
 class ReviewAggregatedLocationStatsSchema(Schema):
     cleanness: float
     general_look: float
@@ -47,6 +64,12 @@ class ReviewLocationStatsSchema(BaseReviewSchema, ReviewAggregatedLocationStatsS
     pass
 
 
+class ReviewDetailedLocationStatsSchema(
+    ReviewAggregatedLocationStatsSchema, ReviewDistributionSchema
+):
+    pass
+
+
 class ReviewAggregatedDanceClassStatsSchema(Schema):
     group_size: float
     level: float
@@ -61,6 +84,12 @@ class ReviewDanceClassStatsSchema(
     pass
 
 
+class ReviewDetailedDanceClassStatsSchema(
+    ReviewAggregatedDanceClassStatsSchema, ReviewDistributionSchema
+):
+    pass
+
+
 class ReviewAggregatedInstructorStatsSchema(Schema):
     move_breakdown: float
     individual_approach: float
@@ -77,13 +106,7 @@ class ReviewInstructorStatsSchema(
     pass
 
 
-# ------------------------------------------------------------
-
-
-class ReviewListSchema[T](Schema):
-    items: List[T]
-    total: int
-    page: int
-    pages: int
-    has_next: bool
-    has_prev: bool
+class ReviewDetailedInstructorStatsSchema(
+    ReviewAggregatedInstructorStatsSchema, ReviewDistributionSchema
+):
+    pass
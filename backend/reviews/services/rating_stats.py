@@ -0,0 +1,293 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Type, cast
+from django.db import models, transaction
+from django.db.models import (
+    Case,
+    Count,
+    ExpressionWrapper,
+    F,
+    FloatField,
+    OuterRef,
+    Subquery,
+    Sum,
+    When,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from reviews.models import (
+    DanceClassRatingStats,
+    DanceClassReview,
+    InstructorRatingStats,
+    InstructorReview,
+    LocationRatingStats,
+    LocationReview,
+    RatingStats,
+)
+from shared.response_cache import REVIEWS, response_cache
+
+RatingSnapshot = Dict[str, Any]
+
+
+@dataclass(frozen=True)
+class RatingStatsTarget:
+    """Links a review model to the stats model aggregating its ratings"""
+
+    review_model: Type[models.Model]
+    stats_model: Type[RatingStats]
+    entity_field: str
+
+    @property
+    def name(self) -> str:
+        return self.stats_model.__name__
+
+    @property
+    def entity_attname(self) -> str:
+        return f"{self.entity_field}_id"
+
+    @property
+    def dimensions(self) -> Tuple[str, ...]:
+        return self.stats_model.DIMENSIONS
+
+    @property
+    def entity_model(self) -> Type[models.Model]:
+        """The reviewed model, whose rating column mirrors avg_rating"""
+        field = self.review_model._meta.get_field(self.entity_field)
+        return cast(Type[models.Model], field.related_model)
+
+
+RATING_STATS_TARGETS = (
+    RatingStatsTarget(DanceClassReview, DanceClassRatingStats, "dance_class"),
+    RatingStatsTarget(InstructorReview, InstructorRatingStats, "instructor"),
+    RatingStatsTarget(LocationReview, LocationRatingStats, "location"),
+)
+
+
+def get_rating_stats_target(review_model: Type[models.Model]) -> RatingStatsTarget:
+    for target in RATING_STATS_TARGETS:
+        if target.review_model is review_model:
+            return target
+    raise ValueError(f"{review_model.__name__} has no rating stats")
+
+
+@dataclass
+class RatingStatsDrift:
+    target: str
+    entity_id: str
+    field: str
+    stored: Optional[float]
+    actual: Optional[float]
+
+
+class RatingStatsService:
+    """Maintains the denormalized *RatingStats rows.
+
+    Review writes apply a delta (count and per-dimension sums) to the stats
+    row of the reviewed entity; rebuild() and find_drift() recompute the
+    aggregates from the review tables for repairs and consistency checks.
+    The average is also copied to the entity's own non-null rating column
+    (0 when unreviewed), which the listings sort on through an index.
+    """
+
+    def snapshot(
+        self, target: RatingStatsTarget, review: models.Model
+    ) -> RatingSnapshot:
+        snapshot = {target.entity_attname: getattr(review, target.entity_attname)}
+        for dimension in target.dimensions:
+            snapshot[dimension] = float(getattr(review, dimension))
+        return snapshot
+
+    def load_snapshot(
+        self, target: RatingStatsTarget, review_id: str
+    ) -> Optional[RatingSnapshot]:
+        """Read the stored ratings of a review, locking its row until commit"""
+        return (
+            target.review_model._default_manager.select_for_update()
+            .filter(pk=review_id)
+            .values(target.entity_attname, *target.dimensions)
+            .first()
+        )
+
+    def apply_change(
+        self,
+        target: RatingStatsTarget,
+        previous: Optional[RatingSnapshot],
+        current: Optional[RatingSnapshot],
+    ) -> None:
+        """Apply a review write to the stats rows.
+
+        `previous` is the review before the write (None when created) and
+        `current` the review after it (None when deleted).
+        """
+        entity = target.entity_attname
+        with transaction.atomic():
+            if previous and current and previous[entity] == current[entity]:
+                deltas = {
+                    dimension: current[dimension] - previous[dimension]
+                    for dimension in target.dimensions
+                }
+                self._add(target, current[entity], 0, deltas)
+                return
+            if previous:
+                deltas = {
+                    dimension: -previous[dimension] for dimension in target.dimensions
+                }
+                self._add(target, previous[entity], -1, deltas)
+            if current:
+                deltas = {
+                    dimension: current[dimension] for dimension in target.dimensions
+                }
+                self._add(target, current[entity], 1, deltas)
+
+    def _add(
+        self,
+        target: RatingStatsTarget,
+        entity_id: Optional[str],
+        count_delta: int,
+        deltas: Dict[str, float],
+    ) -> None:
+        if entity_id is None:
+            return
+        manager = target.stats_model._default_manager
+        # Removals never create rows: the entity may be in the middle of a
+        # cascading delete
+        if count_delta >= 0:
+            # get_or_create() inserts in a savepoint and reads the row back
+            # if a concurrent first review inserted it, so only one insert
+            # wins and the other write applies its delta below
+            _, created = manager.get_or_create(pk=entity_id)
+            if created:
+                # Filled from the reviews, which already include this write
+                self.rebuild_entity(target, entity_id)
+                return
+        review_count = F("review_count") + count_delta
+        overall_sum = F("overall_rating_sum") + deltas["overall_rating"]
+        updates: Dict[str, Any] = {
+            f"{dimension}_sum": F(f"{dimension}_sum") + delta
+            for dimension, delta in deltas.items()
+        }
+        updates["review_count"] = review_count
+        updates["avg_rating"] = Case(
+            When(
+                review_count__gt=-count_delta,
+                then=ExpressionWrapper(
+                    overall_sum / review_count, output_field=FloatField()
+                ),
+            ),
+            default=None,
+            output_field=FloatField(),
+        )
+        updates["updated_at"] = timezone.now()
+        manager.filter(pk=entity_id).update(**updates)
+        self._sync_ratings(target, entity_id)
+
+    def _sync_ratings(
+        self, target: RatingStatsTarget, entity_id: Optional[str] = None
+    ) -> None:
+        """Copy avg_rating to the rating column of one or every entity"""
+        avg_rating = target.stats_model._default_manager.filter(
+            pk=OuterRef("pk")
+        ).values("avg_rating")
+        entities = target.entity_model._default_manager.all()
+        if entity_id is not None:
+            entities = entities.filter(pk=entity_id)
+        # update() sends no signals, so no entity cache namespace is bumped
+        entities.update(rating=Coalesce(Subquery(avg_rating), 0.0))
+
+    def compute(
+        self, target: RatingStatsTarget, entity_id: Optional[str] = None
+    ) -> Dict[str, RatingStats]:
+        """Aggregate the review table into unsaved stats rows by entity id"""
+        reviews = target.review_model._default_manager.all()
+        if entity_id is not None:
+            reviews = reviews.filter(**{target.entity_attname: entity_id})
+        rows = (
+            reviews.values(target.entity_attname)
+            .annotate(
+                review_count=Count("pk"),
+                **{
+                    f"{dimension}_sum": Sum(dimension)
+                    for dimension in target.dimensions
+                },
+            )
+            .order_by()
+        )
+        stats = {}
+        for row in rows:
+            entity = row.pop(target.entity_attname)
+            review_count = row.pop("review_count")
+            sums = {name: float(value or 0) for name, value in row.items()}
+            stats[entity] = target.stats_model(
+                **{target.entity_attname: entity},
+                **sums,
+                review_count=review_count,
+                avg_rating=sums["overall_rating_sum"] / review_count,
+            )
+        return stats
+
+    def rebuild_entity(self, target: RatingStatsTarget, entity_id: str) -> None:
+        stats = self.compute(target, entity_id).get(entity_id)
+        manager = target.stats_model._default_manager
+        if stats is None:
+            manager.filter(pk=entity_id).delete()
+        else:
+            stats.save()
+        self._sync_ratings(target, entity_id)
+
+    def rebuild(self, target: RatingStatsTarget) -> int:
+        """Recompute every stats row of a target from scratch"""
+        with transaction.atomic():
+            stats = self.compute(target)
+            target.stats_model._default_manager.all().delete()
+            target.stats_model._default_manager.bulk_create(
+                stats.values(), batch_size=1000
+            )
+            self._sync_ratings(target)
+            # bulk_create sends no signals
+            response_cache.bump(REVIEWS)
+        return len(stats)
+
+    def find_drift(
+        self, target: RatingStatsTarget, tolerance: float = 1e-6
+    ) -> List[RatingStatsDrift]:
+        """Compare stored stats rows and entity ratings with the reviews"""
+        fields = [
+            "review_count",
+            "avg_rating",
+            *[f"{dimension}_sum" for dimension in target.dimensions],
+        ]
+        actual = self.compute(target)
+        stored = {row.pk: row for row in target.stats_model._default_manager.all()}
+        drift = []
+        for entity_id in sorted(actual.keys() | stored.keys()):
+            for field in fields:
+                stored_value = getattr(stored.get(entity_id), field, None)
+                actual_value = getattr(actual.get(entity_id), field, None)
+                if entity_id not in actual and field != "avg_rating":
+                    # Entities whose reviews are all gone keep a zeroed row
+                    actual_value = 0
+                if not _close(stored_value, actual_value, tolerance):
+                    drift.append(
+                        RatingStatsDrift(
+                            target.name, entity_id, field, stored_value, actual_value
+                        )
+                    )
+        ratings = target.entity_model._default_manager.values_list("pk", "rating")
+        for entity_id, rating in ratings:
+            average = getattr(actual.get(entity_id), "avg_rating", None) or 0.0
+            if not _close(rating, average, tolerance):
+                drift.append(
+                    RatingStatsDrift(
+                        target.entity_model.__name__,
+                        entity_id,
+                        "rating",
+                        rating,
+                        average,
+                    )
+                )
+        return drift
+
+
+def _close(stored: Optional[float], actual: Optional[float], tolerance: float) -> bool:
+    if stored is None or actual is None:
+        return stored == actual
+    return abs(stored - actual) <= tolerance * max(1.0, abs(actual))
@@ -1,44 +1,44 @@
 from typing import Optional
+from django.db.models import QuerySet
 from reviews.models import DanceClassReview
-from reviews.schemas.response import ReviewDanceClassStatsSchema, ReviewListSchema
+from reviews.schemas.response import ReviewDanceClassStatsSchema
+from shared.async_twin import async_twin
+from shared.metrics import instrumented
+from shared.pagination import DEFAULT_PAGE_SIZE, CursorPageSchema, KeysetPaginator
 
+# Keyset orderings of a class's reviews by sort_by, newest first by default.
+# Every key runs in one direction, so class_review_created_idx and
+# class_review_rating_idx serve them forwards or backwards
+REVIEW_PAGINATORS = {
+    "date_desc": KeysetPaginator("-created_at"),
+    "date_asc": KeysetPaginator("created_at"),
+    "rating_desc": KeysetPaginator("-overall_rating", "-created_at"),
+    "rating_asc": KeysetPaginator("overall_rating", "created_at"),
+}
 
+
+@instrumented
 class ReviewManagerService:
     def get_class_reviews_paginated(
         self,
         class_id: str,
-        page: int = 1,
-        page_size: int = 10,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
         sort_by: Optional[str] = None,
-    ) -> ReviewListSchema:
-        """Get paginated reviews for a class with enhanced filters"""
-        queryset = DanceClassReview.objects.filter(dance_class_id=class_id)
+        with_total: bool = False,
+    ) -> CursorPageSchema[ReviewDanceClassStatsSchema]:
+        """Get a page of reviews for a class with enhanced filters"""
+        queryset = self.class_reviews(class_id)
 
         # Apply sorting
-        if sort_by:
-            if sort_by == "date_desc":
-                queryset = queryset.order_by("-created_at")
-            elif sort_by == "date_asc":
-                queryset = queryset.order_by("created_at")
-            elif sort_by == "rating_desc":
-                queryset = queryset.order_by("-overall_rating")
-            elif sort_by == "rating_asc":
-                queryset = queryset.order_by("overall_rating")
-
-        # Calculate pagination
-        total = queryset.count()
-        total_pages = (total + page_size - 1) // page_size
-        start = (page - 1) * page_size
-        end = start + page_size
+        paginator = REVIEW_PAGINATORS.get(sort_by or "", REVIEW_PAGINATORS["date_desc"])
+        page = paginator.paginate(queryset, cursor, limit, with_total)
+        return page.to_schema([review.to_schema() for review in page.items])
 
-        reviews = list(queryset[start:end])
-        response_items = [review.to_schema() for review in reviews]
+    aget_class_reviews_paginated = async_twin(get_class_reviews_paginated)
 
-        return ReviewListSchema[ReviewDanceClassStatsSchema](
-            items=response_items,
-            total=total,
-            page=page,
-            pages=total_pages,
-            has_next=page < total_pages,
-            has_prev=page > 1,
+    def class_reviews(self, class_id: str) -> QuerySet[DanceClassReview]:
+        """Reviews of a class, ready for serialization but unsorted"""
+        return DanceClassReview.objects.filter(dance_class_id=class_id).select_related(
+            "user"
         )
@@ -1,103 +1,222 @@
-from django.db.models import Avg
-from reviews.models import InstructorReview, DanceClassReview, LocationReview
+from typing import Any, Dict, Iterable, List, Tuple, Type
+from django.db.models import (
+    Aggregate,
+    Avg,
+    Count,
+    Max,
+    Min,
+    Model,
+    QuerySet,
+    StdDev,
+)
+from reviews.constants import (
+    DANCE_CLASS_RATING_DIMENSIONS,
+    INSTRUCTOR_RATING_DIMENSIONS,
+    LOCATION_RATING_DIMENSIONS,
+)
+from reviews.models import (
+    DanceClassRatingStats,
+    DanceClassReview,
+    InstructorRatingStats,
+    InstructorReview,
+    LocationRatingStats,
+    LocationReview,
+    RatingStats,
+)
 from reviews.schemas.response import (
-    ReviewAggregatedDanceClassStatsSchema,
-    ReviewAggregatedInstructorStatsSchema,
-    ReviewAggregatedLocationStatsSchema,
+    ReviewDetailedDanceClassStatsSchema,
+    ReviewDetailedInstructorStatsSchema,
+    ReviewDetailedLocationStatsSchema,
+    ReviewDimensionStatsSchema,
+    ReviewDistributionSchema,
 )
+from shared.async_twin import async_twin
+from shared.metrics import instrumented
 
+# Aggregates computed for every rating dimension, by schema field
+DIMENSION_AGGREGATES = {"avg": Avg, "min": Min, "max": Max, "stddev": StdDev}
+# Most entities a batch stats request may ask for
+MAX_STATS_BATCH_SIZE = 100
 
+
+@instrumented
 class ReviewStatsService:
-    def get_location_stats(
-        self, location_id: str
-    ) -> ReviewAggregatedLocationStatsSchema:
-        location_reviews = LocationReview.objects.filter(location_id=location_id)
-        return ReviewAggregatedLocationStatsSchema(
-            cleanness=location_reviews.aggregate(Avg("cleanness"))["cleanness__avg"]
-            or 0.0,
-            general_look=location_reviews.aggregate(Avg("general_look"))[
-                "general_look__avg"
-            ]
-            or 0.0,
-            acustic_quality=location_reviews.aggregate(Avg("acustic_quality"))[
-                "acustic_quality__avg"
-            ]
-            or 0.0,
-            additional_facilities=location_reviews.aggregate(
-                Avg("additional_facilities")
-            )["additional_facilities__avg"]
-            or 0.0,
-            temperature=location_reviews.aggregate(Avg("temperature"))[
-                "temperature__avg"
-            ]
-            or 0.0,
-            lighting=location_reviews.aggregate(Avg("lighting"))["lighting__avg"]
-            or 0.0,
-            avg_rating=location_reviews.aggregate(Avg("overall_rating"))[
-                "overall_rating__avg"
-            ]
-            or 0.0,
-        )
+    """Review statistics with every rating dimension aggregated in one query.
+
+    The single-entity getters run one aggregate() over the entity's reviews;
+    the batch getters run one grouped query for a whole list of entities.
+    Every getter has an async twin prefixed with "a" for async routes.
+    """
+
+    def get_location_stats(self, location_id: str) -> ReviewDetailedLocationStatsSchema:
+        return self.get_locations_stats([location_id])[location_id]
+
+    aget_location_stats = async_twin(get_location_stats)
 
     def get_dance_class_stats(
         self, dance_class_id: str
-    ) -> ReviewAggregatedDanceClassStatsSchema:
-        dance_class_reviews = DanceClassReview.objects.filter(
-            dance_class_id=dance_class_id
-        )
-        return ReviewAggregatedDanceClassStatsSchema(
-            group_size=dance_class_reviews.aggregate(Avg("group_size"))[
-                "group_size__avg"
-            ]
-            or 0.0,
-            level=dance_class_reviews.aggregate(Avg("level"))["level__avg"] or 0.0,
-            engagement=dance_class_reviews.aggregate(Avg("engagement"))[
-                "engagement__avg"
-            ]
-            or 0.0,
-            teaching_pace=dance_class_reviews.aggregate(Avg("teaching_pace"))[
-                "teaching_pace__avg"
-            ]
-            or 0.0,
-            avg_rating=dance_class_reviews.aggregate(Avg("overall_rating"))[
-                "overall_rating__avg"
-            ]
-            or 0.0,
-        )
+    ) -> ReviewDetailedDanceClassStatsSchema:
+        return self.get_dance_classes_stats([dance_class_id])[dance_class_id]
+
+    aget_dance_class_stats = async_twin(get_dance_class_stats)
 
     def get_instructor_stats(
         self, instructor_id: str
-    ) -> ReviewAggregatedInstructorStatsSchema:
-        instructor_reviews = InstructorReview.objects.filter(
-            instructor_id=instructor_id
+    ) -> ReviewDetailedInstructorStatsSchema:
+        return self.get_instructors_stats([instructor_id])[instructor_id]
+
+    aget_instructor_stats = async_twin(get_instructor_stats)
+
+    def get_locations_stats(
+        self, location_ids: Iterable[str]
+    ) -> Dict[str, ReviewDetailedLocationStatsSchema]:
+        return self._get_stats(
+            LocationReview,
+            "location_id",
+            location_ids,
+            LOCATION_RATING_DIMENSIONS,
+            ReviewDetailedLocationStatsSchema,
+        )
+
+    aget_locations_stats = async_twin(get_locations_stats)
+
+    def get_dance_classes_stats(
+        self, dance_class_ids: Iterable[str]
+    ) -> Dict[str, ReviewDetailedDanceClassStatsSchema]:
+        return self._get_stats(
+            DanceClassReview,
+            "dance_class_id",
+            dance_class_ids,
+            DANCE_CLASS_RATING_DIMENSIONS,
+            ReviewDetailedDanceClassStatsSchema,
+        )
+
+    aget_dance_classes_stats = async_twin(get_dance_classes_stats)
+
+    def get_instructors_stats(
+        self, instructor_ids: Iterable[str]
+    ) -> Dict[str, ReviewDetailedInstructorStatsSchema]:
+        return self._get_stats(
+            InstructorReview,
+            "instructor_id",
+            instructor_ids,
+            INSTRUCTOR_RATING_DIMENSIONS,
+            ReviewDetailedInstructorStatsSchema,
         )
-        return ReviewAggregatedInstructorStatsSchema(
-            move_breakdown=instructor_reviews.aggregate(Avg("move_breakdown"))[
-                "move_breakdown__avg"
-            ]
-            or 0.0,
-            individual_approach=instructor_reviews.aggregate(
-                Avg("individual_approach")
-            )["individual_approach__avg"]
-            or 0.0,
-            posture_correction_ability=instructor_reviews.aggregate(
-                Avg("posture_correction_ability")
-            )["posture_correction_ability__avg"]
-            or 0.0,
-            communication_and_feedback=instructor_reviews.aggregate(
-                Avg("communication_and_feedback")
-            )["communication_and_feedback__avg"]
-            or 0.0,
-            patience_and_encouragement=instructor_reviews.aggregate(
-                Avg("patience_and_encouragement")
-            )["patience_and_encouragement__avg"]
-            or 0.0,
-            motivation_and_energy=instructor_reviews.aggregate(
-                Avg("motivation_and_energy")
-            )["motivation_and_energy__avg"]
-            or 0.0,
-            avg_rating=instructor_reviews.aggregate(Avg("overall_rating"))[
-                "overall_rating__avg"
-            ]
-            or 0.0,
+
+    aget_instructors_stats = async_twin(get_instructors_stats)
+
+    def get_location_stats_version(self, location_id: str) -> tuple:
+        return self._get_version(LocationRatingStats, location_id)
+
+    aget_location_stats_version = async_twin(get_location_stats_version)
+
+    def get_dance_class_stats_version(self, class_id: str) -> tuple:
+        return self._get_version(DanceClassRatingStats, class_id)
+
+    aget_dance_class_stats_version = async_twin(get_dance_class_stats_version)
+
+    def get_instructor_stats_version(self, instructor_id: str) -> tuple:
+        return self._get_version(InstructorRatingStats, instructor_id)
+
+    aget_instructor_stats_version = async_twin(get_instructor_stats_version)
+
+    def _get_version(self, stats_model: Type[RatingStats], entity_id: str) -> tuple:
+        """Fingerprint of an entity's reviews, read from its rating stats row.
+
+        Every review write updates the row (see reviews.signals), so its
+        review count and updated_at change whenever the stats can.
+        """
+        row = self._version_row(stats_model, entity_id).first()
+        return (entity_id, row)
+
+    def _version_row(self, stats_model: Type[RatingStats], entity_id: str):
+        return stats_model._default_manager.filter(pk=entity_id).values_list(
+            "review_count", "updated_at"
+        )
+
+    def _get_stats[T: ReviewDistributionSchema](
+        self,
+        review_model: Type[Model],
+        entity_field: str,
+        entity_ids: Iterable[str],
+        dimensions: tuple,
+        schema: Type[T],
+    ) -> Dict[str, T]:
+        """Aggregate the reviews of each entity, keyed by entity id.
+
+        A single id runs a plain aggregate(), several ids one GROUP BY query.
+        Entities without reviews get zeroed averages.
+        """
+        entity_ids = list(dict.fromkeys(entity_ids))
+        reviews, aggregates = self._stats_query(
+            review_model, entity_field, entity_ids, dimensions
+        )
+        if len(entity_ids) == 1:
+            rows = {entity_ids[0]: reviews.aggregate(**aggregates)}
+        else:
+            rows = {
+                row.pop(entity_field): row
+                for row in reviews.values(entity_field)
+                .annotate(**aggregates)
+                .order_by()
+            }
+        return self._to_schemas(schema, dimensions, entity_ids, rows)
+
+    def _stats_query(
+        self,
+        review_model: Type[Model],
+        entity_field: str,
+        entity_ids: List[str],
+        dimensions: tuple,
+    ) -> Tuple[QuerySet, Dict[str, Aggregate]]:
+        aggregates: Dict[str, Aggregate] = {"review_count": Count("pk")}
+        for dimension in dimensions:
+            for name, aggregate in DIMENSION_AGGREGATES.items():
+                aggregates[f"{dimension}__{name}"] = aggregate(dimension)
+
+        reviews = review_model._default_manager.filter(
+            **{f"{entity_field}__in": entity_ids}
+        )
+        return reviews, aggregates
+
+    def _to_schemas[T: ReviewDistributionSchema](
+        self,
+        schema: Type[T],
+        dimensions: tuple,
+        entity_ids: List[str],
+        rows: Dict[Any, dict],
+    ) -> Dict[str, T]:
+        # GROUP BY returns UUID keys while ids may come in as strings
+        found = {str(entity_id): row for entity_id, row in rows.items()}
+        # Entities without reviews get zeroed averages
+        return {
+            entity_id: self._to_schema(
+                schema, dimensions, found.get(str(entity_id), {})
+            )
+            for entity_id in entity_ids
+        }
+
+    def _to_schema[T: ReviewDistributionSchema](
+        self, schema: Type[T], dimensions: tuple, row: dict
+    ) -> T:
+        distribution = {
+            dimension: ReviewDimensionStatsSchema(
+                **{
+                    name: row.get(f"{dimension}__{name}")
+                    for name in DIMENSION_AGGREGATES
+                }
+            )
+            for dimension in dimensions
+        }
+        averages = {
+            "avg_rating" if dimension == "overall_rating" else dimension: (
+                stats.avg or 0.0
+            )
+            for dimension, stats in distribution.items()
+        }
+        return schema(
+            **averages,
+            review_count=row.get("review_count") or 0,
+            dimensions=distribution,
         )
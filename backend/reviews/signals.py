@@ -0,0 +1,49 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from reviews.services.rating_stats import (
+    RATING_STATS_TARGETS,
+    RatingStatsService,
+    get_rating_stats_target,
+)
+
+rating_stats_service = RatingStatsService()
+
+
+def capture_previous_ratings(sender, instance, raw=False, **kwargs):
+    previous = None
+    if not raw and not instance._state.adding:
+        previous = rating_stats_service.load_snapshot(
+            get_rating_stats_target(sender), instance.pk
+        )
+    setattr(instance, "_previous_ratings", previous)
+
+
+def apply_saved_ratings(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    target = get_rating_stats_target(sender)
+    rating_stats_service.apply_change(
+        target,
+        getattr(instance, "_previous_ratings", None),
+        rating_stats_service.snapshot(target, instance),
+    )
+
+
+def apply_deleted_ratings(sender, instance, **kwargs):
+    target = get_rating_stats_target(sender)
+    rating_stats_service.apply_change(
+        target, rating_stats_service.snapshot(target, instance), None
+    )
+
+
+def connect_rating_stats_signals():
+    for target in RATING_STATS_TARGETS:
+        uid = f"rating_stats_{target.name}"
+        pre_save.connect(
+            capture_previous_ratings, sender=target.review_model, dispatch_uid=uid
+        )
+        post_save.connect(
+            apply_saved_ratings, sender=target.review_model, dispatch_uid=uid
+        )
+        post_delete.connect(
+            apply_deleted_ratings, sender=target.review_model, dispatch_uid=uid
+        )
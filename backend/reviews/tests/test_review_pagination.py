@@ -0,0 +1,54 @@
+from random import Random
+
+import pytest
+from django.utils import timezone
+
+from classes.management.bench_data import (
+    create_bench_class_reviews,
+    create_bench_classes,
+    create_bench_instructors,
+    create_bench_locations,
+)
+from reviews.models import DanceClassReview
+from reviews.services.review_manager import REVIEW_PAGINATORS, ReviewManagerService
+
+
+@pytest.fixture
+def class_id(db) -> str:
+    rng = Random(3)
+    locations = create_bench_locations(1, rng)
+    instructors = create_bench_instructors(1, prefix="review-pages")
+    (dance_class,) = create_bench_classes(locations, instructors, 1, rng)
+    create_bench_class_reviews([dance_class], 9, rng)
+    # One timestamp for every review, so only the pk breaks ties
+    DanceClassReview.objects.update(created_at=timezone.now())
+    return str(dance_class.id)
+
+
+@pytest.mark.parametrize("sort_by", REVIEW_PAGINATORS)
+def test_orderings_run_one_way(sort_by):
+    # Mixed directions cannot be read off one index scan
+    directions = {descending for _, descending in REVIEW_PAGINATORS[sort_by].keys}
+    assert len(directions) == 1
+
+
+@pytest.mark.parametrize("sort_by", REVIEW_PAGINATORS)
+def test_pages_cover_tied_reviews_once(class_id, sort_by):
+    service = ReviewManagerService()
+    seen, cursor = [], None
+    while True:
+        page = service.get_class_reviews_paginated(
+            class_id, cursor=cursor, limit=2, sort_by=sort_by
+        )
+        seen += [review.id for review in page.items]
+        if not page.has_next:
+            break
+        cursor = page.next_cursor
+
+    expected = list(
+        DanceClassReview.objects.filter(dance_class_id=class_id)
+        .order_by(*REVIEW_PAGINATORS[sort_by].ordering)
+        .values_list("id", flat=True)
+    )
+    assert seen == expected
+    assert len(set(seen)) == 9
@@ -0,0 +1,26 @@
+from typing import Any, Callable, Concatenate, Coroutine
+
+from asgiref.sync import sync_to_async
+
+
+def async_twin[S, **P, R](
+    method: Callable[Concatenate[S, P], R],
+) -> Callable[Concatenate[S, P], Coroutine[Any, Any, R]]:
+    """Async version of a sync service method, for async routes:
+
+        aget_thing = async_twin(get_thing)
+
+    The whole method runs in one sync_to_async() call on Django's
+    thread-sensitive sync thread, so its queries cost one switch to that
+    thread rather than one each, and sync and async callers share a single
+    implementation. The method is looked up on the instance when called, so
+    class decorators such as instrumented() apply to it.
+    """
+    name = method.__name__
+
+    async def twin(self: S, *args: P.args, **kwargs: P.kwargs) -> R:
+        return await sync_to_async(getattr(self, name))(*args, **kwargs)
+
+    twin.__name__ = f"a{name}"
+    twin.__doc__ = f"Async {name}()"
+    return twin
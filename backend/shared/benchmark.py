@@ -0,0 +1,63 @@
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Callable, Iterator, List, Sequence
+
+from django.db import transaction
+from rich.table import Table
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of the samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def measure_ms(
+    fn: Callable[[], object], iterations: int, warmup: int = 3
+) -> List[float]:
+    """Run fn repeatedly and return the latency of every run in milliseconds"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        started = perf_counter()
+        fn()
+        samples.append((perf_counter() - started) * 1000)
+    return samples
+
+
+@contextmanager
+def rolled_back() -> Iterator[None]:
+    """Run a block in a transaction that is always rolled back.
+
+    Benchmarks seed their own data inside this block so they can run against
+    a development database without leaving rows behind.
+    """
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def latency_table(title: str) -> Table:
+    table = Table(title=title, show_header=True, header_style="bold magenta")
+    table.add_column("Scenario", style="cyan")
+    table.add_column("Rows", justify="right")
+    table.add_column("p50 (ms)", justify="right", style="green")
+    table.add_column("p99 (ms)", justify="right", style="yellow")
+    table.add_column("Runs", justify="right")
+    return table
+
+
+def add_latency_row(
+    table: Table, scenario: str, rows: int, samples: Sequence[float]
+) -> None:
+    table.add_row(
+        scenario,
+        f"{rows:,}",
+        f"{percentile(samples, 50):.2f}",
+        f"{percentile(samples, 99):.2f}",
+        str(len(samples)),
+    )
@@ -0,0 +1,71 @@
+from typing import Any
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Upper bounds, in seconds, of the connection checkout wait buckets
+WAIT_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    float("inf"),
+)
+
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time a connection checkout waited for the pool",
+    ["database"],
+    buckets=WAIT_BUCKETS,
+)
+POOL_EXHAUSTED = Counter(
+    "db_pool_exhausted",
+    "Checkouts that timed out or found the wait queue full",
+    ["database"],
+)
+# Pools are per process; the gauges are summed over the live processes of a
+# multi-process server
+POOL_SIZE = Gauge(
+    "db_pool_connections",
+    "Open pooled connections",
+    ["database"],
+    multiprocess_mode="livesum",
+)
+POOL_IN_USE = Gauge(
+    "db_pool_connections_in_use",
+    "Pooled connections checked out",
+    ["database"],
+    multiprocess_mode="livesum",
+)
+POOL_WAITING = Gauge(
+    "db_pool_requests_waiting",
+    "Threads waiting for a pooled connection",
+    ["database"],
+    multiprocess_mode="livesum",
+)
+
+
+class PoolExhausted(RuntimeError):
+    """No pooled connection freed up in time, or too many threads waited"""
+
+
+def record_checkout(alias: str, wait_seconds: float) -> None:
+    POOL_CHECKOUT_WAIT.labels(alias).observe(wait_seconds)
+
+
+def record_exhausted(alias: str) -> None:
+    POOL_EXHAUSTED.labels(alias).inc()
+
+
+def update_gauges(alias: str, pool: Any) -> None:
+    """Copy the gauges of a psycopg ConnectionPool to the db_pool_* metrics"""
+    stats = pool.get_stats()
+    POOL_SIZE.labels(alias).set(stats["pool_size"])
+    POOL_IN_USE.labels(alias).set(stats["pool_size"] - stats["pool_available"])
+    POOL_WAITING.labels(alias).set(stats["requests_waiting"])
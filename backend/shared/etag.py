@@ -0,0 +1,62 @@
+import hashlib
+from functools import wraps
+from inspect import iscoroutinefunction
+from typing import Any, Callable, Optional
+
+from django.core.exceptions import ValidationError
+from django.views.decorators.http import condition
+
+# Part of every ETag; bump it when a response schema changes so clients
+# holding old bodies refetch them
+ETAG_VERSION = 1
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag value from the given version parts"""
+    raw = repr((ETAG_VERSION, *parts))
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def etag_condition(version_func: Callable[..., Optional[Any]]) -> Callable:
+    """View decorator answering If-None-Match, for ninja's decorate_view.
+
+    `version_func` receives the route's path parameters and returns a cheap
+    fingerprint of the data behind the response, such as updated_at values
+    and row counts, or None when the entity does not exist. A matching
+    If-None-Match gets a 304 before the view runs, so nothing is queried
+    beyond the fingerprint and nothing is serialized.
+
+    An async `version_func` (for async routes) is awaited before Django's
+    condition() runs, since condition() calls its etag function synchronously.
+
+    Decorators run outside ninja's exception handlers, so a parameter the
+    version query rejects (a malformed UUID) counts as no version; the view's
+    own lookup then raises inside ninja and gets the API's error response.
+    """
+    if not iscoroutinefunction(version_func):
+
+        def etag_func(request, **kwargs) -> Optional[str]:
+            try:
+                version = version_func(**kwargs)
+            except ValidationError:
+                return None
+            if version is None:
+                return None
+            return make_etag(request.path, version)
+
+        return condition(etag_func=etag_func)
+
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            try:
+                version = await version_func(**kwargs)
+            except ValidationError:
+                version = None
+            etag = None if version is None else make_etag(request.path, version)
+            conditional = condition(etag_func=lambda request, *args, **kwargs: etag)
+            return await conditional(view)(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,72 @@
+from functools import lru_cache
+from typing import Any, Iterable, List, Literal, Tuple, Type
+
+from django.db.models import F, TextChoices
+from django.db.models.lookups import Exact, GreaterThan, Lookup
+
+# How a mask filter combines the requested flags
+FlagMatch = Literal["all", "any"]
+
+
+class InvalidFlag(ValueError):
+    pass
+
+
+def flag_bit[C: TextChoices](choices: Type[C], value: str) -> int:
+    """Bit of a choice in a flag mask: its position in the declaration.
+
+    Stored masks depend on the order, so new members must be appended.
+    """
+    try:
+        return 1 << _members(choices).index(choices(value))
+    except ValueError:
+        raise InvalidFlag(f"Unknown {choices.__name__} value: {value}")
+
+
+def to_mask[C: TextChoices](choices: Type[C], values: Iterable[str]) -> int:
+    mask = 0
+    for value in values:
+        mask |= flag_bit(choices, value)
+    return mask
+
+
+def from_mask[C: TextChoices](choices: Type[C], mask: int) -> List[C]:
+    return list(_decode(choices, mask))
+
+
+def parse_mask[C: TextChoices](choices: Type[C], values: str) -> int:
+    """Mask of a comma separated list of choice values, as sent by clients"""
+    return to_mask(choices, (value for value in values.split(",") if value))
+
+
+def has_all_flags(field: str, mask: int) -> Exact:
+    """Filter expression: the mask field has every bit of `mask` set"""
+    return Exact(_bitand(field, mask), mask)
+
+
+def has_any_flag(field: str, mask: int) -> GreaterThan:
+    """Filter expression: the mask field has at least one bit of `mask` set"""
+    return GreaterThan(_bitand(field, mask), 0)
+
+
+def match_flags(field: str, mask: int, match: FlagMatch) -> Lookup:
+    if match == "all":
+        return has_all_flags(field, mask)
+    return has_any_flag(field, mask)
+
+
+def _bitand(field: str, mask: int) -> Any:
+    return F(field).bitand(mask)
+
+
+@lru_cache(maxsize=None)
+def _members(choices: Type[TextChoices]) -> tuple:
+    return tuple(choices)
+
+
+@lru_cache(maxsize=1024)
+def _decode[C: TextChoices](choices: Type[C], mask: int) -> Tuple[C, ...]:
+    # Locations share a handful of distinct masks, so decoding is memoized
+    return tuple(
+        member for bit, member in enumerate(_members(choices)) if mask & (1 << bit)
+    )
@@ -0,0 +1,139 @@
+from math import asin, ceil, cos, radians, sin, sqrt
+from typing import List, Optional, Tuple
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.195
+
+GEOHASH_PRECISION = 9
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_BASE32_INDEX = {char: index for index, char in enumerate(_BASE32)}
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometers"""
+    d_lat = radians(lat2 - lat1)
+    d_lon = radians(lon2 - lon1)
+    a = (
+        sin(d_lat / 2) ** 2
+        + cos(radians(lat1)) * cos(radians(lat2)) * sin(d_lon / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(a)))
+
+
+def geohash_encode(
+    latitude: float, longitude: float, precision: int = GEOHASH_PRECISION
+) -> str:
+    """Encode a coordinate into a geohash of the given length"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        value, value_range = (longitude, lon_range) if even else (latitude, lat_range)
+        mid = (value_range[0] + value_range[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            value_range[0] = mid
+        else:
+            bits = bits << 1
+            value_range[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def geohash_bounds(geohash: str) -> Tuple[float, float, float, float]:
+    """Return (min_lat, max_lat, min_lon, max_lon) of a geohash cell"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        bits = _BASE32_INDEX[char]
+        for shift in range(4, -1, -1):
+            value_range = lon_range if even else lat_range
+            mid = (value_range[0] + value_range[1]) / 2
+            if (bits >> shift) & 1:
+                value_range[0] = mid
+            else:
+                value_range[1] = mid
+            even = not even
+    return lat_range[0], lat_range[1], lon_range[0], lon_range[1]
+
+
+def geohash_cell_size(precision: int) -> Tuple[float, float]:
+    """Return (height, width) of a geohash cell in degrees"""
+    lon_bits = ceil(5 * precision / 2)
+    lat_bits = 5 * precision - lon_bits
+    return 180.0 / 2**lat_bits, 360.0 / 2**lon_bits
+
+
+def bounding_box(
+    latitude: float, longitude: float, radius_km: float
+) -> Tuple[float, float, float, float]:
+    """Return (min_lat, max_lat, min_lon, max_lon) enclosing a circle"""
+    lat_delta = radius_km / KM_PER_DEGREE
+    widest_lat = min(89.9, abs(latitude) + lat_delta)
+    lon_delta = min(180.0, radius_km / (KM_PER_DEGREE * cos(radians(widest_lat))))
+    return (
+        max(-90.0, latitude - lat_delta),
+        min(90.0, latitude + lat_delta),
+        longitude - lon_delta,
+        longitude + lon_delta,
+    )
+
+
+def geohash_cells_in_box(
+    min_lat: float, max_lat: float, min_lon: float, max_lon: float, precision: int
+) -> List[str]:
+    """Return every geohash cell of the given precision intersecting a box"""
+    height, width = geohash_cell_size(precision)
+    first_lat, _, first_lon, _ = geohash_bounds(
+        geohash_encode(min_lat, _wrap_longitude(min_lon), precision)
+    )
+    cells = []
+    lat = first_lat + height / 2
+    while lat - height / 2 <= max_lat and lat < 90.0:
+        lon = min_lon - (_wrap_longitude(min_lon) - first_lon) + width / 2
+        while lon - width / 2 <= max_lon:
+            cell = geohash_encode(lat, _wrap_longitude(lon), precision)
+            if cell not in cells:
+                cells.append(cell)
+            lon += width
+        lat += height
+    return cells
+
+
+def geohash_box_precision(
+    min_lat: float, max_lat: float, min_lon: float, max_lon: float, max_cells: int
+) -> int:
+    """Longest precision that covers the box with at most max_cells cells"""
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = geohash_cell_size(precision)
+        rows = ceil((max_lat - min_lat) / height) + 1
+        columns = ceil((max_lon - min_lon) / width) + 1
+        if rows * columns <= max_cells:
+            return precision
+    return 1
+
+
+def _wrap_longitude(longitude: float) -> float:
+    return (longitude + 180.0) % 360.0 - 180.0
+
+
+def geohash_prefix_upper_bound(geohash: str) -> Optional[str]:
+    """Smallest string greater than every geohash starting with the prefix.
+
+    `prefix <= value < upper bound` selects a cell with a plain range scan,
+    which uses an ordinary B-tree index on every database backend. Returns
+    None for the last cells of the alphabet, which have no upper bound.
+    """
+    prefix = geohash.rstrip(_BASE32[-1])
+    if not prefix:
+        return None
+    return prefix[:-1] + _BASE32[_BASE32_INDEX[prefix[-1]] + 1]
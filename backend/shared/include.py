@@ -0,0 +1,14 @@
+from typing import FrozenSet, Iterable, Optional
+
+
+class InvalidInclude(ValueError):
+    pass
+
+
+def parse_include(include: Optional[str], sections: Iterable[str]) -> FrozenSet[str]:
+    """Sections named in a comma separated include= parameter"""
+    requested = frozenset(name for name in (include or "").split(",") if name)
+    unknown = requested - frozenset(sections)
+    if unknown:
+        raise InvalidInclude(f"Unknown include: {','.join(sorted(unknown))}")
+    return requested
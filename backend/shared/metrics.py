@@ -0,0 +1,224 @@
+import os
+from contextvars import ContextVar
+from functools import wraps
+from inspect import (
+    isasyncgenfunction,
+    iscoroutinefunction,
+    isgeneratorfunction,
+    unwrap,
+)
+from time import perf_counter
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+from django.http import Http404, HttpRequest, HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.utils.decorators import sync_and_async_middleware
+from ninja import NinjaAPI
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from shared.query_count import tracked_queries
+
+# Metrics are kept per process. Under a multi-process server every worker
+# writes them to files in PROMETHEUS_MULTIPROC_DIR, which the metrics view
+# adds up; the directory must be emptied before the server starts.
+MULTIPROCESS_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55)
+# Request attribute holding the Ninja operation answering the request
+OPERATION_ATTR = "ninja_operation"
+
+REQUESTS = Counter(
+    "http_requests",
+    "Requests by Ninja operation and status code",
+    ["operation", "method", "status"],
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time spent answering a request",
+    ["operation", "method"],
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "Size of the response body",
+    ["operation", "method"],
+    buckets=SIZE_BUCKETS,
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_duration_seconds",
+    "Time a request spent running database queries",
+    ["operation", "method"],
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Database queries run by a request",
+    ["operation", "method"],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+SERVICE_LATENCY = Histogram(
+    "service_method_duration_seconds",
+    "Time spent in a service method",
+    ["service", "method"],
+)
+
+# "Service.method" of the innermost instrumented method running
+_service_method: ContextVar[Optional[str]] = ContextVar("service_method", default=None)
+
+
+def current_service_method() -> Optional[str]:
+    return _service_method.get()
+
+
+def instrumented[T: type](cls: T) -> T:
+    """Class decorator timing every public method of a service, and naming
+    it as the current_service_method() while it runs.
+
+    Methods returning generators are left alone, as their work happens
+    while the caller iterates.
+    """
+    for name, method in list(vars(cls).items()):
+        if name.startswith("_") or not callable(method):
+            continue
+        if isgeneratorfunction(method) or isasyncgenfunction(method):
+            continue
+        setattr(
+            cls,
+            name,
+            _timed(
+                method,
+                f"{cls.__name__}.{name}",
+                SERVICE_LATENCY.labels(cls.__name__, name),
+            ),
+        )
+    return cls
+
+
+def _timed(
+    method: Callable[..., Any], qualname: str, histogram: Histogram
+) -> Callable[..., Any]:
+    if iscoroutinefunction(method):
+
+        @wraps(method)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            token = _service_method.set(qualname)
+            started = perf_counter()
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                histogram.observe(perf_counter() - started)
+                _service_method.reset(token)
+
+        return async_wrapper
+
+    @wraps(method)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        token = _service_method.set(qualname)
+        started = perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            histogram.observe(perf_counter() - started)
+            _service_method.reset(token)
+
+    return wrapper
+
+
+def track_operations(api: NinjaAPI) -> None:
+    """Record on each request the Ninja operation answering it, for
+    operation_id(). Call before adding the routers."""
+    api.add_decorator(_records_operation, mode="view")
+
+
+def _records_operation(run: Callable[..., Any]) -> Callable[..., Any]:
+    # Ninja hands over the bound Operation.run, possibly already wrapped by
+    # the route's own decorators
+    operation = getattr(unwrap(run), "__self__", None)
+
+    if iscoroutinefunction(run):
+
+        @wraps(run)
+        async def async_wrapper(request: HttpRequest, *args: Any, **kwargs: Any) -> Any:
+            setattr(request, OPERATION_ATTR, operation)
+            return await run(request, *args, **kwargs)
+
+        return async_wrapper
+
+    @wraps(run)
+    def wrapper(request: HttpRequest, *args: Any, **kwargs: Any) -> Any:
+        setattr(request, OPERATION_ATTR, operation)
+        return run(request, *args, **kwargs)
+
+    return wrapper
+
+
+def operation_id(request: HttpRequest) -> Optional[str]:
+    """OpenAPI operation id of the Ninja operation that answered the request"""
+    operation = getattr(request, OPERATION_ATTR, None)
+    if operation is None:
+        return None
+    return operation.operation_id or operation.api.get_openapi_operation_id(operation)
+
+
+def record(request: HttpRequest, response: HttpResponse, started: float) -> None:
+    operation = operation_id(request)
+    if operation is None:
+        return  # Admin, static files and unknown paths
+    method = request.method or ""
+    REQUESTS.labels(operation, method, str(response.status_code)).inc()
+    REQUEST_LATENCY.labels(operation, method).observe(perf_counter() - started)
+    if not response.streaming:
+        RESPONSE_SIZE.labels(operation, method).observe(len(response.content))
+    queries = tracked_queries()
+    if queries is not None:
+        REQUEST_DB_TIME.labels(operation, method).observe(queries.total_ms / 1000)
+        REQUEST_QUERIES.labels(operation, method).observe(queries.count)
+
+
+@sync_and_async_middleware
+def metrics_middleware(get_response):
+    """Records latency, status and size of every API request, along with the
+    database time the query budget middleware tracked for it; it must come
+    after that middleware"""
+    if iscoroutinefunction(get_response):
+
+        async def async_middleware(request: HttpRequest) -> HttpResponse:
+            started = perf_counter()
+            response = await get_response(request)
+            record(request, response, started)
+            return response
+
+        return async_middleware
+
+    def middleware(request: HttpRequest) -> HttpResponse:
+        started = perf_counter()
+        response = get_response(request)
+        record(request, response, started)
+        return response
+
+    return middleware
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """Metrics in the Prometheus text format, for a scraper holding
+    METRICS_TOKEN. Without a token they are only served in DEBUG."""
+    if settings.METRICS_TOKEN:
+        authorization = request.headers.get("Authorization", "")
+        if not constant_time_compare(authorization, f"Bearer {settings.METRICS_TOKEN}"):
+            raise Http404
+    elif not settings.DEBUG:
+        raise Http404
+    if os.environ.get(MULTIPROCESS_DIR_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
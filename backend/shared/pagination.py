@@ -0,0 +1,139 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from django.db.models import Model, Q, QuerySet
+from ninja import Schema
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class CursorPageSchema[T](Schema):
+    items: List[T]
+    next_cursor: Optional[str] = None
+    has_next: bool
+    # Only counted when the client asks for it (with_total=true)
+    total: Optional[int] = None
+
+
+@dataclass
+class KeysetPage:
+    items: List[Any]
+    next_cursor: Optional[str]
+    total: Optional[int] = None
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def to_schema(self, items: Sequence[Any]) -> CursorPageSchema:
+        """Wrap the serialized items of this page"""
+        return CursorPageSchema(
+            items=list(items),
+            next_cursor=self.next_cursor,
+            has_next=self.has_next,
+            total=self.total,
+        )
+
+
+class KeysetPaginator:
+    """Cursor (keyset) pagination over a fixed sort tuple.
+
+    Instead of OFFSET, the next page is filtered to the rows sorting after
+    the last row of the current one, so every page costs the same as the
+    first. The cursor is an opaque token holding that row's sort values.
+
+    `ordering` uses order_by() syntax over model fields or annotations of
+    the paginated queryset. The values must be non-null; "pk" is appended
+    as the final tiebreak, in the direction of the last key so one index
+    scan serves the whole order, unless the ordering already ends with it.
+    """
+
+    def __init__(self, *ordering: str):
+        if not ordering:
+            ordering = ("pk",)
+        elif ordering[-1].lstrip("-") not in ("pk", "id"):
+            descending = ordering[-1].startswith("-")
+            ordering = (*ordering, "-pk" if descending else "pk")
+        self.ordering = ordering
+        self.keys: Tuple[Tuple[str, bool], ...] = tuple(
+            (field.lstrip("-"), field.startswith("-")) for field in ordering
+        )
+
+    def paginate(
+        self,
+        queryset: QuerySet,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        with_total: bool = False,
+    ) -> KeysetPage:
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        total = queryset.count() if with_total else None
+        items = list(self._page(queryset, cursor, limit))
+        return self._to_page(items, limit, total)
+
+    def _page(self, queryset: QuerySet, cursor: Optional[str], limit: int) -> QuerySet:
+        page = queryset.order_by(*self.ordering)
+        if cursor:
+            page = page.filter(self._after(self.decode(cursor)))
+        # One extra row tells whether there is a next page
+        return page[: limit + 1]
+
+    def _to_page(
+        self, items: List[Any], limit: int, total: Optional[int]
+    ) -> KeysetPage:
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = self.encode(items[-1])
+        return KeysetPage(items=items, next_cursor=next_cursor, total=total)
+
+    def encode(self, row: Model) -> str:
+        values = [_to_json(getattr(row, field)) for field, _ in self.keys]
+        payload = json.dumps({"o": ",".join(self.ordering), "v": values})
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode(self, cursor: str) -> List[Any]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            ordering, values = payload["o"], payload["v"]
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise InvalidCursor("Malformed pagination cursor")
+        # A cursor only makes sense for the sort order it was issued for
+        if ordering != ",".join(self.ordering) or len(values) != len(self.keys):
+            raise InvalidCursor("Pagination cursor does not match the sort order")
+        return values
+
+    def _after(self, values: List[Any]) -> Q:
+        """Rows sorting strictly after `values` under the ordering"""
+        after = Q()
+        equal = Q()
+        for (field, descending), value in zip(self.keys, values):
+            lookup = "lt" if descending else "gt"
+            after |= equal & Q(**{f"{field}__{lookup}": value})
+            equal &= Q(**{field: value})
+        # Implied by the OR above, but a plain range on the first key lets
+        # an index on the ordering seek to the cursor instead of reading
+        # every row before it
+        field, descending = self.keys[0]
+        bound = Q(**{f"{field}__{'lte' if descending else 'gte'}": values[0]})
+        return bound & after
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    return value
@@ -0,0 +1,48 @@
+from time import perf_counter
+
+from django.db.backends.postgresql import base
+from psycopg_pool import PoolTimeout, TooManyRequests
+
+from shared.db_pool import (
+    PoolExhausted,
+    record_checkout,
+    record_exhausted,
+    update_gauges,
+)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """Django's PostgreSQL backend, timing every checkout from its pool.
+
+    A checkout the pool cannot serve within its timeout, or that finds
+    max_waiting threads already queued, raises PoolExhausted rather than a
+    database error, so the API can answer 503 and clients retry. The pool's
+    gauges are exported on every checkout and return (see shared.db_pool).
+    """
+
+    def get_new_connection(self, conn_params):
+        # Only the PostgreSQL wrapper has a pool attribute, unknown to the
+        # stubs. None without pool options, and for the connection Django
+        # opens without a database to create the test database
+        pool = getattr(self, "pool")
+        if pool is None:
+            return super().get_new_connection(conn_params)
+        started = perf_counter()
+        try:
+            connection = super().get_new_connection(conn_params)
+        except (PoolTimeout, TooManyRequests) as error:
+            record_exhausted(self.alias)
+            raise PoolExhausted(f"{self.alias} connection pool: {error}") from error
+        finally:
+            update_gauges(self.alias, pool)
+        record_checkout(self.alias, perf_counter() - started)
+        return connection
+
+    def close(self):
+        returned = self.connection is not None
+        super().close()
+        # Reading self.pool creates the pool, so only after a checkout:
+        # test mirrors get their database name after the first close()
+        pool = getattr(self, "pool") if returned else None
+        if pool:
+            update_gauges(self.alias, pool)
@@ -0,0 +1,350 @@
+import asyncio
+import logging
+import random
+import re
+import traceback
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from inspect import iscoroutinefunction
+from pathlib import Path
+from time import perf_counter
+from types import FrameType
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from django.conf import settings
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.http import HttpRequest, HttpResponse
+from django.test.utils import CaptureQueriesContext
+from django.utils.decorators import sync_and_async_middleware
+
+logger = logging.getLogger(__name__)
+
+# IN lists of any length share one shape
+IN_LIST = re.compile(r"\((?:%s, )+%s\)")
+
+
+class QueryCountError(AssertionError):
+    def __init__(self, message: str, actual: int):
+        super().__init__(message)
+        self.actual = actual
+
+
+class QueryBudgetError(AssertionError):
+    pass
+
+
+@contextmanager
+def assert_num_queries(
+    expected: int, label: str = "block"
+) -> Iterator[CaptureQueriesContext]:
+    """Fail unless the block runs exactly `expected` queries.
+
+    The error lists every captured statement so an N+1 regression shows the
+    repeated query straight away.
+    """
+    with CaptureQueriesContext(connection) as context:
+        yield context
+    if len(context) != expected:
+        statements = "\n".join(
+            f"  {index}. {query['sql']}"
+            for index, query in enumerate(context.captured_queries, start=1)
+        )
+        raise QueryCountError(
+            f"{label}: expected {expected} queries, got {len(context)}\n{statements}",
+            actual=len(context),
+        )
+
+
+@dataclass
+class QueryShape:
+    """One statement as written, whatever its parameters"""
+
+    sql: str
+    count: int = 0
+    total_ms: float = 0.0
+    # Innermost project frame running it, found once the shape repeats
+    call_site: Optional[str] = None
+    # Run in an expect_repeated_queries() block, so repeats are no N+1
+    expected: bool = False
+
+
+@dataclass
+class TrackedQueries:
+    """Queries of one request or block, by shape"""
+
+    label: str
+    # Most queries allowed, declared by the route with query_budget()
+    budget: Optional[int] = None
+    count: int = 0
+    total_ms: float = 0.0
+    shapes: Dict[str, QueryShape] = field(default_factory=dict)
+    # Task of the async code tracked, whose stack locates queries the async
+    # ORM runs in a worker thread
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+    # Request tracked, whose resolved route names the queries' view
+    request: Optional[HttpRequest] = field(default=None, repr=False)
+    # Enclosing block, which counts the queries as well
+    parent: Optional["TrackedQueries"] = field(default=None, repr=False)
+
+    def record(self, sql: str, duration_ms: float, expected: bool = False) -> None:
+        key = query_shape(sql)
+        shape = self.shapes.get(key)
+        if shape is None:
+            shape = self.shapes[key] = QueryShape(key)
+        shape.count += 1
+        shape.total_ms += duration_ms
+        shape.expected = shape.expected or expected
+        if shape.count == settings.QUERY_REPEAT_THRESHOLD:
+            shape.call_site = call_site(self.task)
+        self.count += 1
+        self.total_ms += duration_ms
+        if self.parent is not None:
+            self.parent.record(sql, duration_ms, expected)
+
+    def repeated(self) -> List[QueryShape]:
+        """Shapes run often enough to be a query per row (N+1)"""
+        threshold = settings.QUERY_REPEAT_THRESHOLD
+        return [
+            shape
+            for shape in self.shapes.values()
+            if shape.count >= threshold and not shape.expected
+        ]
+
+    def problems(self) -> List[str]:
+        problems = []
+        if self.budget is not None and self.count > self.budget:
+            problems.append(
+                f"ran {self.count} queries, over its budget of {self.budget}"
+            )
+        for shape in self.repeated():
+            problems.append(
+                f"ran one query {shape.count} times (N+1) from {shape.call_site}:\n"
+                f"    {shape.sql}"
+            )
+        return problems
+
+    def check(self) -> None:
+        """Raise QueryBudgetError listing every problem, if any"""
+        problems = self.problems()
+        if problems:
+            raise QueryBudgetError(
+                f"{self.label}:\n" + "\n".join(f"- {problem}" for problem in problems)
+            )
+
+
+_tracked: ContextVar[Optional[TrackedQueries]] = ContextVar(
+    "tracked_queries", default=None
+)
+_repeats_expected: ContextVar[bool] = ContextVar("repeats_expected", default=False)
+
+
+def tracked_queries() -> Optional[TrackedQueries]:
+    """Queries of the current request so far, if it is tracked"""
+    return _tracked.get()
+
+
+@contextmanager
+def track_queries(
+    label: str, request: Optional[HttpRequest] = None
+) -> Iterator[TrackedQueries]:
+    """Record every query of the block, on every database.
+
+    Covers the ORM threads of async code as well, since they run with the
+    block's context. A nested block, such as a request made by a test
+    inside assert_query_budget(), records its queries on its own and on
+    the enclosing block.
+    """
+    queries = TrackedQueries(
+        label, task=_current_task(), request=request, parent=_tracked.get()
+    )
+    token = _tracked.set(queries)
+    try:
+        yield queries
+    finally:
+        _tracked.reset(token)
+
+
+@contextmanager
+def expect_repeated_queries() -> Iterator[None]:
+    """Mark the block's queries as repeated on purpose, as in a loop with a
+    bounded number of rounds, so they are not reported as N+1. They still
+    count toward the route's budget.
+    """
+    token = _repeats_expected.set(True)
+    try:
+        yield
+    finally:
+        _repeats_expected.reset(token)
+
+
+@contextmanager
+def assert_query_budget(budget: int, label: str = "block") -> Iterator[TrackedQueries]:
+    """Fail if the block runs more than `budget` queries or an N+1 pattern"""
+    with track_queries(label) as queries:
+        queries.budget = budget
+        yield queries
+    queries.check()
+
+
+def query_budget(max_queries: int) -> Callable[[Callable], Callable]:
+    """View decorator declaring the most queries a route may run, for ninja's
+    decorate_view. The query budget middleware checks it once the request is
+    done, so ETag version queries before the view count as well. List it
+    last in decorate_view, which wraps in order, to keep it outermost.
+    """
+
+    def declare(task: Optional[asyncio.Task] = None) -> None:
+        queries = _tracked.get()
+        if queries is not None:
+            queries.budget = max_queries
+            # Sync middleware runs an async view in a task of its own
+            queries.task = task or queries.task
+
+    def decorator(view: Callable[..., Any]) -> Callable[..., Any]:
+        if iscoroutinefunction(view):
+
+            @wraps(view)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                declare(asyncio.current_task())
+                return await view(*args, **kwargs)
+
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            declare()
+            return view(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def report(queries: TrackedQueries) -> None:
+    """Raise on the problems of a request in strict mode, else log a sample"""
+    problems = queries.problems()
+    if not problems:
+        return
+    if settings.QUERY_BUDGET_STRICT:
+        queries.check()
+    if random.random() < settings.QUERY_BUDGET_LOG_SAMPLE_RATE:
+        logger.warning(
+            "%s %s", queries.label, "; ".join(problems), extra={"queries": queries}
+        )
+
+
+@sync_and_async_middleware
+def query_budget_middleware(get_response):
+    """Counts and times each request's queries and reports N+1 patterns and
+    routes over their query budget"""
+    if iscoroutinefunction(get_response):
+
+        async def async_middleware(request: HttpRequest) -> HttpResponse:
+            with track_queries(f"{request.method} {request.path}", request) as queries:
+                response = await get_response(request)
+            report(queries)
+            return response
+
+        return async_middleware
+
+    def middleware(request: HttpRequest) -> HttpResponse:
+        with track_queries(f"{request.method} {request.path}", request) as queries:
+            response = get_response(request)
+        report(queries)
+        return response
+
+    return middleware
+
+
+def _current_task() -> Optional[asyncio.Task]:
+    try:
+        return asyncio.current_task()
+    except RuntimeError:  # No event loop running in this thread
+        return None
+
+
+def query_shape(sql: str) -> str:
+    """The statement with IN lists of any length folded together"""
+    return IN_LIST.sub("(%s, ...)", sql)
+
+
+def call_site(task: Optional[asyncio.Task] = None) -> Optional[str]:
+    """file:line of the innermost project code that called into Django to run
+    the current query, skipping the execute wrappers the query went through.
+
+    The async ORM runs queries in a thread of its own, holding no project
+    code; the code awaiting them is then found on the task.
+    """
+    # The task's innermost frame awaits the ORM, though not always through
+    # frames of it: async for over a queryset hides them
+    stacks = [(traceback.extract_stack(), False)]
+    if task is not None:
+        stacks.append((traceback.StackSummary.extract(_task_frames(task)), True))
+    for stack, in_library in stacks:
+        frame = _caller(stack, in_library)
+        if frame is not None:
+            relative = Path(frame.filename).relative_to(settings.BASE_DIR)
+            return f"{relative}:{frame.lineno} in {frame.name}"
+    return None
+
+
+def _caller(
+    stack: traceback.StackSummary, in_library: bool
+) -> Optional[traceback.FrameSummary]:
+    base_dir = str(settings.BASE_DIR)
+    for frame in reversed(stack):
+        if frame.name == "thread_handler" and "asgiref" in frame.filename:
+            # Where sync_to_async() entered this thread; outer frames wait
+            # for other code
+            return None
+        if (
+            frame.filename.startswith(base_dir)
+            and "site-packages" not in frame.filename
+        ):
+            if in_library:
+                return frame
+        else:
+            in_library = True
+    return None
+
+
+def _task_frames(task: asyncio.Task) -> Iterator[tuple[FrameType, int]]:
+    """Frames of the coroutines the task awaits through, outermost first"""
+    awaitable: Any = task.get_coro()
+    while awaitable is not None:
+        frame = getattr(awaitable, "cr_frame", None) or getattr(
+            awaitable, "ag_frame", None
+        )
+        if frame is None:
+            break
+        yield frame, frame.f_lineno
+        awaitable = getattr(awaitable, "cr_await", None) or getattr(
+            awaitable, "ag_await", None
+        )
+
+
+def _track_query(execute, sql, params, many, context):
+    queries = _tracked.get()
+    if queries is None:
+        return execute(sql, params, many, context)
+    started = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        queries.record(
+            sql, (perf_counter() - started) * 1000, expected=_repeats_expected.get()
+        )
+
+
+def _install_query_tracker(sender, connection, **kwargs):
+    # Fired again on every reconnect of the same wrapper. Inserted first, as
+    # execute_wrapper() blocks pop the last wrapper when they exit
+    if _track_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _track_query)
+
+
+def connect_query_tracker_signals():
+    connection_created.connect(_install_query_tracker, dispatch_uid="query_tracker")
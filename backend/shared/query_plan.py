@@ -0,0 +1,142 @@
+import re
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+
+# Plan lines of a full table read, by database vendor; SQLite's SCAN also
+# covers walking a whole index in order
+FULL_SCAN_PATTERNS = {
+    "sqlite": r"\bSCAN (TABLE )?{table}\b",
+    "postgresql": r"\bSeq Scan on {table}\b",
+}
+# Plan lines naming the index a step uses, by database vendor
+INDEX_PATTERNS = {
+    "sqlite": r"USING (?:COVERING )?INDEX (\w+)",
+    "postgresql": r"Index (?:Only )?Scan(?: Backward)? using (\w+)",
+}
+# Plan lines of an index scan, by database vendor, for those that print the
+# scan's conditions on the lines below it: a scan without an index
+# condition walks the whole index, unless a Limit stops it
+INDEX_WALK_PATTERNS = {
+    "postgresql": r"\bIndex (?:Only )?Scan(?: Backward)? using \w+ on {table}\b",
+}
+# A child node line of a PostgreSQL text plan; the indent gives its depth
+PLAN_NODE = re.compile(r"^(\s*)->\s+(.*)$")
+
+
+class QueryPlanError(AssertionError):
+    def __init__(self, message: str, scans: List[str]):
+        super().__init__(message)
+        self.scans = scans
+
+
+def explain(sql: str, params: Sequence, using: str = DEFAULT_DB_ALIAS) -> List[str]:
+    """The database's plan of one statement, a line per step. The statement
+    is only planned, not run (no ANALYZE)."""
+    prefix = connections[using].ops.explain_query_prefix()
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"{prefix} {sql}", params)
+        # SQLite returns (id, parent, notused, detail), PostgreSQL one column
+        return [str(row[-1]) for row in cursor.fetchall()]
+
+
+def full_scans(plan: List[str], tables: Sequence[str]) -> List[str]:
+    """Plan lines reading one of `tables` in full, through the table or
+    through one of its indexes"""
+    pattern = FULL_SCAN_PATTERNS.get(connection.vendor)
+    if pattern is None:
+        raise NotImplementedError(f"No plan patterns for {connection.vendor}")
+    walk_pattern = INDEX_WALK_PATTERNS.get(connection.vendor)
+    scans = []
+    for position, line in enumerate(plan):
+        for table in tables:
+            table = re.escape(table)
+            if re.search(pattern.format(table=table), line) or (
+                walk_pattern
+                and re.search(walk_pattern.format(table=table), line)
+                and not _has_index_condition(plan, position)
+                and not _under_limit(plan, position)
+            ):
+                scans.append(line)
+    return scans
+
+
+def _node(plan: List[str], position: int) -> Optional[Tuple[int, str]]:
+    """(depth, text) of a plan line starting a node, the root being -1"""
+    if position == 0:
+        return -1, plan[0].strip()
+    match = PLAN_NODE.match(plan[position])
+    return (len(match.group(1)), match.group(2)) if match else None
+
+
+def _has_index_condition(plan: List[str], position: int) -> bool:
+    """Whether the detail lines of the node at plan[position], up to its
+    first child, include an Index Cond"""
+    for line in plan[position + 1 :]:
+        if PLAN_NODE.match(line):
+            return False
+        if "Index Cond:" in line:
+            return True
+    return False
+
+
+def _under_limit(plan: List[str], position: int) -> bool:
+    """Whether the node at plan[position] feeds a Limit through nothing but
+    the outer side of nested loops, so it stops once the limit is reached
+    (a top-N read in index order rather than a full walk)"""
+    node = _node(plan, position)
+    assert node is not None
+    depth = node[0]
+    for line in range(position - 1, -1, -1):
+        ancestor = _node(plan, line)
+        if ancestor is None or ancestor[0] > depth:
+            continue
+        if ancestor[0] == depth:
+            # An earlier sibling: this node is a nested loop's inner side,
+            # scanned again for every outer row
+            return False
+        depth, text = ancestor
+        if text.startswith("Limit"):
+            return True
+        if not text.startswith("Nested Loop"):
+            return False
+    return False
+
+
+def used_indexes(plan: List[str]) -> List[str]:
+    pattern = INDEX_PATTERNS.get(connection.vendor, r"$^")
+    return [name for line in plan for name in re.findall(pattern, line)]
+
+
+@contextmanager
+def assert_no_full_scan(
+    tables: Sequence[str], label: str = "block"
+) -> Iterator[List[Tuple[str, List[str]]]]:
+    """Fail if any query of the block reads one of `tables` in full.
+
+    Every statement the block runs is recorded and explained afterwards, so
+    the check covers the exact SQL the code under test builds. The context
+    value collects (sql, plan) of each statement.
+    """
+    statements: List[Tuple[str, Sequence]] = []
+
+    def record(execute, sql, params, many, context):
+        statements.append((sql, params))
+        return execute(sql, params, many, context)
+
+    plans: List[Tuple[str, List[str]]] = []
+    with connection.execute_wrapper(record):
+        yield plans
+
+    for sql, params in statements:
+        plans.append((sql, explain(sql, params)))
+    scans = [line for _, plan in plans for line in full_scans(plan, tables)]
+    if scans:
+        details = "\n".join(
+            f"  {sql}\n" + "\n".join(f"    {line}" for line in plan)
+            for sql, plan in plans
+        )
+        raise QueryPlanError(
+            f"{label}: full scan of {', '.join(tables)}\n{details}", scans=scans
+        )
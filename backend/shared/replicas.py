@@ -0,0 +1,186 @@
+import random
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from inspect import iscoroutinefunction
+from typing import Any, Dict, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.backends.signals import connection_created
+from django.http import HttpRequest, HttpResponse
+from django.utils.decorators import sync_and_async_middleware
+
+# Requests under these paths may read from a replica
+REPLICA_READ_PREFIXES = ("/api/public/",)
+# Cookie pinning a client to the primary after it wrote
+PIN_COOKIE = "db_pin"
+# Prefix of the per-alias query counters kept in the cache
+KEY_PREFIX = "db:queries"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+@dataclass
+class RequestRouting:
+    """Database routing state of one request"""
+
+    # Replica serving the request's reads, None to read from the primary
+    replica: Optional[str]
+    # Set by the first write; every later read goes to the primary
+    pinned: bool = False
+    # Set by the first read served by the replica
+    read_replica: bool = False
+    queries: Counter = field(default_factory=Counter)
+
+
+_routing: ContextVar[Optional[RequestRouting]] = ContextVar(
+    "database_routing", default=None
+)
+
+
+class ReplicaRouter:
+    """Sends the reads of public catalog requests to a read replica.
+
+    Only requests the replica routing middleware marked as replica reads
+    leave the primary: safe methods under REPLICA_READ_PREFIXES from a
+    client not pinned by a recent write. A request sticks to one replica so
+    its reads see one snapshot, and moves to the primary for good once it
+    writes. Everything outside a request (management commands, migrations,
+    signals fired by them) uses the primary.
+    """
+
+    def db_for_read(self, model, **hints) -> str:
+        routing = _routing.get()
+        if routing is None or routing.pinned or routing.replica is None:
+            return DEFAULT_DB_ALIAS
+        routing.read_replica = True
+        return routing.replica
+
+    def db_for_write(self, model, **hints) -> str:
+        routing = _routing.get()
+        if routing is not None:
+            routing.pinned = True
+        # Explicit, or Django would write back to the replica an instance
+        # was read from
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool:
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints) -> bool:
+        return db == DEFAULT_DB_ALIAS
+
+
+def read_from_replica() -> bool:
+    """Whether the current request has read anything from a replica"""
+    routing = _routing.get()
+    return routing is not None and routing.read_replica
+
+
+def _routing_for(request: HttpRequest) -> RequestRouting:
+    replicas = settings.DATABASE_REPLICAS
+    if (
+        not replicas
+        or request.method not in SAFE_METHODS
+        or not request.path.startswith(REPLICA_READ_PREFIXES)
+        or PIN_COOKIE in request.COOKIES
+    ):
+        return RequestRouting(replica=None)
+    return RequestRouting(replica=random.choice(replicas))
+
+
+def _pin(routing: RequestRouting, response: HttpResponse) -> HttpResponse:
+    if routing.pinned and settings.DATABASE_REPLICAS:
+        # Keep the client's reads on the primary until the replicas caught up
+        response.set_cookie(
+            PIN_COOKIE,
+            "1",
+            max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+            httponly=True,
+            samesite="Lax",
+        )
+    return response
+
+
+@sync_and_async_middleware
+def replica_routing_middleware(get_response):
+    """Routes each request's database reads and pins clients after writes"""
+    if iscoroutinefunction(get_response):
+
+        async def async_middleware(request: HttpRequest) -> HttpResponse:
+            routing = _routing_for(request)
+            token = _routing.set(routing)
+            try:
+                response = await get_response(request)
+            finally:
+                _routing.reset(token)
+            if routing.queries:
+                await sync_to_async(query_counters.add)(routing.queries)
+            return _pin(routing, response)
+
+        return async_middleware
+
+    def middleware(request: HttpRequest) -> HttpResponse:
+        routing = _routing_for(request)
+        token = _routing.set(routing)
+        try:
+            response = get_response(request)
+        finally:
+            _routing.reset(token)
+        query_counters.add(routing.queries)
+        return _pin(routing, response)
+
+    return middleware
+
+
+class QueryCounters:
+    """Queries run per database alias, summed over every worker.
+
+    Requests count their queries in memory and add them to the cache once
+    they finish, so a shared backend (Redis) totals all workers for one
+    round trip per alias and request.
+    """
+
+    def add(self, queries: Counter) -> None:
+        for alias, count in queries.items():
+            key = self._key(alias)
+            try:
+                cache.incr(key, count)
+            except ValueError:
+                if not cache.add(key, count, timeout=None):
+                    cache.incr(key, count)
+
+    def stats(self) -> Dict[str, int]:
+        keys = {alias: self._key(alias) for alias in settings.DATABASES}
+        counts: Dict[str, Any] = cache.get_many(keys.values())
+        return {alias: counts.get(key, 0) for alias, key in keys.items()}
+
+    def reset(self) -> None:
+        cache.delete_many([self._key(alias) for alias in settings.DATABASES])
+
+    def _key(self, alias: str) -> str:
+        return f"{KEY_PREFIX}:{alias}"
+
+
+query_counters = QueryCounters()
+
+
+def _count_query(execute, sql, params, many, context):
+    routing = _routing.get()
+    if routing is not None:
+        routing.queries[context["connection"].alias] += 1
+    return execute(sql, params, many, context)
+
+
+def _install_query_counter(sender, connection, **kwargs):
+    # Fired again on every reconnect of the same wrapper. Inserted first, as
+    # execute_wrapper() blocks pop the last wrapper when they exit
+    if _count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _count_query)
+
+
+def connect_query_counter_signals():
+    connection_created.connect(_install_query_counter, dispatch_uid="query_counter")
@@ -0,0 +1,303 @@
+import hashlib
+import time
+from dataclasses import dataclass
+from functools import wraps
+from inspect import iscoroutinefunction, unwrap
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpRequest, HttpResponse
+
+from shared.replicas import read_from_replica
+
+# Entity-version namespaces; a write to an entity bumps its namespace
+CLASSES = "classes"
+LOCATIONS = "locations"
+USERS = "users"
+REVIEWS = "reviews"
+TRENDING = "trending"
+NAMESPACES = (CLASSES, LOCATIONS, USERS, REVIEWS, TRENDING)
+# Prefix of every key the response cache writes
+KEY_PREFIX = "response"
+# Response header telling clients whether the body came from the cache
+CACHE_STATUS_HEADER = "X-Cache"
+
+
+@dataclass
+class ResponseCacheStats:
+    route: str
+    hits: int
+    misses: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ResponseCache:
+    """Caches the serialized JSON of public GET routes.
+
+    A response is keyed by its path, its normalized query string and the
+    current version of every entity namespace it was built from. Writes never
+    delete cached responses: they bump the namespace version, which moves
+    every dependent route to fresh keys, and the orphaned entries age out
+    with RESPONSE_CACHE_TIMEOUT.
+
+    Versions and the hit/miss counters live in the same cache as the
+    responses, so a shared backend (Redis) invalidates every worker at once;
+    the local-memory backend used in development is per process.
+
+    With read replicas, a response read from a replica within
+    DATABASE_REPLICA_PIN_SECONDS of a bump of one of its namespaces is not
+    stored: the replica may not have the write yet, and the stale body would
+    be cached under the new version.
+    """
+
+    def __init__(self, alias: str = "default"):
+        self.alias = alias
+        self.routes: List[str] = []
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def versions(self, namespaces: Iterable[str]) -> Dict[str, int]:
+        """Current version of each namespace, seeding the missing ones"""
+        keys = {namespace: self._version_key(namespace) for namespace in namespaces}
+        stored = self.cache.get_many(keys.values())
+        versions = {}
+        for namespace, key in keys.items():
+            if key not in stored:
+                # Seed from the clock so an evicted version never reverts to a
+                # value older cached responses were stored under
+                self.cache.add(key, time.time_ns(), timeout=None)
+                stored[key] = self.cache.get(key)
+            versions[namespace] = stored[key]
+        return versions
+
+    def bump(self, *namespaces: str) -> None:
+        """Invalidate every cached response built from these namespaces.
+
+        Inside a transaction the bump waits for the commit, so a concurrent
+        request cannot cache the pre-commit state under the new version.
+        """
+        transaction.on_commit(lambda: self._bump_now(namespaces))
+
+    def _bump_now(self, namespaces: Iterable[str]) -> None:
+        for namespace in namespaces:
+            key = self._version_key(namespace)
+            try:
+                self.cache.incr(key)
+            except ValueError:
+                self.cache.add(key, time.time_ns(), timeout=None)
+        if settings.DATABASE_REPLICAS:
+            self.cache.set_many(
+                {self._bumped_key(namespace): True for namespace in namespaces},
+                timeout=settings.DATABASE_REPLICA_PIN_SECONDS,
+            )
+
+    def recently_bumped(self, namespaces: Iterable[str]) -> bool:
+        """Whether a namespace was bumped within the replica pin window"""
+        keys = [self._bumped_key(namespace) for namespace in namespaces]
+        return bool(self.cache.get_many(keys))
+
+    def response_key(self, request: HttpRequest, namespaces: Iterable[str]) -> str:
+        # Parameter order is irrelevant, the order of repeated values is not
+        query = sorted(request.GET.lists())
+        versions = self.versions(namespaces)
+        raw = repr((request.path, query, sorted(versions.items())))
+        digest = hashlib.sha256(raw.encode()).hexdigest()
+        return f"{KEY_PREFIX}:body:{digest}"
+
+    def get(self, key: str) -> HttpResponse | None:
+        cached = self.cache.get(key)
+        if cached is None:
+            return None
+        content_type, content = cached
+        return HttpResponse(content, content_type=content_type)
+
+    def set(self, key: str, response: HttpResponse) -> None:
+        self.cache.set(
+            key,
+            (response["Content-Type"], response.content),
+            timeout=settings.RESPONSE_CACHE_TIMEOUT,
+        )
+
+    def record(self, route: str, hit: bool) -> None:
+        key = self._counter_key(route, hit)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            if not self.cache.add(key, 1, timeout=None):
+                self.cache.incr(key)
+
+    def stats(self) -> List[ResponseCacheStats]:
+        keys = [
+            self._counter_key(route, hit)
+            for route in self.routes
+            for hit in (True, False)
+        ]
+        counters: Dict[str, Any] = self.cache.get_many(keys)
+        return [
+            ResponseCacheStats(
+                route=route,
+                hits=counters.get(self._counter_key(route, True), 0),
+                misses=counters.get(self._counter_key(route, False), 0),
+            )
+            for route in self.routes
+        ]
+
+    def reset_stats(self) -> None:
+        self.cache.delete_many(
+            [
+                self._counter_key(route, hit)
+                for route in self.routes
+                for hit in (True, False)
+            ]
+        )
+
+    def _version_key(self, namespace: str) -> str:
+        return f"{KEY_PREFIX}:version:{namespace}"
+
+    def _bumped_key(self, namespace: str) -> str:
+        return f"{KEY_PREFIX}:bumped:{namespace}"
+
+    def _counter_key(self, route: str, hit: bool) -> str:
+        return f"{KEY_PREFIX}:{'hits' if hit else 'misses'}:{route}"
+
+
+response_cache = ResponseCache()
+
+
+def cached_response(*namespaces: str) -> Callable[[Callable], Callable]:
+    """View decorator caching a public GET route, for ninja's decorate_view.
+
+    `namespaces` lists every entity namespace the response is built from;
+    leaving one out serves stale data after writes to that entity. Async
+    routes do their cache round trips in one thread hop before the view and
+    one after it.
+    """
+
+    def decorator(view: Callable[..., Any]) -> Callable[..., Any]:
+        # decorate_view hands over the bound Operation.run of the route,
+        # possibly already wrapped by the decorators listed before this one
+        operation = getattr(unwrap(view), "__self__", None)
+        route = getattr(getattr(operation, "view_func", view), "__name__", "view")
+        # Ninja 1.6+ decorates the operation again for each mount of its router
+        if route not in response_cache.routes:
+            response_cache.routes.append(route)
+
+        def lookup(request: HttpRequest) -> Tuple[str, HttpResponse | None]:
+            key = response_cache.response_key(request, namespaces)
+            return key, response_cache.get(key)
+
+        def store(key: str, response: HttpResponse, hit: bool) -> None:
+            if (
+                not hit
+                and response.status_code == 200
+                and not (
+                    read_from_replica() and response_cache.recently_bumped(namespaces)
+                )
+            ):
+                response_cache.set(key, response)
+            response_cache.record(route, hit)
+
+        if iscoroutinefunction(view):
+
+            @wraps(view)
+            async def async_wrapper(
+                request: HttpRequest, *args: Any, **kwargs: Any
+            ) -> Any:
+                if not settings.RESPONSE_CACHE_ENABLED or request.method != "GET":
+                    return await view(request, *args, **kwargs)
+
+                key, response = await sync_to_async(lookup)(request)
+                hit = response is not None
+                if response is None:
+                    response = await view(request, *args, **kwargs)
+                await sync_to_async(store)(key, response, hit)
+                response[CACHE_STATUS_HEADER] = "HIT" if hit else "MISS"
+                return response
+
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request: HttpRequest, *args: Any, **kwargs: Any) -> Any:
+            if not settings.RESPONSE_CACHE_ENABLED or request.method != "GET":
+                return view(request, *args, **kwargs)
+
+            key, response = lookup(request)
+            hit = response is not None
+            if response is None:
+                response = view(request, *args, **kwargs)
+            store(key, response, hit)
+            response[CACHE_STATUS_HEADER] = "HIT" if hit else "MISS"
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+# Namespace bumped by a save or delete of each model, by model label
+MODEL_NAMESPACES: Dict[str, str] = {
+    "classes.DanceClass": CLASSES,
+    "classes.Location": LOCATIONS,
+    "accounts.User": USERS,
+    "reviews.DanceClassReview": REVIEWS,
+    "reviews.InstructorReview": REVIEWS,
+    "reviews.LocationReview": REVIEWS,
+}
+
+
+# Fields of a model that cached responses render, by model label. Saves of
+# these models bump their namespace only when one of the fields changed, so
+# e.g. the last_login write of every login leaves the listings cached.
+MODEL_RENDERED_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "accounts.User": ("first_name", "last_name", "bio", "profile_picture_url", "role"),
+}
+
+
+def _rendered_values(instance, fields: Tuple[str, ...]) -> Dict[str, Any]:
+    # Read from __dict__, so deferred fields are skipped rather than loaded
+    return {field: instance.__dict__.get(field) for field in fields}
+
+
+def remember_rendered_fields(sender, instance, **kwargs):
+    fields = MODEL_RENDERED_FIELDS[sender._meta.label]
+    setattr(instance, "_rendered_values", _rendered_values(instance, fields))
+
+
+def bump_model_namespace(sender, raw=False, **kwargs):
+    if not raw:
+        response_cache.bump(MODEL_NAMESPACES[sender._meta.label])
+
+
+def bump_model_namespace_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    fields = MODEL_RENDERED_FIELDS.get(sender._meta.label)
+    if fields is not None:
+        previous = getattr(instance, "_rendered_values", None)
+        current = _rendered_values(instance, fields)
+        setattr(instance, "_rendered_values", current)
+        if not created and previous == current:
+            return
+    response_cache.bump(MODEL_NAMESPACES[sender._meta.label])
+
+
+def connect_response_cache_signals():
+    from django.apps import apps
+    from django.db.models.signals import post_delete, post_init, post_save
+
+    for label in MODEL_NAMESPACES:
+        model = apps.get_model(label)
+        uid = f"response_cache_{label}"
+        post_save.connect(bump_model_namespace_on_save, sender=model, dispatch_uid=uid)
+        post_delete.connect(bump_model_namespace, sender=model, dispatch_uid=uid)
+        if label in MODEL_RENDERED_FIELDS:
+            post_init.connect(remember_rendered_fields, sender=model, dispatch_uid=uid)
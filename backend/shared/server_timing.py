@@ -0,0 +1,166 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from inspect import iscoroutinefunction
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.utils.decorators import sync_and_async_middleware
+from ninja import NinjaAPI
+from ninja.renderers import JSONRenderer
+
+from shared.query_count import tracked_queries
+
+# Request header asking for a Server-Timing breakdown when
+# SERVER_TIMING_ALLOW_HEADER is on
+REQUEST_HEADER = "X-Server-Timing"
+
+
+@dataclass
+class RequestTiming:
+    """Milliseconds a request spent per phase"""
+
+    started: float = field(default_factory=perf_counter)
+    phases: Dict[str, float] = field(default_factory=dict)
+    # When the view last returned, until its result is rendered
+    view_returned: Optional[float] = None
+
+    def add(self, phase: str, duration_ms: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + duration_ms
+
+    def header(self) -> str:
+        """Value of the Server-Timing response header"""
+        metrics = [
+            f"{phase};dur={duration_ms:.2f}"
+            for phase, duration_ms in self.phases.items()
+        ]
+        queries = tracked_queries()
+        if queries is not None:
+            noun = "query" if queries.count == 1 else "queries"
+            metrics.append(
+                f'db;dur={queries.total_ms:.2f};desc="{queries.count} {noun}"'
+            )
+        metrics.append(f"total;dur={(perf_counter() - self.started) * 1000:.2f}")
+        return ", ".join(metrics)
+
+
+_timing: ContextVar[Optional[RequestTiming]] = ContextVar(
+    "request_timing", default=None
+)
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """Add the block's duration to a phase of the current request, if it
+    reports Server-Timing"""
+    timing = _timing.get()
+    if timing is None:
+        yield
+        return
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(phase, (perf_counter() - started) * 1000)
+
+
+class TimedRenderer(JSONRenderer):
+    """JSON renderer timing the encoding of responses as "render", and the
+    time since the view returned, spent validating and dumping its result
+    through the response schema, as "schema". Pass it to NinjaAPI(renderer=)
+    and the API to time_operations()."""
+
+    def render(self, request: HttpRequest, data: Any, *, response_status: int) -> Any:
+        timing = _timing.get()
+        if timing is not None and timing.view_returned is not None:
+            timing.add("schema", (perf_counter() - timing.view_returned) * 1000)
+            timing.view_returned = None
+        with timed("render"):
+            return super().render(request, data, response_status=response_status)
+
+
+def time_operations(api: NinjaAPI) -> None:
+    """Mark when the views of the API return, for TimedRenderer to time
+    "schema". Call before adding the routers."""
+    api.add_decorator(_marks_return, mode="operation")
+
+
+def _marks_return(view_func: Callable[..., Any]) -> Callable[..., Any]:
+    def mark() -> None:
+        timing = _timing.get()
+        if timing is not None:
+            timing.view_returned = perf_counter()
+
+    if iscoroutinefunction(view_func):
+
+        @wraps(view_func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            result = await view_func(*args, **kwargs)
+            mark()
+            return result
+
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        result = view_func(*args, **kwargs)
+        mark()
+        return result
+
+    return wrapper
+
+
+def _wants_timing(request: HttpRequest) -> bool:
+    return settings.SERVER_TIMING_ENABLED or (
+        settings.SERVER_TIMING_ALLOW_HEADER and REQUEST_HEADER in request.headers
+    )
+
+
+def _add_header(
+    request: HttpRequest, response: HttpResponse, timing: RequestTiming
+) -> None:
+    response["Server-Timing"] = timing.header()
+    origin = request.headers.get("Origin")
+    if origin and origin in settings.CORS_ALLOWED_ORIGINS:
+        # Lets the frontend read the breakdown through the Performance API
+        response["Timing-Allow-Origin"] = origin
+
+
+@sync_and_async_middleware
+def server_timing_middleware(get_response):
+    """Adds a Server-Timing header splitting the request into auth, db,
+    schema and render time, for SERVER_TIMING_ENABLED or requests sending
+    X-Server-Timing. Must come after the query budget middleware, which
+    tracks the db time."""
+    if iscoroutinefunction(get_response):
+
+        async def async_middleware(request: HttpRequest) -> HttpResponse:
+            if not _wants_timing(request):
+                return await get_response(request)
+            timing = RequestTiming()
+            token = _timing.set(timing)
+            try:
+                response = await get_response(request)
+            finally:
+                _timing.reset(token)
+            _add_header(request, response, timing)
+            return response
+
+        return async_middleware
+
+    def middleware(request: HttpRequest) -> HttpResponse:
+        if not _wants_timing(request):
+            return get_response(request)
+        timing = RequestTiming()
+        token = _timing.set(timing)
+        try:
+            response = get_response(request)
+        finally:
+            _timing.reset(token)
+        _add_header(request, response, timing)
+        return response
+
+    return middleware
@@ -0,0 +1,196 @@
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from threading import BoundedSemaphore, Lock
+from time import monotonic, perf_counter
+from typing import Any, Dict, Iterator, Optional, Sequence
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from shared.metrics import current_service_method, operation_id
+from shared.query_count import (
+    TrackedQueries,
+    call_site,
+    query_shape,
+    tracked_queries,
+)
+from shared.query_plan import explain
+
+# Plans waiting to be captured; slow queries beyond it are logged without one
+EXPLAIN_QUEUE_SIZE = 100
+# A shape is explained again at most this often, in seconds, per process
+EXPLAIN_EVERY_SECONDS = 300
+
+# Set while the log's own EXPLAIN runs, which is never logged
+_explaining: ContextVar[bool] = ContextVar("explaining_slow_query", default=False)
+
+
+class SlowQueryLog:
+    """Queries slower than SLOW_QUERY_THRESHOLD_MS, one JSON object per line
+    in a file rotated at SLOW_QUERY_LOG_MAX_BYTES.
+
+    Each entry holds the query's shape, duration, database, the route,
+    Ninja operation and service method that ran it, and the project code
+    running it. The route is the URL pattern, so entries of one view group
+    together whatever ids their paths hold. Its plan is captured off the request
+    path, by a single thread running EXPLAIN without ANALYZE on its own
+    connection, at most every EXPLAIN_EVERY_SECONDS per shape.
+
+    Every process appends to the same file. Rotation is not coordinated
+    between them, so a few entries may be lost around a rotation.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._logger = logging.getLogger(f"{__name__}.store")
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        self._explainer = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="slow-query-explain"
+        )
+        self._explain_slots = BoundedSemaphore(EXPLAIN_QUEUE_SIZE)
+        # Last time each shape was explained, by shape
+        self._explained: Dict[str, float] = {}
+
+    @property
+    def path(self) -> Path:
+        return Path(settings.SLOW_QUERY_LOG_PATH)
+
+    def record(
+        self, sql: str, params: Sequence, alias: str, duration_ms: float
+    ) -> None:
+        queries = tracked_queries()
+        shape = query_shape(sql)
+        entry: Dict[str, Any] = {
+            "at": datetime.now(UTC).isoformat(timespec="milliseconds"),
+            "database": alias,
+            "duration_ms": round(duration_ms, 2),
+            "shape": shape,
+            **_view_fields(queries),
+            "service": current_service_method(),
+            "call_site": call_site(queries.task if queries is not None else None),
+            "plan": None,
+        }
+        if (
+            sql.lstrip()[:6].upper() in ("SELECT", "WITH")
+            and self._explain_due(shape)
+            and self._explain_slots.acquire(blocking=False)
+        ):
+            self._explainer.submit(self._explain_and_write, entry, sql, params, alias)
+        else:
+            self.write(entry)
+
+    def write(self, entry: Dict[str, Any]) -> None:
+        self._open()
+        self._logger.info(json.dumps(entry, default=str))
+
+    def entries(self) -> Iterator[Dict[str, Any]]:
+        """Every entry still on disk, oldest file first"""
+        backups = [
+            self.path.with_name(f"{self.path.name}.{number}")
+            for number in range(settings.SLOW_QUERY_LOG_BACKUPS, 0, -1)
+        ]
+        for path in [*backups, self.path]:
+            if not path.exists():
+                continue
+            with path.open() as file:
+                for line in file:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # A line cut short by a crash or rotation
+
+    def clear(self) -> None:
+        with self._lock:
+            for handler in self._logger.handlers:
+                handler.close()
+            self._logger.handlers.clear()
+        for number in range(settings.SLOW_QUERY_LOG_BACKUPS, -1, -1):
+            suffix = f".{number}" if number else ""
+            self.path.with_name(f"{self.path.name}{suffix}").unlink(missing_ok=True)
+
+    def _explain_due(self, shape: str) -> bool:
+        now = monotonic()
+        with self._lock:
+            explained = self._explained.get(shape)
+            if explained is not None and now - explained < EXPLAIN_EVERY_SECONDS:
+                return False
+            self._explained[shape] = now
+            return True
+
+    def _explain_and_write(
+        self, entry: Dict[str, Any], sql: str, params: Sequence, alias: str
+    ) -> None:
+        token = _explaining.set(True)
+        try:
+            entry["plan"] = explain(sql, params, using=alias)
+        except Exception as error:
+            entry["plan_error"] = str(error)
+        finally:
+            _explaining.reset(token)
+            # Hands a pooled connection back rather than holding it idle
+            connections[alias].close()
+            self._explain_slots.release()
+        self.write(entry)
+
+    def _open(self) -> None:
+        if self._logger.handlers:
+            return
+        with self._lock:
+            if self._logger.handlers:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            handler = RotatingFileHandler(
+                self.path,
+                maxBytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+                backupCount=settings.SLOW_QUERY_LOG_BACKUPS,
+                encoding="utf-8",
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self._logger.addHandler(handler)
+
+
+slow_query_log = SlowQueryLog()
+
+
+def _view_fields(queries: Optional[TrackedQueries]) -> Dict[str, Optional[str]]:
+    """Route, as "METHOD /url/pattern", and Ninja operation of a query"""
+    if queries is None:
+        return {"route": None, "operation": None}
+    request = queries.request
+    if request is None or request.resolver_match is None:
+        # Outside a request, or before its URL is resolved
+        return {"route": queries.label, "operation": None}
+    return {
+        "route": f"{request.method} /{request.resolver_match.route}",
+        "operation": operation_id(request),
+    }
+
+
+def _log_slow_query(execute, sql, params, many, context):
+    threshold_ms = settings.SLOW_QUERY_THRESHOLD_MS
+    if threshold_ms <= 0 or _explaining.get():
+        return execute(sql, params, many, context)
+    started = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration_ms = (perf_counter() - started) * 1000
+        if duration_ms >= threshold_ms and not many:
+            slow_query_log.record(sql, params, context["connection"].alias, duration_ms)
+
+
+def _install_slow_query_log(sender, connection, **kwargs):
+    # Inserted first, as execute_wrapper() blocks pop the last wrapper
+    if _log_slow_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _log_slow_query)
+
+
+def connect_slow_query_signals():
+    connection_created.connect(_install_slow_query_log, dispatch_uid="slow_query_log")
@@ -0,0 +1,117 @@
+import re
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from inspect import iscoroutinefunction
+from typing import Dict, Optional
+from urllib.parse import quote
+from uuid import uuid4
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.http import HttpRequest, HttpResponse
+from django.utils.decorators import sync_and_async_middleware
+
+from shared.metrics import current_service_method, operation_id
+
+# Request id a client or proxy sends, echoed on the response; generated when
+# missing or not of the form below
+REQUEST_ID_HEADER = "X-Request-ID"
+REQUEST_ID_PATTERN = re.compile(r"[A-Za-z0-9._-]{1,64}")
+
+
+@dataclass
+class QueryTags:
+    """What the queries of one request are tagged with"""
+
+    request: HttpRequest
+    request_id: str
+    # Route and Ninja operation, known once the URL is resolved
+    view_tags: Optional[Dict[str, str]] = field(default=None)
+
+    def comment(self) -> str:
+        """sqlcommenter comment: key='url-encoded value' pairs sorted by key"""
+        tags = {"request_id": self.request_id}
+        if self.view_tags is None and self.request.resolver_match is not None:
+            self.view_tags = {"route": f"/{self.request.resolver_match.route}"}
+            operation = operation_id(self.request)
+            if operation is not None:
+                self.view_tags["controller"] = operation
+        tags.update(self.view_tags or {})
+        service = current_service_method()
+        if service is not None:
+            tags["service"] = service
+        pairs = ",".join(
+            f"{key}='{quote(value)}'" for key, value in sorted(tags.items())
+        )
+        return f"/*{pairs}*/"
+
+
+_tags: ContextVar[Optional[QueryTags]] = ContextVar("query_tags", default=None)
+
+
+def _request_id(request: HttpRequest) -> str:
+    request_id = request.headers.get(REQUEST_ID_HEADER, "")
+    if REQUEST_ID_PATTERN.fullmatch(request_id):
+        return request_id
+    return uuid4().hex
+
+
+@sync_and_async_middleware
+def sql_comment_middleware(get_response):
+    """With SQL_COMMENTS_ENABLED, tags every query of a request with a SQL
+    comment naming its route, Ninja operation, service method and request
+    id, so database-side statistics can be traced back to the endpoint. The
+    request id is returned in X-Request-ID."""
+    if iscoroutinefunction(get_response):
+
+        async def async_middleware(request: HttpRequest) -> HttpResponse:
+            if not settings.SQL_COMMENTS_ENABLED:
+                return await get_response(request)
+            tags = QueryTags(request, _request_id(request))
+            token = _tags.set(tags)
+            try:
+                response = await get_response(request)
+            finally:
+                _tags.reset(token)
+            response[REQUEST_ID_HEADER] = tags.request_id
+            return response
+
+        return async_middleware
+
+    def middleware(request: HttpRequest) -> HttpResponse:
+        if not settings.SQL_COMMENTS_ENABLED:
+            return get_response(request)
+        tags = QueryTags(request, _request_id(request))
+        token = _tags.set(tags)
+        try:
+            response = get_response(request)
+        finally:
+            _tags.reset(token)
+        response[REQUEST_ID_HEADER] = tags.request_id
+        return response
+
+    return middleware
+
+
+def _comment_query(execute, sql, params, many, context):
+    tags = _tags.get()
+    # Statements already carrying a comment are left as they are
+    if tags is None or "/*" in sql or "--" in sql:
+        return execute(sql, params, many, context)
+    comment = tags.comment()
+    if params is not None:
+        # Escaped from the driver's parameter formatting
+        comment = comment.replace("%", "%%")
+    return execute(f"{sql} {comment}", params, many, context)
+
+
+def _install_query_comments(sender, connection, **kwargs):
+    # Inserted first like the other wrappers, but installed before them (see
+    # MydanceclubConfig.ready), so it runs innermost: they see the statement
+    # without the comment, which varies with every request
+    if _comment_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _comment_query)
+
+
+def connect_sql_comment_signals():
+    connection_created.connect(_install_query_comments, dispatch_uid="sql_comments")
@@ -0,0 +1,89 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from threading import BoundedSemaphore
+from time import perf_counter
+from typing import Callable
+
+from prometheus_client import Counter, Gauge, Histogram
+
+WORKER_POOL_JOBS = Counter(
+    "worker_pool_jobs",
+    "Jobs submitted to a bounded worker pool, by outcome",
+    ["pool", "outcome"],
+)
+# Summed over the live processes of a multi-process server
+WORKER_POOL_IN_FLIGHT = Gauge(
+    "worker_pool_in_flight",
+    "Jobs running or queued on a bounded worker pool",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+WORKER_POOL_WAIT = Histogram(
+    "worker_pool_wait_seconds",
+    "Time a job queued before a worker started it",
+    ["pool"],
+)
+WORKER_POOL_RUN = Histogram(
+    "worker_pool_run_seconds",
+    "Time a job ran on a worker",
+    ["pool"],
+)
+
+
+class PoolSaturated(RuntimeError):
+    pass
+
+
+class BoundedWorkerPool:
+    """Thread pool with a bounded queue that rejects work when saturated.
+
+    At most `workers` jobs run at once and `queue_size` more wait; any
+    further submission raises PoolSaturated straight away instead of
+    queueing, so a burst cannot pile up behind CPU-bound work and callers
+    can shed load with a fast error.
+
+    Meant for work that releases the GIL, such as hashlib's PBKDF2 or
+    argon2, so the threads run in parallel. Job outcomes, queue waits and
+    run times are exported as worker_pool_* Prometheus metrics.
+    """
+
+    def __init__(self, name: str, workers: int, queue_size: int):
+        self.name = name
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix=name
+        )
+        self._slots = BoundedSemaphore(workers + queue_size)
+        self._in_flight = WORKER_POOL_IN_FLIGHT.labels(name)
+        self._wait = WORKER_POOL_WAIT.labels(name)
+        self._run = WORKER_POOL_RUN.labels(name)
+
+    async def run[T](self, fn: Callable[..., T], *args) -> T:
+        """Run fn(*args) on the pool and await its result"""
+        if not self._slots.acquire(blocking=False):
+            WORKER_POOL_JOBS.labels(self.name, "rejected").inc()
+            raise PoolSaturated(f"{self.name} pool is saturated")
+        self._in_flight.inc()
+        queued = perf_counter()
+
+        def job() -> T:
+            started = perf_counter()
+            self._wait.observe(started - queued)
+            try:
+                return fn(*args)
+            finally:
+                self._run.observe(perf_counter() - started)
+
+        future = self._executor.submit(job)
+        # The slot is freed when the job ends, even if the caller was cancelled
+        future.add_done_callback(self._release)
+        try:
+            result = await asyncio.wrap_future(future)
+        except Exception:
+            WORKER_POOL_JOBS.labels(self.name, "failed").inc()
+            raise
+        WORKER_POOL_JOBS.labels(self.name, "completed").inc()
+        return result
+
+    def _release(self, future) -> None:
+        self._in_flight.dec()
+        self._slots.release()
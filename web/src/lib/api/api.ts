@@ -2,6 +2,8 @@ import axios, { AxiosError, AxiosResponse, InternalAxiosRequestConfig } from 'ax
 
 const api = axios.create({
   baseURL: 'http://localhost:8000',
+  // Send the API's cookies, e.g. db_pin keeping reads on the primary after a write
+  withCredentials: true,
   headers: {
     'Content-Type': 'application/json',
   },
@@ -0,0 +1,48 @@
+import { useEffect } from 'react'
+import { InfiniteData, NetworkMode, useInfiniteQuery } from '@tanstack/react-query'
+
+// A page of a cursor-paginated list endpoint (CursorPageSchema)
+export type CursorPage<T> = {
+  items: T[]
+  next_cursor?: string | null
+}
+
+type Cursor = string | null
+
+export type CursorListOptions = {
+  enabled?: boolean
+  // Keep following next_cursor until the last page is loaded
+  loadAll?: boolean
+  staleTime?: number
+  retry?: boolean
+  networkMode?: NetworkMode
+}
+
+/**
+ * Loads a cursor-paginated list page by page. `data` holds the items of
+ * every page loaded so far; fetchNextPage() loads the next one while
+ * hasNextPage is true.
+ */
+export function useCursorList<T>(
+  queryKey: readonly unknown[],
+  fetchPage: (cursor: Cursor) => Promise<CursorPage<T>>,
+  { loadAll = false, ...options }: CursorListOptions = {}
+) {
+  const query = useInfiniteQuery({
+    queryKey,
+    queryFn: ({ pageParam }) => fetchPage(pageParam),
+    initialPageParam: null as Cursor,
+    getNextPageParam: page => page.next_cursor ?? undefined,
+    select: (data: InfiniteData<CursorPage<T>, Cursor>) => data.pages.flatMap(page => page.items),
+    ...options,
+  })
+
+  const { hasNextPage, isFetchingNextPage, isError, fetchNextPage } = query
+  useEffect(() => {
+    if (loadAll && hasNextPage && !isFetchingNextPage && !isError) {
+      fetchNextPage()
+    }
+  }, [loadAll, hasNextPage, isFetchingNextPage, isError, fetchNextPage])
+
+  return query
+}
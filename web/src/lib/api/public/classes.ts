@@ -1,4 +1,5 @@
-import { $api } from '../queryClient'
+import { $api, MAX_PAGE_SIZE, fetchClient } from '../queryClient'
+import { CursorListOptions, useCursorList } from '../pagination'
 
 export function usePublicClasses(
   instructorId?: string | null,
@@ -8,22 +9,31 @@ export function usePublicClasses(
   startDate?: string | null,
   endDate?: string | null,
   minRating?: number | null,
-  sortBy?: string | null
+  sortBy?: string | null,
+  options?: CursorListOptions
 ) {
-  return $api.useQuery('get', '/api/public/classes', {
-    params: {
-      query: {
-        instructor_id: instructorId,
-        location_id: locationId,
-        style,
-        level,
-        start_date: startDate,
-        end_date: endDate,
-        min_rating: minRating,
-        sort_by: sortBy,
-      },
+  const query = {
+    instructor_id: instructorId,
+    location_id: locationId,
+    style,
+    level,
+    start_date: startDate,
+    end_date: endDate,
+    min_rating: minRating,
+    sort_by: sortBy,
+    limit: MAX_PAGE_SIZE,
+  }
+  return useCursorList(
+    ['get', '/api/public/classes', query],
+    async cursor => {
+      const { data, error } = await fetchClient.GET('/api/public/classes', {
+        params: { query: { ...query, cursor } },
+      })
+      if (!data) throw error
+      return data
     },
-  })
+    options
+  )
 }
 
 export function useTrendingClasses() {
@@ -42,9 +52,9 @@ export function usePublicClass(id: string) {
 
 export function useClassReviews(
   classId: string,
-  page: number = 1,
-  pageSize: number = 10,
-  sortBy?: string | null
+  limit: number = 10,
+  sortBy?: string | null,
+  cursor?: string | null
 ) {
   return $api.useQuery('get', '/api/public/classes/{class_id}/reviews', {
     params: {
@@ -52,8 +62,8 @@ export function useClassReviews(
         class_id: classId,
       },
       query: {
-        page,
-        page_size: pageSize,
+        cursor,
+        limit,
         sort_by: sortBy,
       },
     },
@@ -1,7 +1,18 @@
-import { $api } from '../queryClient'
+import { $api, MAX_PAGE_SIZE, fetchClient } from '../queryClient'
+import { CursorListOptions, useCursorList } from '../pagination'
 
-export function usePublicInstructors() {
-  return $api.useQuery('get', '/api/public/instructors')
+export function usePublicInstructors(options?: CursorListOptions) {
+  return useCursorList(
+    ['get', '/api/public/instructors'],
+    async cursor => {
+      const { data, error } = await fetchClient.GET('/api/public/instructors', {
+        params: { query: { limit: MAX_PAGE_SIZE, cursor } },
+      })
+      if (!data) throw error
+      return data
+    },
+    options
+  )
 }
 
 export function usePublicInstructor(id: string) {
@@ -14,17 +25,34 @@ export function usePublicInstructor(id: string) {
   })
 }
 
-export function usePublicInstructorClasses(id: string, includePast: boolean = false) {
-  return $api.useQuery('get', '/api/public/instructors/{instructor_id}/classes', {
-    params: {
-      path: {
-        instructor_id: id,
-      },
-      query: {
-        include_past: includePast,
-      },
+export function usePublicInstructorClasses(
+  id: string,
+  includePast: boolean = false,
+  options?: CursorListOptions
+) {
+  return useCursorList(
+    ['get', '/api/public/instructors/{instructor_id}/classes', id, includePast],
+    async cursor => {
+      const { data, error } = await fetchClient.GET(
+        '/api/public/instructors/{instructor_id}/classes',
+        {
+          params: {
+            path: {
+              instructor_id: id,
+            },
+            query: {
+              include_past: includePast,
+              limit: MAX_PAGE_SIZE,
+              cursor,
+            },
+          },
+        }
+      )
+      if (!data) throw error
+      return data
     },
-  })
+    options
+  )
 }
 
 export function usePublicInstructorStats(id: string) {
@@ -1,19 +1,23 @@
-import { $api } from '../queryClient'
+import { $api, MAX_PAGE_SIZE, fetchClient } from '../queryClient'
+import { CursorListOptions, useCursorList } from '../pagination'
 import { operations } from '../schema'
 
 type LocationSearchParams =
   operations['mydanceclub_api_public_locations_get_locations_nearby']['parameters']['query']
 
 export function usePublicLocationsNearby(params: LocationSearchParams) {
-  return $api.useQuery(
-    'get',
-    '/api/public/locations/nearby',
-    {
-      params: {
-        query: params,
-      },
+  return useCursorList(
+    ['get', '/api/public/locations/nearby', params],
+    async cursor => {
+      const { data, error } = await fetchClient.GET('/api/public/locations/nearby', {
+        params: { query: { limit: MAX_PAGE_SIZE, ...params, cursor } },
+      })
+      if (!data) throw error
+      return data
     },
     {
+      // Every location in the search radius goes on the map
+      loadAll: true,
       enabled: !!params?.latitude && !!params?.longitude,
       staleTime: 1000 * 60 * 5, // 5 minutes
       retry: false, // Don't retry failed requests
@@ -22,12 +26,18 @@ export function usePublicLocationsNearby(params: LocationSearchParams) {
   )
 }
 
-export function usePublicLocations(params: LocationSearchParams) {
-  return $api.useQuery('get', '/api/public/locations', {
-    params: {
-      query: params,
+export function usePublicLocations(params: LocationSearchParams, options?: CursorListOptions) {
+  return useCursorList(
+    ['get', '/api/public/locations', params],
+    async cursor => {
+      const { data, error } = await fetchClient.GET('/api/public/locations', {
+        params: { query: { limit: MAX_PAGE_SIZE, ...params, cursor } },
+      })
+      if (!data) throw error
+      return data
     },
-  })
+    options
+  )
 }
 
 export function usePublicLocation(id: string) {
@@ -49,15 +59,32 @@ export function usePublicLocationStats(id: string) {
     },
   })
 }
-export function usePublicLocationClasses(id: string, includePast: boolean = false) {
-  return $api.useQuery('get', '/api/public/locations/{location_id}/classes', {
-    params: {
-      path: {
-        location_id: id,
-      },
-      query: {
-        include_past: includePast,
-      },
+export function usePublicLocationClasses(
+  id: string,
+  includePast: boolean = false,
+  options?: CursorListOptions
+) {
+  return useCursorList(
+    ['get', '/api/public/locations/{location_id}/classes', id, includePast],
+    async cursor => {
+      const { data, error } = await fetchClient.GET(
+        '/api/public/locations/{location_id}/classes',
+        {
+          params: {
+            path: {
+              location_id: id,
+            },
+            query: {
+              include_past: includePast,
+              limit: MAX_PAGE_SIZE,
+              cursor,
+            },
+          },
+        }
+      )
+      if (!data) throw error
+      return data
     },
-  })
+    options
+  )
 }
@@ -27,7 +27,12 @@ export const queryClient = new QueryClient({
   },
 })
 
-const fetchClient = createFetchClient<paths>({
+export const fetchClient = createFetchClient<paths>({
   baseUrl: import.meta.env.VITE_API_URL || 'http://localhost:8000',
+  // Send the API's cookies, as the axios instance does
+  credentials: 'include',
 })
 export const $api = createClient(fetchClient)
+
+// Largest page the cursor-paginated list endpoints return
+export const MAX_PAGE_SIZE = 200
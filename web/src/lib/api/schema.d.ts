@@ -578,20 +578,49 @@ export interface components {
        */
       updated_at: string
     }
-    /** ReviewListSchema[ReviewDanceClassStatsSchema] */
-    ReviewListSchema_ReviewDanceClassStatsSchema_: {
+    /** CursorPageSchema[DanceClassSchema] */
+    CursorPageSchema_DanceClassSchema_: {
+      /** Items */
+      items: components['schemas']['DanceClassSchema'][]
+      /** Next Cursor */
+      next_cursor?: string | null
+      /** Has Next */
+      has_next: boolean
+      /** Total */
+      total?: number | null
+    }
+    /** CursorPageSchema[ReviewDanceClassStatsSchema] */
+    CursorPageSchema_ReviewDanceClassStatsSchema_: {
       /** Items */
       items: components['schemas']['ReviewDanceClassStatsSchema'][]
+      /** Next Cursor */
+      next_cursor?: string | null
+      /** Has Next */
+      has_next: boolean
       /** Total */
-      total: number
-      /** Page */
-      page: number
-      /** Pages */
-      pages: number
+      total?: number | null
+    }
+    /** CursorPageSchema[InstructorPublicSchema] */
+    CursorPageSchema_InstructorPublicSchema_: {
+      /** Items */
+      items: components['schemas']['InstructorPublicSchema'][]
+      /** Next Cursor */
+      next_cursor?: string | null
       /** Has Next */
       has_next: boolean
-      /** Has Prev */
-      has_prev: boolean
+      /** Total */
+      total?: number | null
+    }
+    /** CursorPageSchema[LocationSchema] */
+    CursorPageSchema_LocationSchema_: {
+      /** Items */
+      items: components['schemas']['LocationSchema'][]
+      /** Next Cursor */
+      next_cursor?: string | null
+      /** Has Next */
+      has_next: boolean
+      /** Total */
+      total?: number | null
     }
     /** ReviewAggregatedInstructorStatsSchema */
     ReviewAggregatedInstructorStatsSchema: {
@@ -829,6 +858,9 @@ export interface operations {
         end_date?: string | null
         min_rating?: number | null
         sort_by?: string | null
+        cursor?: string | null
+        limit?: number
+        with_total?: boolean
       }
       header?: never
       path?: never
@@ -842,7 +874,7 @@ export interface operations {
           [name: string]: unknown
         }
         content: {
-          'application/json': components['schemas']['DanceClassSchema'][]
+          'application/json': components['schemas']['CursorPageSchema_DanceClassSchema_']
         }
       }
     }
@@ -914,9 +946,10 @@ export interface operations {
   mydanceclub_api_public_classes_get_class_reviews: {
     parameters: {
       query?: {
-        page?: number
-        page_size?: number
+        cursor?: string | null
+        limit?: number
         sort_by?: string | null
+        with_total?: boolean
       }
       header?: never
       path: {
@@ -932,14 +965,18 @@ export interface operations {
           [name: string]: unknown
         }
         content: {
-          'application/json': components['schemas']['ReviewListSchema_ReviewDanceClassStatsSchema_']
+          'application/json': components['schemas']['CursorPageSchema_ReviewDanceClassStatsSchema_']
         }
       }
     }
   }
   mydanceclub_api_public_instructors_get_instructors: {
     parameters: {
-      query?: never
+      query?: {
+        cursor?: string | null
+        limit?: number
+        with_total?: boolean
+      }
       header?: never
       path?: never
       cookie?: never
@@ -952,7 +989,7 @@ export interface operations {
           [name: string]: unknown
         }
         content: {
-          'application/json': components['schemas']['InstructorPublicSchema'][]
+          'application/json': components['schemas']['CursorPageSchema_InstructorPublicSchema_']
         }
       }
     }
@@ -983,6 +1020,9 @@ export interface operations {
     parameters: {
       query?: {
         include_past?: boolean
+        cursor?: string | null
+        limit?: number
+        with_total?: boolean
       }
       header?: never
       path: {
@@ -998,7 +1038,7 @@ export interface operations {
           [name: string]: unknown
         }
         content: {
-          'application/json': components['schemas']['DanceClassSchema'][]
+          'application/json': components['schemas']['CursorPageSchema_DanceClassSchema_']
         }
       }
     }
@@ -1033,6 +1073,9 @@ export interface operations {
         level?: string | null
         min_classes?: number | null
         min_rating?: number | null
+        cursor?: string | null
+        limit?: number
+        with_total?: boolean
       }
       header?: never
       path?: never
@@ -1046,7 +1089,7 @@ export interface operations {
           [name: string]: unknown
         }
         content: {
-          'application/json': components['schemas']['LocationSchema'][]
+          'application/json': components['schemas']['CursorPageSchema_LocationSchema_']
         }
       }
     }
@@ -1065,7 +1108,12 @@ export interface operations {
         min_class_rating?: number | null
         radius_km?: number | null
         facility?: string | null
+        facility_match?: 'all' | 'any'
         sports_card?: string | null
+        sports_card_match?: 'all' | 'any'
+        cursor?: string | null
+        limit?: number
+        with_total?: boolean
       }
       header?: never
       path?: never
@@ -1079,7 +1127,7 @@ export interface operations {
           [name: string]: unknown
         }
         content: {
-          'application/json': components['schemas']['LocationSchema'][]
+          'application/json': components['schemas']['CursorPageSchema_LocationSchema_']
         }
       }
     }
@@ -1110,6 +1158,9 @@ export interface operations {
     parameters: {
       query?: {
         include_past?: boolean
+        cursor?: string | null
+        limit?: number
+        with_total?: boolean
       }
       header?: never
       path: {
@@ -1125,7 +1176,7 @@ export interface operations {
           [name: string]: unknown
         }
         content: {
-          'application/json': components['schemas']['DanceClassSchema'][]
+          'application/json': components['schemas']['CursorPageSchema_DanceClassSchema_']
         }
       }
     }
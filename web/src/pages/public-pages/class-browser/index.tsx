@@ -48,16 +48,26 @@ export function ClassBrowser() {
     })
   }
 
-  const { data: locations } = usePublicLocations({
-    min_classes: 1,
-    radius_km: 10,
-    dance_style: selectedStyle,
-    level: selectedLevel,
-    min_location_rating: selectedMinRating ? parseFloat(selectedMinRating) : undefined,
-    sports_card: selectedLocation,
-  })
-  const { data: instructors } = usePublicInstructors()
-  const { data: classes, isLoading: isLoadingClasses } = usePublicClasses(
+  // The filters offer every instructor and location, not just the first page
+  const { data: locations } = usePublicLocations(
+    {
+      min_classes: 1,
+      radius_km: 10,
+      dance_style: selectedStyle,
+      level: selectedLevel,
+      min_location_rating: selectedMinRating ? parseFloat(selectedMinRating) : undefined,
+      sports_card: selectedLocation,
+    },
+    { loadAll: true }
+  )
+  const { data: instructors } = usePublicInstructors({ loadAll: true })
+  const {
+    data: classes,
+    isLoading: isLoadingClasses,
+    hasNextPage,
+    isFetchingNextPage,
+    fetchNextPage,
+  } = usePublicClasses(
     selectedInstructor,
     selectedLocation,
     selectedStyle,
@@ -148,6 +158,18 @@ export function ClassBrowser() {
                       />
                     ))}
 
+                    {hasNextPage && (
+                      <div className="flex justify-center">
+                        <Button
+                          variant="outline"
+                          disabled={isFetchingNextPage}
+                          onClick={() => fetchNextPage()}
+                        >
+                          {isFetchingNextPage ? 'Loading...' : 'Load more classes'}
+                        </Button>
+                      </div>
+                    )}
+
                     {classes?.length === 0 && (
                       <div className="text-center py-12">
                         <h3 className="text-lg font-semibold">No classes found</h3>
@@ -11,7 +11,9 @@ interface InstructorTabProps {
 export function InstructorTab({ instructor }: InstructorTabProps) {
   const navigate = useNavigate()
 
-  const { data: instructorClasses } = usePublicInstructorClasses(instructor.id, true)
+  const { data: instructorClasses } = usePublicInstructorClasses(instructor.id, true, {
+    loadAll: true,
+  })
 
   return (
     <div className="grid md:grid-cols-3 gap-8">
@@ -3,6 +3,7 @@ import { Card, CardContent } from '@/components/ui/card'
 import { StarIcon } from '@heroicons/react/24/solid'
 import { cn } from '@/lib/utils'
 import { useClassReviews } from '@/lib/api/public/classes'
+import { MAX_PAGE_SIZE } from '@/lib/api/queryClient'
 import { components } from '@/lib/api/schema'
 
 function StarRating({ rating }: { rating: number }) {
@@ -39,7 +40,7 @@ function ReviewCard({ review }: { review: components['schemas']['ReviewDanceClas
 }
 
 export function ReviewsTab({ classId }: { classId: string }) {
-  const { data: reviews } = useClassReviews(classId, 1, 1000)
+  const { data: reviews } = useClassReviews(classId, MAX_PAGE_SIZE)
 
   return (
     <div className="space-y-6">
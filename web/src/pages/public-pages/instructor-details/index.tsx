@@ -13,7 +13,9 @@ import { useNavigate } from '@tanstack/react-router'
 export function InstructorDetailsPage() {
   const { instructorId } = useParams({ from: '/instructors/$instructorId' })
   const { data: instructor, isLoading } = usePublicInstructor(instructorId)
-  const { data: instructorClasses } = usePublicInstructorClasses(instructorId)
+  const { data: instructorClasses } = usePublicInstructorClasses(instructorId, false, {
+    loadAll: true,
+  })
   const [isExpanded, setIsExpanded] = useState(false)
   const navigate = useNavigate()
 